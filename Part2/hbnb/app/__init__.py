@@ -11,16 +11,27 @@ def create_app():
     
     api = Api(app, version='1.0', title='Hbnb API', description='Hbnb Application API', doc='/api/v1/')
 
+    # Responses are encoded by a pluggable encoder instead of flask-restx's json.dumps
+    from app.api.v1.encoding import create_encoder
+    encoder = create_encoder(app.config.get('JSON_ENCODER', 'auto'))
+    app.extensions['json_encoder'] = encoder
+
+    @api.representation('application/json')
+    def output_json(data, code, headers=None):
+        return encoder.response(data, code, headers)
+
     # Placeholder for API namespaces (endpoints will be added later)
     # Additional namespaces for places, reviews, and amenities will be added later
     from app.api.v1.users import api as users_ns
     from app.api.v1.amenities import api as amenities_ns
     from app.api.v1.places import api as places_ns
     from app.api.v1.reviews import api as reviews_ns
+    from app.api.v1.bulk import api as bulk_ns
 
     api.add_namespace(users_ns, path='/api/v1/users')
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
+    api.add_namespace(bulk_ns, path='/api/v1/bulk')
 
     return app
\ No newline at end of file
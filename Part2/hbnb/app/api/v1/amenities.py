@@ -2,8 +2,13 @@
 Amenity endpoints for the HBnB API.
 Handles CRUD operations for amenities (Create, Read, Update).
 """
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import ids_arg, ids_response, page_args, page_response
+from app.api.v1.encoding import Rows, ndjson_response, wants_ndjson
+from app.api.v1.serializers import amenity_detail, amenity_embedded
+from app.persistence.repository import DuplicateKeyError
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -27,35 +32,63 @@ class AmenityList(Resource):
             return {'error': 'Amenity name is required and must be a string'}, 400
         
         try:
-            # Check if amenity with same name already exists (case-insensitive)
-            existing_amenities = facade.get_all_amenities()
-            for amenity in existing_amenities:
-                if amenity.name.lower().strip() == amenity_data['name'].lower().strip():
-                    return {'error': 'Amenity with this name already exists'}, 409
-            
+            # Name uniqueness (case-insensitive) is enforced on insert
             new_amenity = facade.create_amenity(amenity_data)
-            return {
-                'id': new_amenity.id,
-                'name': new_amenity.name,
-                'created_at': new_amenity.created_at.isoformat(),
-                'updated_at': new_amenity.updated_at.isoformat()
-            }, 200
+            return amenity_detail(new_amenity), 200
+        except DuplicateKeyError as e:
+            return {'error': str(e)}, 409
         except ValueError as e:
             return {'error': str(e)}, 400
 
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(400, 'Invalid pagination or ids parameters')
+    @api.param('limit', 'Maximum number of amenities per page (enables pagination)')
+    @api.param('cursor', 'next_cursor returned by the previous page')
+    @api.param('ids', 'Comma-separated IDs of the amenities to return, in that order')
     def get(self):
         """Retrieve a list of all amenities"""
-        amenities = facade.get_all_amenities()
-        return [
-            {
-                'id': amenity.id,
-                'name': amenity.name,
-                'created_at': amenity.created_at.isoformat(),
-                'updated_at': amenity.updated_at.isoformat()
-            }
-            for amenity in amenities
-        ], 200
+        try:
+            ids = ids_arg()
+            if ids is not None:
+                found, missing = facade.get_amenities_by_ids(ids)
+                return ids_response(Rows(amenity_detail, found), missing), 200
+            page = page_args()
+            if page is None and wants_ndjson():
+                return ndjson_response(amenity_detail, facade.iter_amenities())
+            if page is None:
+                amenities, next_cursor = facade.get_all_amenities(), None
+            else:
+                amenities, next_cursor = facade.get_amenities_page(*page)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        items = Rows(amenity_detail, amenities)
+        return (items if page is None else page_response(items, next_cursor)), 200
+
+
+@api.route('/export')
+class AmenityExport(Resource):
+    @api.response(200, 'All amenities streamed as NDJSON, one per line')
+    def get(self):
+        """Stream all amenities as NDJSON, in creation order"""
+        return ndjson_response(amenity_detail, facade.iter_amenities())
+
+
+@api.route('/suggest')
+class AmenitySuggest(Resource):
+    @api.response(200, 'Matching amenities retrieved successfully, by name')
+    @api.response(400, 'Invalid parameters')
+    @api.param('prefix', 'Start of the amenity name')
+    @api.param('k', 'Number of amenities to return (default 10, max 100)')
+    def get(self):
+        """Suggest amenities whose name starts with a prefix"""
+        k = request.args.get('k', 10)
+        try:
+            if str(k).isdigit() and int(k) > 100:
+                raise ValueError("k must not exceed 100")
+            amenities = facade.suggest_amenities(request.args.get('prefix'), k)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return Rows(amenity_embedded, amenities), 200
 
 
 @api.route('/<amenity_id>')
@@ -68,12 +101,7 @@ class AmenityResource(Resource):
         if not amenity:
             return {'error': 'Amenity not found'}, 404
         
-        return {
-            'id': amenity.id,
-            'name': amenity.name,
-            'created_at': amenity.created_at.isoformat(),
-            'updated_at': amenity.updated_at.isoformat()
-        }, 200
+        return amenity_detail(amenity), 200
 
     @api.expect(amenity_model, validate=True)
     @api.response(200, 'Amenity updated successfully')
@@ -94,20 +122,11 @@ class AmenityResource(Resource):
             return {'error': 'Amenity name is required and must be a string'}, 400
         
         try:
-            # Check if another amenity with same name already exists (case-insensitive)
-            existing_amenities = facade.get_all_amenities()
-            for existing_amenity in existing_amenities:
-                if (existing_amenity.id != amenity_id and 
-                    existing_amenity.name.lower().strip() == amenity_data['name'].lower().strip()):
-                    return {'error': 'Amenity with this name already exists'}, 409
-            
+            # Name uniqueness (case-insensitive) is enforced on update
             updated_amenity = facade.update_amenity(amenity_id, amenity_data)
-            return {
-                'id': updated_amenity.id,
-                'name': updated_amenity.name,
-                'created_at': updated_amenity.created_at.isoformat(),
-                'updated_at': updated_amenity.updated_at.isoformat()
-            }, 200
+            return amenity_detail(updated_amenity), 200
+        except DuplicateKeyError as e:
+            return {'error': str(e)}, 409
         except ValueError as e:
             return {'error': str(e)}, 400
 
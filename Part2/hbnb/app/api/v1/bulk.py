@@ -0,0 +1,24 @@
+"""
+Bulk import endpoint for the HBnB API.
+Creates users, amenities, places and reviews from an NDJSON body.
+"""
+from flask import request
+from flask_restx import Namespace, Resource
+from app.services import facade
+from app.services.bulk import BulkLoader
+from app.api.v1.encoding import NDJSON
+
+api = Namespace('bulk', description='Bulk import')
+
+
+@api.route('')
+class BulkImport(Resource):
+    @api.response(200, 'Rows imported; the report lists the rejected ones')
+    @api.response(415, 'Body is not NDJSON')
+    def post(self):
+        """Import users, amenities, places and reviews, one JSON object per line"""
+        if request.mimetype != NDJSON:
+            return {'error': f"Content-Type must be {NDJSON}"}, 415
+        # Rows are read from the request stream as the import goes
+        report = BulkLoader(facade).load(request.stream)
+        return report, 200
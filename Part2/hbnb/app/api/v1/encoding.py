@@ -0,0 +1,236 @@
+"""
+JSON encoding of the HBnB API responses.
+Bodies are encoded with orjson when it is installed and with the json
+module otherwise. Entities returned as Rows are serialized and encoded
+batch by batch when the response is written, so the list of dicts of a
+whole collection is never built. Collections can also be streamed as
+NDJSON, one entity per line, while they are read from the repository.
+"""
+import json
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from itertools import chain, islice
+from uuid import UUID
+
+from flask import Response, current_app, make_response, request
+
+try:
+    import orjson
+except ImportError:  # orjson is optional: bodies fall back to the json module
+    orjson = None
+
+ENCODERS = ('auto', 'orjson', 'json')
+NDJSON = 'application/x-ndjson'
+# Number of entities serialized and encoded at once
+BATCH_SIZE = 1000
+
+
+class Rows:
+    """Entities of a response body, serialized only when it is encoded."""
+
+    __slots__ = ('serializer', 'objects')
+
+    def __init__(self, serializer, objects):
+        """
+        Wrap entities.
+
+        Args:
+            serializer (function): Serializer from app.api.v1.serializers
+            objects (iterable): The entities, in response order
+        """
+        self.serializer = serializer
+        self.objects = objects
+
+
+def _default(value):
+    """Encode the values neither encoder handles natively."""
+    if isinstance(value, Rows):
+        return value.serializer.many(value.objects)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _server_error(error):
+    """Return the body the resources answer unexpected errors with."""
+    return {'error': f'An error occurred: {str(error)}'}
+
+
+class ResponseEncoder(ABC):
+    """Encodes response bodies to bytes; subclasses provide dumps()."""
+
+    name = None
+
+    @abstractmethod
+    def dumps(self, value):
+        """Encode a JSON-compatible value to bytes."""
+        pass
+
+    def encode(self, data):
+        """
+        Encode a response body.
+
+        Rows found at the top level, or as values of a top-level dict such
+        as a page, are encoded batch by batch.
+
+        Args:
+            data: The body returned by a resource
+
+        Returns:
+            bytes: The encoded body
+        """
+        if isinstance(data, Rows):
+            return b''.join(self._rows(data))
+        if isinstance(data, dict) and any(isinstance(value, Rows) for value in data.values()):
+            parts = [b'{']
+            for position, (key, value) in enumerate(data.items()):
+                if position:
+                    parts.append(b',')
+                parts.append(self.dumps(str(key)) + b':')
+                if isinstance(value, Rows):
+                    parts.extend(self._rows(value))
+                else:
+                    parts.append(self.dumps(value))
+            parts.append(b'}')
+            return b''.join(parts)
+        return self.dumps(data)
+
+    def _rows(self, rows):
+        """Yield the encoded JSON array of Rows in chunks."""
+        yield b'['
+        objects = iter(rows.objects)
+        first = True
+        while True:
+            batch = list(islice(objects, BATCH_SIZE))
+            if not batch:
+                break
+            if not first:
+                yield b','
+            # Drop the brackets of the batch to splice it into one array
+            yield self.dumps(rows.serializer.many(batch))[1:-1]
+            first = False
+        yield b']'
+
+    def dump_lines(self, values):
+        """Encode JSON-compatible values as newline-terminated lines."""
+        return b''.join([self.dumps(value) + b'\n' for value in values])
+
+    def response(self, data, code, headers=None):
+        """
+        Make the Flask response of a resource's (body, status) result.
+
+        Rows are only serialized here, after the resource returned, so an
+        error raised meanwhile is answered like the resources answer the
+        errors they catch: a 500 with an {"error": ...} body.
+        """
+        try:
+            body = self.encode(data)
+        except Exception as e:
+            body, code, headers = self.dumps(_server_error(e)), 500, None
+        response = make_response(body + b'\n', code)
+        response.headers.extend(headers or {})
+        response.mimetype = 'application/json'
+        return response
+
+    def lines(self, serializer, objects):
+        """
+        Yield the NDJSON encoding of entities, one chunk per batch.
+
+        Args:
+            serializer (function): Serializer from app.api.v1.serializers
+            objects (iterable): The entities, consumed lazily
+
+        Yields:
+            bytes: One JSON document per entity, each ending with a newline
+        """
+        objects = iter(objects)
+        while True:
+            batch = list(islice(objects, BATCH_SIZE))
+            if not batch:
+                return
+            yield self.dump_lines(serializer.many(batch))
+
+    def stream(self, serializer, objects):
+        """
+        Make a streamed NDJSON response of entities.
+
+        The first batch is encoded before the response starts, so an error
+        in it still gets a JSON error response; once lines are sent, a
+        failing batch can only end the stream early.
+        """
+        chunks = self.lines(serializer, objects)
+        try:
+            first = next(chunks, b'')
+        except Exception as e:
+            return self.response(_server_error(e), 500)
+        return Response(chain([first], chunks), 200, mimetype=NDJSON)
+
+
+class StdlibEncoder(ResponseEncoder):
+    """Encoder built on the json module."""
+
+    name = 'json'
+
+    def __init__(self):
+        # json.dumps would build an encoder for every call with these options
+        self._encode = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False,
+                                        default=_default).encode
+
+    def dumps(self, value):
+        return self._encode(value).encode()
+
+
+class OrjsonEncoder(ResponseEncoder):
+    """Encoder built on orjson, which handles datetimes and UUIDs natively."""
+
+    name = 'orjson'
+
+    def dumps(self, value):
+        return orjson.dumps(value, default=_default)
+
+    def dump_lines(self, values):
+        return b''.join([orjson.dumps(value, default=_default, option=orjson.OPT_APPEND_NEWLINE)
+                         for value in values])
+
+
+def wants_ndjson():
+    """Return whether the current request prefers NDJSON over JSON."""
+    return request.accept_mimetypes.best_match(['application/json', NDJSON]) == NDJSON
+
+
+def ndjson_response(serializer, objects):
+    """
+    Stream entities as NDJSON with the encoder of the application.
+
+    Args:
+        serializer (function): Serializer from app.api.v1.serializers
+        objects (iterable): The entities, ideally a generator reading the
+            repository page by page, so only one batch is held at a time
+
+    Returns:
+        Response: The streamed response
+    """
+    return current_app.extensions['json_encoder'].stream(serializer, objects)
+
+
+def create_encoder(name='auto'):
+    """
+    Create the response encoder selected by the configuration.
+
+    Args:
+        name (str): 'auto' or 'orjson' for orjson when it is installed,
+            'json' for the json module
+
+    Returns:
+        ResponseEncoder: The encoder; the json one when orjson is missing
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown JSON encoder: {name}")
+    if name != 'json' and orjson is not None:
+        return OrjsonEncoder()
+    return StdlibEncoder()
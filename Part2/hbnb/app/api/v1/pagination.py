@@ -0,0 +1,105 @@
+"""
+Query parameters shared by the collection endpoints of the HBnB API:
+cursor pagination and lookups of several entities by ID.
+"""
+from flask import request
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+MAX_IDS = 1000
+
+
+def page_args():
+    """
+    Read the pagination query parameters of the current request.
+
+    Returns:
+        tuple: (limit, cursor), or None when the client asked for neither
+            and expects the whole collection
+
+    Raises:
+        ValueError: If limit is not an integer between 1 and MAX_LIMIT
+    """
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    if limit is None and cursor is None:
+        return None
+    return limit_arg(DEFAULT_LIMIT), cursor
+
+
+def limit_arg(default=None):
+    """
+    Read the limit query parameter of the current request.
+
+    Args:
+        default (int, optional): Limit used when the client gave none
+
+    Returns:
+        int: The limit, or default
+
+    Raises:
+        ValueError: If limit is not an integer between 1 and MAX_LIMIT
+    """
+    limit = request.args.get('limit')
+    if limit is None:
+        return default
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError("Limit must be an integer") from None
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"Limit must be between 1 and {MAX_LIMIT}")
+    return limit
+
+
+def ids_arg():
+    """
+    Read the ids query parameter of the current request.
+
+    Returns:
+        list: The comma-separated IDs, in order and without repeats, or
+            None when the client did not ask for specific entities
+
+    Raises:
+        ValueError: If ids is empty, lists more than MAX_IDS IDs or is
+            combined with limit or cursor
+    """
+    ids = request.args.get('ids')
+    if ids is None:
+        return None
+    if 'limit' in request.args or 'cursor' in request.args:
+        raise ValueError("ids cannot be combined with limit or cursor")
+    ids = list(dict.fromkeys(part.strip() for part in ids.split(',') if part.strip()))
+    if not ids:
+        raise ValueError("At least one ID is required")
+    if len(ids) > MAX_IDS:
+        raise ValueError(f"At most {MAX_IDS} IDs can be requested at once")
+    return ids
+
+
+def page_response(items, next_cursor):
+    """
+    Build the body of a paginated response.
+
+    Args:
+        items (list): Serialized entities of the page
+        next_cursor (str): Cursor of the next page, None on the last page
+
+    Returns:
+        dict: The response body
+    """
+    return {'items': items, 'next_cursor': next_cursor}
+
+
+def ids_response(items, missing):
+    """
+    Build the body of a response to an ids query.
+
+    Args:
+        items (list): Serialized entities found, in the requested order
+        missing (list): Requested IDs matching no entity
+
+    Returns:
+        dict: The response body
+    """
+    return {'items': items, 'missing': missing}
@@ -2,11 +2,25 @@
 Place endpoints for the HBnB API.
 Handles CRUD operations for places (Create, Read, Update).
 """
+import re
+
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import (DEFAULT_LIMIT, MAX_LIMIT, ids_arg, ids_response, limit_arg,
+                                   page_args, page_response)
+from app.api.v1.encoding import Rows, ndjson_response, wants_ndjson
+from app.api.v1.serializers import (PLACE_DETAIL_FIELDS, PLACE_EXPANSIONS, place_list,
+                                    place_location, place_ranking, place_suggestion, place_view,
+                                    place_written, review_embedded, review_of_place)
 
 api = Namespace('places', description='Place operations')
 
+# Query parameters of the place list answered by the query planner
+FILTER_PARAMS = ('min_price', 'max_price', 'amenities', 'min_rating', 'bbox', 'sort')
+# One relationship of ?expand=, such as reviews[limit=10]
+EXPANSION = re.compile(r'(\w+)(?:\[limit=(\d+)\])?')
+
 # Define the models for related entities
 amenity_model = api.model('PlaceAmenity', {
     'id': fields.String(description='Amenity ID'),
@@ -56,92 +70,299 @@ class PlaceList(Resource):
                         pass
             
             # Include amenities in response for consistency with GET
-            return {
-                'id': new_place.id,
-                'title': new_place.title,
-                'description': new_place.description,
-                'price': new_place.price,
-                'latitude': new_place.latitude,
-                'longitude': new_place.longitude,
-                'owner_id': new_place.owner.id,
-                'amenities': [
-                    {
-                        'id': amenity.id,
-                        'name': amenity.name
-                    }
-                    for amenity in (new_place.amenities or [])
-                ],
-                'created_at': new_place.created_at.isoformat(),
-                'updated_at': new_place.updated_at.isoformat()
-            }, 201
+            return place_written(new_place), 201
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception as e:
             return {'error': f'An error occurred: {str(e)}'}, 500
 
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid pagination, filter or ids parameters')
+    @api.param('limit', 'Maximum number of places per page (enables pagination)')
+    @api.param('cursor', 'next_cursor returned by the previous page')
+    @api.param('min_price', 'Lowest price per night, inclusive')
+    @api.param('max_price', 'Highest price per night, inclusive')
+    @api.param('amenities', 'Comma-separated amenity IDs the places must all have')
+    @api.param('min_rating', 'Lowest average rating, inclusive')
+    @api.param('bbox', 'Bounding box as min_lon,min_lat,max_lon,max_lat')
+    @api.param('sort', "'price' (cheapest first) or '-price' (most expensive first); "
+                       "price order by default when filtering on price")
+    @api.param('explain', "'true' to include the query plan in the response")
+    @api.param('ids', 'Comma-separated IDs of the places to return, in that order')
     def get(self):
         """Retrieve a list of all places"""
+        args = request.args
         try:
-            places = facade.get_all_places()
-            return [
-                {
-                    'id': place.id,
-                    'title': place.title,
-                    'latitude': place.latitude,
-                    'longitude': place.longitude,
-                    'price': place.price
-                }
-                for place in places
-            ], 200
+            explain = args.get('explain', '').lower() in ('1', 'true')
+            ids = ids_arg()
+            if ids is not None:
+                if explain or any(name in args for name in FILTER_PARAMS):
+                    raise ValueError("ids cannot be combined with filters or explain")
+                found, missing = facade.get_places_by_ids(ids)
+                return ids_response(Rows(place_list, found), missing), 200
+            page = page_args()
+            limit, cursor = page if page else (None, None)
+            # A whole result set can be streamed; a page needs its next_cursor
+            ndjson = page is None and not explain and wants_ndjson()
+            if explain or any(name in args for name in FILTER_PARAMS):
+                amenity_ids = None
+                if 'amenities' in args:
+                    amenity_ids = [amenity_id.strip()
+                                   for amenity_id in args['amenities'].split(',')
+                                   if amenity_id.strip()]
+                    if not amenity_ids:
+                        raise ValueError("At least one amenity is required")
+                sort = args.get('sort')
+                if sort is None and ('min_price' in args or 'max_price' in args):
+                    sort = 'price'
+                places, next_cursor, plan = facade.find_places(
+                    bbox=_parse_bbox(args['bbox']) if 'bbox' in args else None,
+                    min_price=args.get('min_price'), max_price=args.get('max_price'),
+                    amenity_ids=amenity_ids, min_rating=args.get('min_rating'),
+                    sort=sort, limit=limit, cursor=cursor)
+            elif ndjson:
+                return ndjson_response(place_list, facade.iter_places())
+            elif page is None:
+                places, next_cursor = facade.get_all_places(), None
+            else:
+                places, next_cursor = facade.get_places_page(*page)
+            if ndjson:
+                return ndjson_response(place_list, places)
+            items = Rows(place_list, places)
+            if explain:
+                body = page_response(items, next_cursor)
+                body['explain'] = plan
+                return body, 200
+            return (items if page is None else page_response(items, next_cursor)), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             return {'error': f'An error occurred: {str(e)}'}, 500
 
 
+def _parse_bbox(value):
+    """Parse a 'min_lon,min_lat,max_lon,max_lat' bounding box."""
+    parts = value.split(',')
+    if len(parts) != 4:
+        raise ValueError("Bounding box must be min_lon,min_lat,max_lon,max_lat")
+    try:
+        return [float(part) for part in parts]
+    except ValueError:
+        raise ValueError("Bounding box values must be numbers") from None
+
+
+def _parse_fields(value):
+    """
+    Parse the ?fields= of a place detail.
+
+    Returns:
+        tuple: The fields in output order; all of them when value is None
+    """
+    if value is None:
+        return PLACE_DETAIL_FIELDS
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    if not names:
+        raise ValueError("At least one field is required")
+    unknown = sorted(names.difference(PLACE_DETAIL_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(name for name in PLACE_DETAIL_FIELDS if name in names)
+
+
+def _parse_expand(value):
+    """
+    Parse the ?expand= of a place detail.
+
+    Returns:
+        tuple: (relationships to embed, maximum number of reviews);
+            every relationship and DEFAULT_LIMIT reviews when value is None
+    """
+    if value is None:
+        return PLACE_EXPANSIONS, DEFAULT_LIMIT
+    names = set()
+    review_limit = DEFAULT_LIMIT
+    for part in filter(None, (part.strip() for part in value.split(','))):
+        match = EXPANSION.fullmatch(part)
+        if not match or match.group(1) not in PLACE_EXPANSIONS:
+            raise ValueError(f"Cannot expand '{part}'; use {', '.join(PLACE_EXPANSIONS)}")
+        name, limit = match.groups()
+        if limit is not None:
+            if name != 'reviews':
+                raise ValueError("Only reviews take a limit")
+            review_limit = int(limit)
+            if not 1 <= review_limit <= MAX_LIMIT:
+                raise ValueError(f"Review limit must be between 1 and {MAX_LIMIT}")
+        names.add(name)
+    return tuple(name for name in PLACE_EXPANSIONS if name in names), review_limit
+
+
+@api.route('/export')
+class PlaceExport(Resource):
+    @api.response(200, 'All places streamed as NDJSON, one per line')
+    def get(self):
+        """Stream all places as NDJSON, in creation order"""
+        return ndjson_response(place_list, facade.iter_places())
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.response(200, 'Matching places retrieved successfully, nearest first')
+    @api.response(400, 'Invalid search parameters')
+    @api.param('lat', 'Latitude of the search center')
+    @api.param('lon', 'Longitude of the search center')
+    @api.param('radius_km', 'Search radius in kilometers (requires lat and lon)')
+    @api.param('bbox', 'Bounding box as min_lon,min_lat,max_lon,max_lat')
+    @api.param('q', 'Words to find in titles, descriptions and reviews')
+    @api.param('limit', 'Maximum number of places to return')
+    def get(self):
+        """Search places by text, distance to a point or bounding box"""
+        args = request.args
+        try:
+            limit = limit_arg()
+            geo = 'bbox' in args or 'radius_km' in args
+            scores = None
+            if 'q' in args:
+                # Combined with a geographic filter, text only narrows it down
+                text_results = facade.search_places_by_text(args['q'], None if geo else limit)
+                scores = {place.id: score for place, score in text_results}
+            if 'bbox' in args:
+                results = facade.search_places_in_bbox(
+                    *_parse_bbox(args['bbox']),
+                    latitude=args.get('lat'), longitude=args.get('lon'))
+            elif 'radius_km' in args:
+                if 'lat' not in args or 'lon' not in args:
+                    raise ValueError("lat and lon are required with radius_km")
+                results = facade.search_places_by_radius(
+                    args['lat'], args['lon'], args['radius_km'])
+            elif scores is not None:
+                results = [(place, None) for place, _ in text_results]
+            else:
+                raise ValueError("Provide q, lat, lon and radius_km, or bbox")
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        if scores is not None:
+            results = [(place, distance) for place, distance in results if place.id in scores]
+        items = []
+        for place, distance in results[:limit] if limit else results:
+            item = place_location(place)
+            if distance is not None:
+                item['distance_km'] = round(distance, 3)
+            if scores is not None:
+                item['score'] = round(scores[place.id], 4)
+            items.append(item)
+        return items, 200
+
+
+@api.route('/nearest')
+class PlaceNearest(Resource):
+    @api.response(200, 'Nearest places retrieved successfully, nearest first')
+    @api.response(400, 'Invalid parameters')
+    @api.param('lat', 'Latitude of the reference point')
+    @api.param('lon', 'Longitude of the reference point')
+    @api.param('k', 'Number of places to return (default 20, max 1000)')
+    def get(self):
+        """Find the places nearest to a point"""
+        args = request.args
+        try:
+            if 'lat' not in args or 'lon' not in args:
+                raise ValueError("lat and lon are required")
+            k = args.get('k', 20)
+            if str(k).isdigit() and int(k) > 1000:
+                raise ValueError("k must not exceed 1000")
+            results = facade.nearest_places(args['lat'], args['lon'], k)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        items = []
+        for place, distance in results:
+            item = place_location(place)
+            item['distance_km'] = round(distance, 3)
+            items.append(item)
+        return items, 200
+
+
+@api.route('/suggest')
+class PlaceSuggest(Resource):
+    @api.response(200, 'Matching places retrieved successfully, by title')
+    @api.response(400, 'Invalid parameters')
+    @api.param('prefix', 'Start of the place title')
+    @api.param('k', 'Number of places to return (default 10, max 100)')
+    def get(self):
+        """Suggest places whose title starts with a prefix"""
+        k = request.args.get('k', 10)
+        try:
+            if str(k).isdigit() and int(k) > 100:
+                raise ValueError("k must not exceed 100")
+            places = facade.suggest_places(request.args.get('prefix'), k)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return Rows(place_suggestion, places), 200
+
+
+@api.route('/top')
+class PlaceTop(Resource):
+    @api.response(200, 'Best rated places retrieved successfully, best first')
+    @api.response(400, 'Invalid parameters')
+    @api.param('n', 'Number of places to return (default 50, max 1000)')
+    @api.param('min_reviews', 'Minimum number of reviews of a ranked place (default 5)')
+    def get(self):
+        """Retrieve the best rated places"""
+        args = request.args
+        try:
+            n = args.get('n', 50)
+            if str(n).isdigit() and int(n) > 1000:
+                raise ValueError("n must not exceed 1000")
+            places = facade.get_top_places(n, args.get('min_reviews', 5))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return Rows(place_ranking, places), 200
+
+
+@api.route('/stats')
+class PlaceStats(Resource):
+    @api.response(200, 'Place statistics computed successfully')
+    @api.response(400, 'Invalid parameters')
+    @api.param('bbox', 'Bounding box as min_lon,min_lat,max_lon,max_lat')
+    def get(self):
+        """Aggregate prices and ratings of the places, optionally in a bounding box"""
+        bbox = request.args.get('bbox')
+        try:
+            stats = facade.get_place_stats(_parse_bbox(bbox) if bbox is not None else None)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return stats, 200
+
+
 @api.route('/<place_id>')
 @api.param('place_id', 'The place identifier')
 class PlaceResource(Resource):
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(400, 'Invalid fields or expand parameters')
     @api.response(404, 'Place not found')
+    @api.param('fields', 'Comma-separated fields to return (default: all)')
+    @api.param('expand', "Relationships to embed: owner, amenities, reviews[limit=N]; "
+                         f"others are returned as IDs (default: all, {DEFAULT_LIMIT} reviews)")
     def get(self, place_id):
         """Get place details by ID"""
+        try:
+            fields = _parse_fields(request.args.get('fields'))
+            expand, review_limit = _parse_expand(request.args.get('expand'))
+        except ValueError as e:
+            return {'error': str(e)}, 400
         try:
             place = facade.get_place(place_id)
             if not place:
                 return {'error': 'Place not found'}, 404
             
-            return {
-                'id': place.id,
-                'title': place.title,
-                'description': place.description,
-                'price': place.price,
-                'latitude': place.latitude,
-                'longitude': place.longitude,
-                'owner': {
-                    'id': place.owner.id,
-                    'first_name': place.owner.first_name,
-                    'last_name': place.owner.last_name,
-                    'email': place.owner.email
-                },
-                'amenities': [
-                    {
-                        'id': amenity.id,
-                        'name': amenity.name
-                    }
-                    for amenity in (place.amenities or [])
-                ],
-                'reviews': [
-                    {
-                        'id': review.id,
-                        'text': review.text,
-                        'rating': review.rating,
-                        'user_id': review.user.id
-                    }
-                    for review in (place.reviews or [])
-                ],
-                'created_at': place.created_at.isoformat(),
-                'updated_at': place.updated_at.isoformat()
-            }, 200
+            serializer = place_view(fields, expand)
+            if 'reviews' in fields and 'reviews' in expand:
+                # The first page only; the next ones come from /places/<id>/reviews
+                reviews, next_cursor = facade.get_reviews_by_place_page(place.id, review_limit)
+                return serializer(place, reviews=review_embedded.many(reviews),
+                                  reviews_next_cursor=next_cursor), 200
+            return serializer(place), 200
         except AttributeError as e:
             return {'error': f'Missing attribute: {str(e)}'}, 500
         except Exception as e:
@@ -177,24 +398,7 @@ class PlaceResource(Resource):
             updated_place = facade.update_place(place_id, place_data)
             
             # Include amenities in response for consistency with GET
-            return {
-                'id': updated_place.id,
-                'title': updated_place.title,
-                'description': updated_place.description,
-                'price': updated_place.price,
-                'latitude': updated_place.latitude,
-                'longitude': updated_place.longitude,
-                'owner_id': updated_place.owner.id,
-                'amenities': [
-                    {
-                        'id': amenity.id,
-                        'name': amenity.name
-                    }
-                    for amenity in (updated_place.amenities or [])
-                ],
-                'created_at': updated_place.created_at.isoformat(),
-                'updated_at': updated_place.updated_at.isoformat()
-            }, 200
+            return place_written(updated_place), 200
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception as e:
@@ -205,7 +409,10 @@ class PlaceResource(Resource):
 @api.param('place_id', 'The place identifier')
 class PlaceReviewList(Resource):
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
     @api.response(404, 'Place not found')
+    @api.param('limit', 'Maximum number of reviews per page (enables pagination)')
+    @api.param('cursor', 'next_cursor returned by the previous page')
     def get(self, place_id):
         """Get all reviews for a specific place"""
         try:
@@ -214,18 +421,15 @@ class PlaceReviewList(Resource):
             if not place:
                 return {'error': 'Place not found'}, 404
             
-            # Get all reviews for this place
-            reviews = facade.get_reviews_by_place(place_id)
-            return [
-                {
-                    'id': review.id,
-                    'text': review.text,
-                    'rating': review.rating,
-                    'user_id': review.user.id,
-                    'created_at': review.created_at.isoformat(),
-                    'updated_at': review.updated_at.isoformat()
-                }
-                for review in reviews
-            ], 200
+            # Get the reviews for this place, or one page of them
+            page = page_args()
+            if page is None:
+                reviews, next_cursor = facade.get_reviews_by_place(place_id), None
+            else:
+                reviews, next_cursor = facade.get_reviews_by_place_page(place_id, *page)
+            items = Rows(review_of_place, reviews)
+            return (items if page is None else page_response(items, next_cursor)), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             return {'error': f'An error occurred: {str(e)}'}, 500
\ No newline at end of file
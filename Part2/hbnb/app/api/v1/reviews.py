@@ -4,6 +4,9 @@ Handles CRUD operations for reviews (Create, Read, Update, Delete).
 """
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import ids_arg, ids_response, page_args, page_response
+from app.api.v1.encoding import Rows, ndjson_response, wants_ndjson
+from app.api.v1.serializers import review_detail, review_list, review_embedded
 
 api = Namespace('reviews', description='Review operations')
 
@@ -37,32 +40,41 @@ class ReviewList(Resource):
 
         try:
             new_review = facade.create_review(review_data)
-            return {
-                'id': new_review.id,
-                'text': new_review.text,
-                'rating': new_review.rating,
-                'user_id': new_review.user.id,
-                'place_id': new_review.place.id,
-                'created_at': new_review.created_at.isoformat(),
-                'updated_at': new_review.updated_at.isoformat()
-            }, 201
+            return review_detail(new_review), 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid pagination or ids parameters')
+    @api.param('limit', 'Maximum number of reviews per page (enables pagination)')
+    @api.param('cursor', 'next_cursor returned by the previous page')
+    @api.param('ids', 'Comma-separated IDs of the reviews to return, in that order')
     def get(self):
         """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return [
-            {
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating,
-                'user_id': review.user.id,
-                'place_id': review.place.id
-            }
-            for review in reviews
-        ], 200
+        try:
+            ids = ids_arg()
+            if ids is not None:
+                found, missing = facade.get_reviews_by_ids(ids)
+                return ids_response(Rows(review_list, found), missing), 200
+            page = page_args()
+            if page is None and wants_ndjson():
+                return ndjson_response(review_list, facade.iter_reviews())
+            if page is None:
+                reviews, next_cursor = facade.get_all_reviews(), None
+            else:
+                reviews, next_cursor = facade.get_reviews_page(*page)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        items = Rows(review_list, reviews)
+        return (items if page is None else page_response(items, next_cursor)), 200
+
+
+@api.route('/export')
+class ReviewExport(Resource):
+    @api.response(200, 'All reviews streamed as NDJSON, one per line')
+    def get(self):
+        """Stream all reviews as NDJSON, in creation order"""
+        return ndjson_response(review_list, facade.iter_reviews())
 
 
 @api.route('/<review_id>')
@@ -75,15 +87,7 @@ class ReviewResource(Resource):
         if not review:
             return {'error': 'Review not found'}, 404
         
-        return {
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id,
-            'created_at': review.created_at.isoformat(),
-            'updated_at': review.updated_at.isoformat()
-        }, 200
+        return review_detail(review), 200
 
     @api.expect(review_model, validate=True)
     @api.response(200, 'Review updated successfully')
@@ -109,15 +113,7 @@ class ReviewResource(Resource):
 
         try:
             updated_review = facade.update_review(review_id, review_data)
-            return {
-                'id': updated_review.id,
-                'text': updated_review.text,
-                'rating': updated_review.rating,
-                'user_id': updated_review.user.id,
-                'place_id': updated_review.place.id,
-                'created_at': updated_review.created_at.isoformat(),
-                'updated_at': updated_review.updated_at.isoformat()
-            }, 200
+            return review_detail(updated_review), 200
         except ValueError as e:
             return {'error': str(e)}, 400
 
@@ -150,13 +146,5 @@ class PlaceReviewList(Resource):
             return {'error': 'Place not found'}, 404
         
         reviews = facade.get_reviews_by_place(place_id)
-        return [
-            {
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating,
-                'user_id': review.user.id
-            }
-            for review in reviews
-        ], 200
+        return Rows(review_embedded, reviews), 200
     
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Response serializers of the HBnB API.
+Each model has one to-dict function per view (list, detail, embedded...),
+generated once at import time from its field list, so serializing a row
+is a single call doing direct attribute reads. Each serializer also has
+a many() variant building the whole list in one comprehension. Place
+details restricted by ?fields= and ?expand= get their own serializer,
+generated on first use, which reads only the attributes asked for.
+"""
+from functools import lru_cache
+
+
+class Nested:
+    """Field holding a related entity, or a list of them, serialized in turn."""
+
+    def __init__(self, serializer, source, many=False):
+        """
+        Declare a nested field.
+
+        Args:
+            serializer (function): Serializer of the related entities,
+                generated by compile_serializer
+            source (str): Attribute path of the related entity or list
+            many (bool): Whether the attribute holds a list of entities
+        """
+        self.serializer = serializer
+        self.source = source
+        self.many = many
+
+
+class Param:
+    """Field whose value is passed to the serializer instead of read from the entity."""
+
+    def __init__(self, name):
+        """
+        Declare a parameter field.
+
+        Args:
+            name (str): Name of the keyword argument of the serializer
+
+        Raises:
+            ValueError: If the name is not an identifier
+        """
+        if not name.isidentifier():
+            raise ValueError(f"Invalid parameter name: {name}")
+        self.name = name
+
+
+def _attribute_path(source):
+    """Return the expression reading a dotted attribute path of obj."""
+    parts = source.split('.')
+    if not all(part.isidentifier() for part in parts):
+        raise ValueError(f"Invalid attribute path: {source}")
+    return 'obj.' + source
+
+
+def compile_serializer(name, fields):
+    """
+    Generate a function turning an entity into a dict.
+
+    Args:
+        name (str): Name of the generated function
+        fields (iterable): Field specs, in output order: 'attr' copies an
+            attribute under its own name; (key, 'path.to.attr') copies an
+            attribute path under key; (key, Nested(...)) serializes a
+            related entity or list of entities under key; (key, Param(name))
+            copies the keyword argument name of the call under key
+
+    Returns:
+        function: serializer(obj, **params) -> dict, with
+            serializer.many(objects, **params) returning the list of dicts
+            of an iterable
+
+    Raises:
+        ValueError: If a name or attribute path is not an identifier
+    """
+    if not name.isidentifier():
+        raise ValueError(f"Invalid serializer name: {name}")
+    namespace = {}
+    items = []
+    params = []
+    for field in fields:
+        key, source = (field, field) if isinstance(field, str) else field
+        if isinstance(source, Param):
+            params.append(source.name)
+            expression = source.name
+        elif isinstance(source, Nested):
+            helper = f'_nested_{len(namespace)}'
+            namespace[helper] = source.serializer
+            path = _attribute_path(source.source)
+            if source.many:
+                expression = f'{helper}.many({path} or ())'
+            else:
+                expression = f'{helper}({path})'
+        else:
+            expression = _attribute_path(source)
+        items.append(f'{key!r}: {expression}')
+    body = '{' + ', '.join(items) + '}'
+    signature = ''.join(f', {param}' for param in (['*'] + params if params else []))
+    code = '\n'.join([
+        f'def {name}(obj{signature}):',
+        f'    return {body}',
+        f'def many(objects{signature}):',
+        f'    return [{body} for obj in objects]',
+    ])
+    exec(compile(code, f'<serializer {name}>', 'exec'), namespace)
+    serializer = namespace[name]
+    serializer.__doc__ = f"Serialize one entity ({name})."
+    serializer.many = namespace['many']
+    serializer.many.__doc__ = f"Serialize a list of entities ({name})."
+    return serializer
+
+
+TIMESTAMPS = (('created_at', 'created_at_iso'), ('updated_at', 'updated_at_iso'))
+
+# ==================== Users ====================
+
+user_embedded = compile_serializer('user_embedded', (
+    'id', 'first_name', 'last_name', 'email'))
+user_detail = compile_serializer('user_detail', (
+    'id', 'first_name', 'last_name', 'email', *TIMESTAMPS))
+
+# ==================== Amenities ====================
+
+amenity_embedded = compile_serializer('amenity_embedded', ('id', 'name'))
+amenity_detail = compile_serializer('amenity_detail', ('id', 'name', *TIMESTAMPS))
+
+# ==================== Reviews ====================
+
+review_embedded = compile_serializer('review_embedded', (
+    'id', 'text', 'rating', 'user_id'))
+review_list = compile_serializer('review_list', (
+    'id', 'text', 'rating', 'user_id', 'place_id'))
+# Reviews listed under their place, which is therefore not repeated
+review_of_place = compile_serializer('review_of_place', (
+    'id', 'text', 'rating', 'user_id', *TIMESTAMPS))
+review_detail = compile_serializer('review_detail', (
+    'id', 'text', 'rating', 'user_id', 'place_id', *TIMESTAMPS))
+
+# ==================== Places ====================
+
+place_suggestion = compile_serializer('place_suggestion', ('id', 'title'))
+# Base of the search results, which add their distance or score
+place_location = compile_serializer('place_location', (
+    'id', 'title', 'latitude', 'longitude', 'price'))
+place_list = compile_serializer('place_list', (
+    'id', 'title', 'latitude', 'longitude', 'price', 'rating_avg', 'rating_count'))
+place_ranking = compile_serializer('place_ranking', (
+    'id', 'title', 'price', 'rating_avg', 'rating_count'))
+# Returned by POST and PUT: references the owner instead of embedding it
+place_written = compile_serializer('place_written', (
+    'id', 'title', 'description', 'price', 'latitude', 'longitude',
+    'owner_id',
+    ('amenities', Nested(amenity_embedded, 'amenities', many=True)),
+    'rating_avg', 'rating_count', 'rating_histogram', *TIMESTAMPS))
+
+# Fields of the place detail, in output order; owner, amenities and
+# reviews are relationships, embedded only when expanded
+PLACE_DETAIL_FIELDS = ('id', 'title', 'description', 'price', 'latitude', 'longitude',
+                       'owner', 'amenities', 'reviews', 'rating_avg', 'rating_count',
+                       'rating_histogram', 'created_at', 'updated_at')
+PLACE_EXPANSIONS = ('owner', 'amenities', 'reviews')
+_PLACE_ATTRIBUTES = {'created_at': 'created_at_iso', 'updated_at': 'updated_at_iso'}
+
+
+@lru_cache(maxsize=128)
+def place_view(fields, expand):
+    """
+    Return the serializer of a place detail limited to some fields.
+
+    Args:
+        fields (tuple): Names from PLACE_DETAIL_FIELDS, in that order
+        expand (tuple): Names from PLACE_EXPANSIONS to embed; otherwise
+            the owner is referenced as owner_id, the amenities as
+            amenity_ids, and the reviews are left out
+
+    Returns:
+        function: Generated serializer; with reviews selected and expanded,
+            it takes the serialized page of reviews as reviews= and the
+            cursor of the next page as reviews_next_cursor=
+    """
+    specs = []
+    for name in fields:
+        if name == 'owner':
+            specs.append(('owner', Nested(user_embedded, 'owner')) if 'owner' in expand
+                         else 'owner_id')
+        elif name == 'amenities':
+            if 'amenities' in expand:
+                specs.append(('amenities', Nested(amenity_embedded, 'amenities', many=True)))
+            else:
+                specs.append('amenity_ids')
+        elif name == 'reviews':
+            if 'reviews' in expand:
+                specs.append(('reviews', Param('reviews')))
+                specs.append(('reviews_next_cursor', Param('reviews_next_cursor')))
+        else:
+            specs.append((name, _PLACE_ATTRIBUTES.get(name, name)))
+    return compile_serializer('place_view', specs)
+
+
+# Every field with every relationship embedded; takes the page of reviews
+place_detail = place_view(PLACE_DETAIL_FIELDS, PLACE_EXPANSIONS)
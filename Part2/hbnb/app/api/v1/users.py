@@ -4,6 +4,10 @@ Handles CRUD operations for users (Create, Read, Update).
 """
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import ids_arg, ids_response, page_args, page_response
+from app.api.v1.encoding import Rows, ndjson_response, wants_ndjson
+from app.api.v1.serializers import user_detail
+from app.persistence.repository import DuplicateKeyError
 
 api = Namespace('users', description='User operations')
 
@@ -32,46 +36,51 @@ class UserList(Resource):
         """Register a new user"""
         user_data = api.payload
 
-        # Check for email uniqueness
-        existing_user = facade.get_user_by_email(user_data['email'])
-        if existing_user:
-            return {'error': 'Email already registered'}, 400
-
         try:
             new_user = facade.create_user(user_data)
-            return {
-                'id': new_user.id,
-                'first_name': new_user.first_name,
-                'last_name': new_user.last_name,
-                'email': new_user.email,
-                'created_at': new_user.created_at.isoformat(),
-                'updated_at': new_user.updated_at.isoformat()
-            }, 201
+            return user_detail(new_user), 201
+        except DuplicateKeyError:
+            return {'error': 'Email already registered'}, 400
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception as e:
             return {'error': f'An error occurred: {str(e)}'}, 500
 
     @api.response(200, 'List of users retrieved successfully')
+    @api.response(400, 'Invalid pagination or ids parameters')
+    @api.param('limit', 'Maximum number of users per page (enables pagination)')
+    @api.param('cursor', 'next_cursor returned by the previous page')
+    @api.param('ids', 'Comma-separated IDs of the users to return, in that order')
     def get(self):
         """Retrieve a list of all users"""
         try:
-            users = facade.get_all_users()
-            return [
-                {
-                    'id': user.id,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name,
-                    'email': user.email,
-                    'created_at': user.created_at.isoformat(),
-                    'updated_at': user.updated_at.isoformat()
-                }
-                for user in users
-            ], 200
+            ids = ids_arg()
+            if ids is not None:
+                found, missing = facade.get_users_by_ids(ids)
+                return ids_response(Rows(user_detail, found), missing), 200
+            page = page_args()
+            if page is None and wants_ndjson():
+                return ndjson_response(user_detail, facade.iter_users())
+            if page is None:
+                users, next_cursor = facade.get_all_users(), None
+            else:
+                users, next_cursor = facade.get_users_page(*page)
+            items = Rows(user_detail, users)
+            return (items if page is None else page_response(items, next_cursor)), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             return {'error': f'An error occurred: {str(e)}'}, 500
 
 
+@api.route('/export')
+class UserExport(Resource):
+    @api.response(200, 'All users streamed as NDJSON, one per line')
+    def get(self):
+        """Stream all users as NDJSON, in creation order"""
+        return ndjson_response(user_detail, facade.iter_users())
+
+
 @api.route('/<user_id>')
 class UserResource(Resource):
     @api.response(200, 'User details retrieved successfully')
@@ -83,14 +92,7 @@ class UserResource(Resource):
             if not user:
                 return {'error': 'User not found'}, 404
             
-            return {
-                'id': user.id,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'email': user.email,
-                'created_at': user.created_at.isoformat(),
-                'updated_at': user.updated_at.isoformat()
-            }, 200
+            return user_detail(user), 200
         except Exception as e:
             return {'error': f'An error occurred: {str(e)}'}, 500
 
@@ -112,26 +114,26 @@ class UserResource(Resource):
         if not user:
             return {'error': 'User not found'}, 404
 
-        # Check if email is being changed and if it's already taken by another user
-        if 'email' in user_data and user_data['email'] != user.email:
-            existing_user = facade.get_user_by_email(user_data['email'])
-            if existing_user and existing_user.id != user_id:
-                return {'error': 'Email already registered'}, 400
-
         try:
             updated_user = facade.update_user(user_id, user_data)
             if not updated_user:
                 return {'error': 'User not found'}, 404
                 
-            return {
-                'id': updated_user.id,
-                'first_name': updated_user.first_name,
-                'last_name': updated_user.last_name,
-                'email': updated_user.email,
-                'created_at': updated_user.created_at.isoformat(),
-                'updated_at': updated_user.updated_at.isoformat()
-            }, 200
+            return user_detail(updated_user), 200
+        except DuplicateKeyError:
+            return {'error': 'Email already registered'}, 400
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception as e:
-            return {'error': f'An error occurred while updating the user: {str(e)}'}, 500
\ No newline at end of file
+            return {'error': f'An error occurred while updating the user: {str(e)}'}, 500
+
+@api.route('/<user_id>/stats')
+class UserStats(Resource):
+    @api.response(200, 'Review statistics of the user computed successfully')
+    @api.response(404, 'User not found')
+    def get(self, user_id):
+        """Aggregate the ratings a user gave in their reviews"""
+        stats = facade.get_user_review_stats(user_id)
+        if stats is None:
+            return {'error': 'User not found'}, 404
+        return stats, 200
@@ -7,6 +7,8 @@ from app.models.base_model import BaseModel
 class Amenity(BaseModel):
     """Amenity class representing a feature or service available at a place."""
     
+    __slots__ = ('name',)
+
     def __init__(self, name):
         """
         Initialize an Amenity instance.
@@ -3,14 +3,294 @@ Base model class for all entities in the HBnb application.
 Provides common attributes and methods for all models.
 """
 import uuid
-from datetime import datetime
+import weakref
+from datetime import datetime, timedelta
+
+# Timestamps are stored as microseconds since this naive epoch, so they
+# convert back to the same naive local datetimes as datetime.now()
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Attribute read that bypasses __getattr__, so a deferred reference stays unloaded
+slot_value = object.__getattribute__
+
+
+def id_key(obj_id):
+    """
+    Return the compact key of an entity ID.
+
+    Args:
+        obj_id (str): ID in its string form
+
+    Returns:
+        The 128-bit integer of a UUID, or the ID itself if it is not one
+    """
+    if isinstance(obj_id, str) and len(obj_id) == 36:
+        try:
+            # Canonical form, parsed like uuid.UUID without building one
+            if obj_id[8] == obj_id[13] == obj_id[18] == obj_id[23] == '-':
+                digits = obj_id.replace('-', '')
+                if len(digits) == 32:
+                    return int(digits, 16)
+            return uuid.UUID(obj_id).int
+        except ValueError:
+            pass
+    return obj_id
+
+
+def to_epoch_us(value):
+    """
+    Convert a timestamp to integer microseconds since the epoch.
+
+    Args:
+        value (datetime or str): Naive local datetime, aware datetime or
+            ISO 8601 string
+
+    Returns:
+        int: Microseconds since 1970-01-01 in local time
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value):
+    """Convert microseconds since the epoch back to a naive local datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class Deferred:
+    """
+    Related entities a repository has not loaded yet.
+
+    Holds their IDs, so they can be read without loading anything, and
+    the function loading the entities from those IDs.
+    """
+
+    __slots__ = ('ids', '_load')
+
+    def __init__(self, ids, load):
+        """
+        Initialize a deferred reference.
+
+        Args:
+            ids: ID of one entity, or list of IDs
+            load (callable): Called with ids, returns the entity or list
+        """
+        self.ids = ids
+        self._load = load
+
+    def load(self):
+        """Load and return the related entity or list of entities."""
+        return self._load(self.ids)
+
+
+class Reference:
+    """Declaration of an attribute holding a related entity, or a list of them."""
+
+    __slots__ = ('class_name', 'many')
+
+    def __init__(self, class_name, many=False):
+        """
+        Declare a reference attribute.
+
+        Args:
+            class_name (str): Name of the model class of the related entities
+            many (bool): Whether the attribute holds a list of entities
+        """
+        self.class_name = class_name
+        self.many = many
+
+
+class Relations:
+    """
+    Relation indexes behind the read-only relationship lists of the models,
+    such as Place.reviews.
+
+    The facade binds its own indexes when it is created, with the function
+    loading children from their IDs. A relation nobody bound is kept in an
+    index of its own, so models used on their own still list their
+    relationships. Children linked through the models are also found among
+    the live instances, before they are stored.
+    """
+
+    def __init__(self):
+        """Initialize with every relation unbound."""
+        self._relations = {}
+        # Children linked through the models, by ID, for as long as they live
+        self._live = weakref.WeakValueDictionary()
+
+    def bind(self, name, index, load=None):
+        """
+        Back a relation by an index.
+
+        Args:
+            name (str): Name of the relation, such as 'place_reviews'
+            index (RelationIndex): Index holding the relation by ID
+            load (callable, optional): Called with a list of IDs, returns the
+                entities in the same order, None for those missing
+        """
+        self._relations[name] = (index, load)
+
+    def _relation(self, name):
+        """Return the index and loader of a relation, creating it if unbound."""
+        relation = self._relations.get(name)
+        if relation is None:
+            # Imported here: the persistence layer imports the models
+            from app.persistence.relation_index import RelationIndex
+            relation = self._relations.setdefault(name, (RelationIndex(), None))
+        return relation
+
+    def link(self, name, parent_id, child):
+        """Attach a child entity to a parent in a relation."""
+        index, _ = self._relation(name)
+        self._live[child.id] = child
+        index.link(parent_id, child.id)
+
+    def unlink(self, name, child_id):
+        """Detach a child from its parent in a relation."""
+        self._relation(name)[0].unlink(child_id)
+
+    def children(self, name, parent_id):
+        """
+        Return the children of a parent in a relation, in link order.
+
+        Returns:
+            list: The child entities; those that no longer exist are skipped
+        """
+        index, load = self._relation(name)
+        ids = index.children(parent_id)
+        children = load(ids) if load is not None else [None] * len(ids)
+        # Children not stored yet are only found among the live instances
+        children = [child or self._live.get(child_id) for child_id, child in zip(ids, children)]
+        return [child for child in children if child is not None]
+
+
+# Shared by every model; see HBnBFacade for the bound indexes
+relations = Relations()
+
+
+def is_writable(obj, name):
+    """Return True if update() may assign an attribute of an entity."""
+    attribute = getattr(type(obj), name, None)
+    # Derived attributes such as owner_id are read-only properties
+    if isinstance(attribute, property) and attribute.fset is None:
+        return False
+    return hasattr(obj, name)
+
 
 class BaseModel:
     """Base class for all models with common attributes."""
+    # Fixed attribute layout instead of a per-instance __dict__;
+    # __weakref__ keeps instances usable in weak identity maps.
+    # The ID is kept as an integer and timestamps as epoch microseconds;
+    # their string forms are only built, then cached, when read.
+    # References a repository left unloaded are kept in _deferred, with
+    # their own slots unset until first read.
+    __slots__ = ('_key', '_id', '_created_us', '_updated_us',
+                 '_created_iso', '_updated_iso', '_deferred', '__weakref__')
+    # Public attributes making up the persisted state of the slots above
+    _state_attributes = ('id', 'created_at', 'updated_at')
+    # Attributes holding related entities, by name
+    _references = {}
+
     def __init__(self):
-        self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._key = uuid.uuid4().int
+        self._id = None
+        self._created_us = self._updated_us = to_epoch_us(datetime.now())
+        self._created_iso = self._updated_iso = None
+
+    @property
+    def key(self):
+        """Compact form of the ID, which repositories key entities on."""
+        return self._key
+
+    @property
+    def id(self):
+        """ID of the entity as a UUID string."""
+        if self._id is None:
+            self._id = str(uuid.UUID(int=self._key))
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._key = id_key(value)
+        # A canonical UUID string is rebuilt from the key when it is read
+        self._id = None if isinstance(self._key, int) and value.islower() else value
+
+    @property
+    def created_at(self):
+        """Creation time as a naive local datetime."""
+        return from_epoch_us(self._created_us)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_us = to_epoch_us(value)
+        self._created_iso = None
+
+    @property
+    def updated_at(self):
+        """Time of the last modification as a naive local datetime."""
+        return from_epoch_us(self._updated_us)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated_us = to_epoch_us(value)
+        self._updated_iso = None
+
+    @property
+    def created_at_iso(self):
+        """ISO 8601 form of created_at, formatted once."""
+        if self._created_iso is None:
+            self._created_iso = self.created_at.isoformat()
+        return self._created_iso
+
+    @property
+    def updated_at_iso(self):
+        """ISO 8601 form of updated_at, formatted once per modification."""
+        if self._updated_iso is None:
+            self._updated_iso = self.updated_at.isoformat()
+        return self._updated_iso
+
+    def __getattr__(self, name):
+        # Only reached for unset slots: load a deferred reference on first read
+        if name != '_deferred':
+            deferred = getattr(self, '_deferred', None)
+            if deferred and name in deferred:
+                value = deferred[name].load()
+                setattr(self, name, value)
+                deferred.pop(name, None)
+                return value
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def reference_ids(self, name):
+        """
+        Return the IDs held by a reference attribute without loading it.
+
+        Args:
+            name (str): Name of a reference declared in _references
+
+        Returns:
+            The ID of the related entity or None, or the list of IDs of a
+            list of entities
+        """
+        try:
+            value = slot_value(self, name)
+        except AttributeError:
+            ids = self._deferred[name].ids
+            return list(ids) if self._references[name].many else ids
+        if value.__class__ is list:
+            return [item.id for item in value]
+        return None if value is None else value.id
+
+    def is_loaded(self, name):
+        """Return True if a reference attribute holds its entities, False if still deferred."""
+        try:
+            slot_value(self, name)
+        except AttributeError:
+            return False
+        return True
 
     def save(self):
         """Update the updated_at timestamp whenever the object is modified"""
@@ -18,12 +298,12 @@ class BaseModel:
 
     def update(self, data):
         """Update the attributes of the object based on the provided dictionary.
-        
+
         Args:
             data (dict): Dictionnary containing the attributes to update
         """
         for key, value in data.items():
-            if hasattr(self, key):
+            if is_writable(self, key):
                 setattr(self, key, value)
         self.save()
 
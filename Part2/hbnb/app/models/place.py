@@ -2,12 +2,16 @@
 Place model for the HBnB application.
 Represents a place that can be rented.
 """
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, Reference, relations, slot_value
 
 
 class Place(BaseModel):
     """Place class representing a rentable property."""
     
+    __slots__ = ('title', 'description', 'price', 'latitude', 'longitude', 'owner',
+                 'amenities', 'rating_count', 'rating_sum', 'rating_histogram')
+    _references = {'owner': Reference('User'), 'amenities': Reference('Amenity', many=True)}
+
     def __init__(self, title, description, price, latitude, longitude, owner):
         """
         Initialize a Place instance.
@@ -30,8 +34,11 @@ class Place(BaseModel):
         self.latitude = self._validate_latitude(latitude)
         self.longitude = self._validate_longitude(longitude)
         self.owner = self._validate_owner(owner)
-        self.reviews = []  # List to store reviews for this place
         self.amenities = []  # List to store amenities for this place
+        # Running rating aggregates, kept in step with the reviews
+        self.rating_count = 0
+        self.rating_sum = 0
+        self.rating_histogram = [0] * 5  # Number of 1 to 5 star ratings
         
         # Add this place to the owner's list of places
         if hasattr(owner, 'add_place'):
@@ -148,6 +155,65 @@ class Place(BaseModel):
             raise ValueError("Owner must be a valid User instance")
         return owner
 
+    @property
+    def owner_id(self):
+        """ID of the owner, read without loading the owner."""
+        try:
+            return slot_value(self, 'owner').id
+        except AttributeError:
+            # Deferred, or no owner
+            return self.reference_ids('owner')
+
+    @property
+    def amenity_ids(self):
+        """IDs of the amenities, read without loading the amenities."""
+        return self.reference_ids('amenities')
+
+    @property
+    def reviews(self):
+        """Reviews of the place in creation order, read from the place_reviews relation."""
+        return relations.children('place_reviews', self.id)
+
+    @property
+    def rating_avg(self):
+        """Average rating of the place, or None if it has no ratings."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    def add_rating(self, rating):
+        """
+        Count a rating in the aggregates.
+        
+        Args:
+            rating (int): Rating between 1 and 5
+        """
+        self.rating_count += 1
+        self.rating_sum += rating
+        self.rating_histogram[rating - 1] += 1
+
+    def remove_rating(self, rating):
+        """
+        Remove a previously counted rating from the aggregates.
+        
+        Args:
+            rating (int): Rating between 1 and 5
+        """
+        self.rating_count -= 1
+        self.rating_sum -= rating
+        self.rating_histogram[rating - 1] -= 1
+
+    def recompute_ratings(self, histogram):
+        """
+        Rebuild the rating aggregates from scratch.
+        
+        Args:
+            histogram (list): Number of reviews of the place rated 1 to 5
+        """
+        self.rating_histogram = list(histogram)
+        self.rating_count = sum(histogram)
+        self.rating_sum = sum(rating * count for rating, count in enumerate(histogram, 1))
+
     def add_review(self, review):
         """
         Add a review to the place.
@@ -155,8 +221,7 @@ class Place(BaseModel):
         Args:
             review (Review): The review to add
         """
-        if review not in self.reviews:
-            self.reviews.append(review)
+        relations.link('place_reviews', self.id, review)
 
     def add_amenity(self, amenity):
         """
@@ -2,10 +2,14 @@
 Review model for the HBnB application.
 Represents a review written by a user for a place.
 """
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, Reference, slot_value
 
 class Review(BaseModel):
     """Review class representing a user's review of a place."""
+
+    __slots__ = ('text', 'rating', 'place', 'user')
+    _references = {'place': Reference('Place'), 'user': Reference('User')}
+
     def __init__(self, text, rating, place, user):
         """
         Initialize a Review instance.
@@ -108,6 +112,24 @@ class Review(BaseModel):
             raise ValueError("User must be a valid user instance")
         return user 
     
+    @property
+    def place_id(self):
+        """ID of the reviewed place, read without loading the place."""
+        try:
+            return slot_value(self, 'place').id
+        except AttributeError:
+            # Deferred, or no place
+            return self.reference_ids('place')
+
+    @property
+    def user_id(self):
+        """ID of the author, read without loading the author."""
+        try:
+            return slot_value(self, 'user').id
+        except AttributeError:
+            # Deferred, or no user
+            return self.reference_ids('user')
+
     def __repr__(self):
         """String representation of the Review."""
         return f"<Review {self.id} - Rating: {self.rating}>"
@@ -2,13 +2,15 @@
 User model for the HBnB application.
 Represents a user who can own places and write reviews.
 """
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, relations
 import re
 
 
 class User(BaseModel):
     """User class representing a user in the system."""
     
+    __slots__ = ('first_name', 'last_name', 'email', 'is_admin')
+
     def __init__(self, first_name, last_name, email, is_admin=False):
         """
         Initialize a User instance.
@@ -27,8 +29,6 @@ class User(BaseModel):
         self.last_name = self._validate_name(last_name, "Last name")
         self.email = self._validate_email(email)
         self.is_admin = is_admin
-        self.places = []  # List to store places owned by the user
-        self.reviews = []  # List to store reviews written by the user
 
     @staticmethod
     def _validate_name(name, field_name):
@@ -75,6 +75,11 @@ class User(BaseModel):
         
         return email.lower().strip()
 
+    @property
+    def places(self):
+        """Places owned by the user in creation order, read from the user_places relation."""
+        return relations.children('user_places', self.id)
+
     def add_place(self, place):
         """
         Add a place to the user's list of owned places.
@@ -82,8 +87,12 @@ class User(BaseModel):
         Args:
             place: The Place instance to add
         """
-        if place not in self.places:
-            self.places.append(place)
+        relations.link('user_places', self.id, place)
+
+    @property
+    def reviews(self):
+        """Reviews written by the user in creation order, read from the user_reviews relation."""
+        return relations.children('user_reviews', self.id)
 
     def add_review(self, review):
         """
@@ -92,8 +101,7 @@ class User(BaseModel):
         Args:
             review: The Review instance to add
         """
-        if review not in self.reviews:
-            self.reviews.append(review)
+        relations.link('user_reviews', self.id, review)
 
     def __repr__(self):
         """String representation of the User."""
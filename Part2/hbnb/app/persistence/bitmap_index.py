@@ -0,0 +1,128 @@
+"""
+Bitmap inverted index for the HBnB application.
+Maps a key (e.g. an amenity ID) to an integer bitset of object ordinals,
+so that "has all of these keys" queries are bitwise ANDs.
+"""
+import threading
+
+
+def iter_bits(bits, after=None):
+    """
+    Yield the positions of the set bits of an integer, lowest first.
+
+    Args:
+        bits (int): The bitset
+        after (int, optional): Only yield positions greater than this one
+
+    Yields:
+        int: Position of each set bit
+    """
+    start = 0 if after is None else after + 1
+    bits >>= start
+    # One conversion to a string, then C-speed searches for each set bit
+    digits = bin(bits)[:1:-1]
+    position = digits.find('1')
+    while position != -1:
+        yield start + position
+        position = digits.find('1', position + 1)
+
+
+class BitmapIndex:
+    """
+    Inverted index from keys to bitsets of ordinals.
+
+    Ordinals are small dense integers, such as those handed out by a
+    ColumnStore, so a bitset of n objects takes about n / 8 bytes.
+    Reads and writes hold the same lock; bitsets are immutable integers,
+    so a returned bitset is a consistent snapshot.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._bitmaps = {}
+        self._keys = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, key):
+        return key in self._bitmaps
+
+    def bitmap(self, key):
+        """Return the bitset of a key, 0 if it has none."""
+        return self._bitmaps.get(key, 0)
+
+    def keys_of(self, ordinal):
+        """Return the set of keys an ordinal is indexed under."""
+        with self._lock:
+            return set(self._keys.get(ordinal, ()))
+
+    def contains(self, key, ordinal):
+        """Return True if an ordinal is indexed under a key."""
+        with self._lock:
+            return key in self._keys.get(ordinal, ())
+
+    def add(self, key, ordinal):
+        """Index an ordinal under a key."""
+        with self._lock:
+            self._bitmaps[key] = self._bitmaps.get(key, 0) | (1 << ordinal)
+            self._keys.setdefault(ordinal, set()).add(key)
+
+    def discard(self, key, ordinal):
+        """Remove an ordinal from a key if it is indexed under it."""
+        with self._lock:
+            keys = self._keys.get(ordinal)
+            if keys is None or key not in keys:
+                return
+            keys.discard(key)
+            if not keys:
+                del self._keys[ordinal]
+            bits = self._bitmaps[key] & ~(1 << ordinal)
+            if bits:
+                self._bitmaps[key] = bits
+            else:
+                del self._bitmaps[key]
+
+    def set(self, ordinal, keys):
+        """Replace the keys an ordinal is indexed under."""
+        keys = set(keys)
+        with self._lock:
+            current = self.keys_of(ordinal)
+            for key in current - keys:
+                self.discard(key, ordinal)
+            for key in keys - current:
+                self.add(key, ordinal)
+
+    def clear(self, ordinal):
+        """Remove an ordinal from every key, e.g. before it is recycled."""
+        self.set(ordinal, ())
+
+    def drop(self, key):
+        """Remove a key and its whole bitset."""
+        with self._lock:
+            bits = self._bitmaps.pop(key, 0)
+            for ordinal in iter_bits(bits):
+                keys = self._keys[ordinal]
+                keys.discard(key)
+                if not keys:
+                    del self._keys[ordinal]
+
+    def intersect(self, keys):
+        """
+        Return the bitset of the ordinals indexed under every key.
+
+        Args:
+            keys (iterable): Keys to intersect; must not be empty
+
+        Returns:
+            int: The intersected bitset
+        """
+        # An AND is as long as its shortest operand, so start from there
+        with self._lock:
+            bitmaps = sorted((self._bitmaps.get(key, 0) for key in keys), key=int.bit_length)
+        if not bitmaps:
+            raise ValueError("At least one key is required")
+        result = bitmaps[0]
+        for bits in bitmaps[1:]:
+            if not result:
+                break
+            result &= bits
+        return result
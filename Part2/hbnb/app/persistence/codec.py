@@ -0,0 +1,170 @@
+"""
+Encoding of model instances to JSON-compatible state for durable backends.
+References to other entities are stored as (class name, id) pairs and
+resolved again on load, so each entity is stored on its own.
+"""
+from datetime import datetime
+
+from app.models.base_model import BaseModel
+
+# Cache of state_names() per model class
+_STATE_NAMES = {}
+# Cache of references() per model class
+_REFERENCES = {}
+
+
+def model_class(class_name):
+    """
+    Return the model class registered under a class name.
+
+    Args:
+        class_name (str): Name of a BaseModel subclass
+
+    Returns:
+        type: The model class
+
+    Raises:
+        ValueError: If no model has that name
+    """
+    # Imported here to avoid a circular import through app.models
+    from app import models
+    cls = getattr(models, class_name, None)
+    if not isinstance(cls, type) or not issubclass(cls, BaseModel):
+        raise ValueError(f"Unknown model class: {class_name}")
+    return cls
+
+
+def encode_value(value):
+    """Encode an attribute value, replacing entities by references."""
+    if isinstance(value, BaseModel):
+        return {'$ref': [type(value).__name__, value.id]}
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {'$map': [[key, encode_value(item)] for key, item in value.items()]}
+    return value
+
+
+def decode_value(value, resolve):
+    """
+    Decode an attribute value produced by encode_value.
+
+    Args:
+        value: The encoded value
+        resolve (callable): Called with (class name, id) to load a reference
+
+    Returns:
+        The decoded value
+    """
+    if isinstance(value, list):
+        decoded = []
+        for item in value:
+            result = decode_value(item, resolve)
+            # References to entities deleted since are dropped from lists
+            if result is None and isinstance(item, dict) and '$ref' in item:
+                continue
+            decoded.append(result)
+        return decoded
+    if isinstance(value, dict):
+        if '$ref' in value:
+            class_name, obj_id = value['$ref']
+            return resolve(class_name, obj_id)
+        if '$dt' in value:
+            return datetime.fromisoformat(value['$dt'])
+        if '$map' in value:
+            return {key: decode_value(item, resolve) for key, item in value['$map']}
+    return value
+
+
+def state_names(cls):
+    """
+    Return the names of the attributes making up the state of a model.
+
+    Models declare their attributes with __slots__, so the state is the
+    union of the slots along the class hierarchy. A class whose slots hold
+    a compact internal form lists the public attributes to persist instead
+    in _state_attributes.
+
+    Args:
+        cls (type): A BaseModel subclass
+
+    Returns:
+        tuple: Attribute names, base class attributes first
+    """
+    names = _STATE_NAMES.get(cls)
+    if names is None:
+        names = tuple(name for klass in reversed(cls.__mro__)
+                      for name in klass.__dict__.get(
+                          '_state_attributes', klass.__dict__.get('__slots__', ()))
+                      if name != '__weakref__')
+        _STATE_NAMES[cls] = names
+    return names
+
+
+def references(cls):
+    """
+    Return the reference attributes of a model.
+
+    Args:
+        cls (type): A BaseModel subclass
+
+    Returns:
+        dict: Attribute name to its Reference, base class attributes first
+    """
+    found = _REFERENCES.get(cls)
+    if found is None:
+        found = {name: reference for klass in reversed(cls.__mro__)
+                 for name, reference in klass.__dict__.get('_references', {}).items()}
+        _REFERENCES[cls] = found
+    return found
+
+
+def dump_state(obj, exclude=()):
+    """
+    Return the encoded state of a model instance.
+
+    Args:
+        obj (BaseModel): The instance to encode
+        exclude (container): Attribute names to leave out, e.g. the
+            references a backend stores on their own
+
+    Returns:
+        dict: Attribute name to encoded value
+    """
+    state = {}
+    for name in state_names(type(obj)):
+        if name in exclude:
+            continue
+        try:
+            state[name] = encode_value(getattr(obj, name))
+        except AttributeError:
+            # Slot never assigned
+            continue
+    return state
+
+
+def new_instance(class_name):
+    """Create an empty instance of a model, bypassing __init__ validation."""
+    cls = model_class(class_name)
+    return cls.__new__(cls)
+
+
+def load_state(obj, state, resolve):
+    """
+    Restore an instance created by new_instance from its encoded state.
+
+    The instance must already be reachable by resolve() so that a
+    reference cycle would resolve to it.
+
+    Args:
+        obj (BaseModel): The empty instance
+        state (dict): Encoded state from dump_state
+        resolve (callable): Called with (class name, id) to load a reference
+    """
+    names = state_names(type(obj))
+    for name, value in state.items():
+        # Attributes dropped from a model since the state was written are ignored
+        if name in names:
+            object.__setattr__(obj, name, decode_value(value, resolve))
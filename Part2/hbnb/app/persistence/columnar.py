@@ -0,0 +1,296 @@
+"""
+Columnar (struct-of-arrays) storage of numeric entity fields.
+Keeps hot fields in contiguous typed buffers next to the object
+repositories, so scans over them do not touch the Python objects.
+"""
+import operator
+import threading
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional: operations fall back to pure Python
+    numpy = None
+
+# NumPy dtypes matching the array typecodes used by the columns
+_DTYPES = {'b': 'int8', 'q': 'int64', 'd': 'float64'}
+
+
+class ColumnStore:
+    """
+    Typed columns indexed by a dense ordinal per object ID.
+
+    Ordinals of removed objects are recycled; the 'live' column tells
+    which slots are in use, so vectorised code can mask free slots.
+    """
+
+    def __init__(self, columns):
+        """
+        Initialize an empty store.
+
+        Args:
+            columns (dict): Column name to array typecode ('d' for floats,
+                'q' for integers, 'b' for small integers)
+        """
+        self._columns = {name: array(typecode) for name, typecode in columns.items()}
+        self._live = array('b')
+        self._ids = []
+        self._ordinals = {}
+        self._free = []
+        # Held while a column buffer is exported (e.g. to NumPy), since an
+        # array cannot grow while a view on it exists
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._ordinals)
+
+    def __contains__(self, obj_id):
+        return obj_id in self._ordinals
+
+    @property
+    def capacity(self):
+        """Number of slots, live or free."""
+        return len(self._ids)
+
+    def ordinal(self, obj_id):
+        """Return the ordinal of an object ID, or None if it is not stored."""
+        return self._ordinals.get(obj_id)
+
+    def id_at(self, ordinal):
+        """Return the object ID stored at an ordinal, or None for a free slot."""
+        return self._ids[ordinal]
+
+    def column(self, name):
+        """Return the array backing a column."""
+        return self._columns[name]
+
+    @property
+    def live(self):
+        """Array holding 1 for used slots and 0 for free ones."""
+        return self._live
+
+    def put(self, obj_id, **values):
+        """
+        Store or overwrite the values of an object.
+
+        Args:
+            obj_id (str): ID of the object
+            **values: Value of every column
+
+        Returns:
+            int: Ordinal of the object
+        """
+        with self.lock:
+            ordinal = self._ordinals.get(obj_id)
+            if ordinal is None:
+                if self._free:
+                    ordinal = self._free.pop()
+                    self._ids[ordinal] = obj_id
+                    self._live[ordinal] = 1
+                else:
+                    ordinal = len(self._ids)
+                    self._ids.append(obj_id)
+                    self._live.append(1)
+                    for column in self._columns.values():
+                        column.append(0)
+                self._ordinals[obj_id] = ordinal
+            for name, value in values.items():
+                self._columns[name][ordinal] = value
+            return ordinal
+
+    def remove(self, obj_id):
+        """Free the slot of an object if it is stored."""
+        with self.lock:
+            ordinal = self._ordinals.pop(obj_id, None)
+            if ordinal is None:
+                return
+            self._ids[ordinal] = None
+            self._live[ordinal] = 0
+            self._free.append(ordinal)
+
+    def view(self, name):
+        """
+        Return a zero-copy NumPy view of a column, or of 'live'.
+
+        Must be called, and the view dropped, while holding lock.
+        """
+        column = self._live if name == 'live' else self._columns[name]
+        return numpy.frombuffer(column, dtype=_DTYPES[column.typecode], count=len(column))
+
+
+def row_mask(store, bbox=None):
+    """
+    Select the live rows of a store, optionally inside a bounding box.
+
+    Args:
+        store (ColumnStore): Store with 'latitude' and 'longitude' columns
+            when bbox is given
+        bbox (tuple, optional): (min_lon, min_lat, max_lon, max_lat);
+            max_lon is less than min_lon when the box crosses the antimeridian
+
+    Returns:
+        Mask indexed by ordinal: a NumPy boolean array, or a bytearray of
+        0 and 1 without NumPy
+    """
+    with store.lock:
+        if numpy is None:
+            if bbox is None:
+                return bytearray(store.live)
+            # Each comparison runs in C over a whole column; the byte masks
+            # are then combined as integers
+            min_lon, min_lat, max_lon, max_lat = bbox
+            lats, lons = store.column('latitude'), store.column('longitude')
+            bits = (int.from_bytes(store.live, 'little')
+                    & _compare(operator.ge, lats, min_lat) & _compare(operator.le, lats, max_lat))
+            if min_lon > max_lon:
+                bits &= _compare(operator.ge, lons, min_lon) | _compare(operator.le, lons, max_lon)
+            else:
+                bits &= _compare(operator.ge, lons, min_lon) & _compare(operator.le, lons, max_lon)
+            return bytearray(bits.to_bytes(store.capacity, 'little'))
+
+        live = store.view('live')
+        mask = live != 0
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            lats, lons = store.view('latitude'), store.view('longitude')
+            mask &= (lats >= min_lat) & (lats <= max_lat)
+            if min_lon > max_lon:
+                mask &= (lons >= min_lon) | (lons <= max_lon)
+            else:
+                mask &= (lons >= min_lon) & (lons <= max_lon)
+            del lats, lons
+        # Views must not outlive the lock: the arrays cannot grow meanwhile
+        del live
+        return mask
+
+
+def ordinal_mask(store, obj_ids):
+    """
+    Select the rows of a store holding the given object IDs.
+
+    Lets an index that already narrowed a query down (e.g. a grid index
+    for a bounding box) build the mask instead of a pass over the columns.
+
+    Args:
+        store (ColumnStore): The store
+        obj_ids (iterable): IDs of the objects to select; IDs not stored
+            are ignored
+
+    Returns:
+        Mask of the rows of store, of the same kind as row_mask returns
+    """
+    with store.lock:
+        ordinals = [ordinal for ordinal in map(store.ordinal, obj_ids) if ordinal is not None]
+        if numpy is None:
+            mask = bytearray(store.capacity)
+            for ordinal in ordinals:
+                mask[ordinal] = 1
+            return mask
+        mask = numpy.zeros(store.capacity, dtype=bool)
+        mask[ordinals] = True
+        return mask
+
+
+def value_mask(store, name, value):
+    """
+    Select the live rows of a store holding a value in a column.
+
+    Args:
+        store (ColumnStore): The store
+        name (str): Name of the column, such as a column of ordinals
+        value: Value the selected rows hold
+
+    Returns:
+        Mask of the rows of store, of the same kind as row_mask returns
+    """
+    with store.lock:
+        if numpy is None:
+            bits = (int.from_bytes(store.live, 'little')
+                    & _compare(operator.eq, store.column(name), value))
+            return bytearray(bits.to_bytes(store.capacity, 'little'))
+
+        column, live = store.view(name), store.view('live')
+        mask = (column == value) & (live != 0)
+        del column, live
+        return mask
+
+
+def column_summary(store, name, mask):
+    """
+    Summarize the values of a column over the selected rows.
+
+    Args:
+        store (ColumnStore): The store
+        name (str): Name of a numeric column
+        mask: Selected rows, as returned by row_mask, ordinal_mask or value_mask
+
+    Returns:
+        dict: count, sum, min and max (None for min and max when no row
+            is selected)
+    """
+    with store.lock:
+        if numpy is None:
+            values = list(compress(store.column(name), mask))
+            return {'count': len(values), 'sum': sum(values),
+                    'min': min(values, default=None), 'max': max(values, default=None)}
+
+        column = store.view(name)
+        values = _masked(column, mask)
+        del column
+        if not len(values):
+            return {'count': 0, 'sum': 0, 'min': None, 'max': None}
+        return {'count': int(len(values)), 'sum': values.sum().item(),
+                'min': values.min().item(), 'max': values.max().item()}
+
+
+def column_counts(store, name, mask, size):
+    """
+    Count the selected rows per value of a small integer column.
+
+    Args:
+        store (ColumnStore): The store
+        name (str): Name of a column holding integers in range(size)
+        mask: Selected rows, as returned by row_mask or value_mask
+        size (int): Number of distinct values
+
+    Returns:
+        list: Number of selected rows holding each value
+    """
+    with store.lock:
+        if numpy is None:
+            counts = Counter(compress(store.column(name), mask))
+            return [counts[value] for value in range(size)]
+
+        column = store.view(name)
+        counts = numpy.bincount(_masked(column, mask), minlength=size)
+        del column
+        return counts.tolist()
+
+
+def column_distinct(store, name, mask):
+    """Return the number of distinct values of a column over the selected rows."""
+    with store.lock:
+        if numpy is None:
+            return len(set(compress(store.column(name), mask)))
+
+        column = store.view(name)
+        count = numpy.unique(_masked(column, mask)).size
+        del column
+        return int(count)
+
+
+def _masked(column, mask):
+    """
+    Copy the selected values of a column view.
+
+    Rows added since the mask was built are skipped.
+    """
+    size = min(len(column), len(mask))
+    return column[:size][mask[:size]]
+
+
+def _compare(op, column, value):
+    """Compare every value of a column to a constant; return the 0/1 bytes as an integer."""
+    return int.from_bytes(bytes(map(op, column, repeat(value))), 'little')
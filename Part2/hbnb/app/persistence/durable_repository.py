@@ -0,0 +1,75 @@
+"""
+Durable variant of the in-memory repository for the HBnB application.
+Keeps every entity in memory and records each write in a Journal so the
+data survives a restart.
+"""
+from app.persistence.repository import InMemoryRepository
+
+
+class DurableRepository(InMemoryRepository):
+    """
+    In-memory repository whose writes are logged before they are acknowledged.
+
+    A write is applied and logged under the repository lock, so the log
+    order of an entity's records always matches the order of its writes;
+    waiting for the fsync happens after the lock is released so concurrent
+    writers share it.
+    """
+
+    def __init__(self, journal, model, indexes=None):
+        """
+        Initialize the repository.
+
+        Args:
+            journal (Journal): Log shared by the repositories of the facade
+            model (type): Model class stored in this repository
+            indexes (iterable, optional): Attribute names to index
+        """
+        super().__init__(indexes=indexes)
+        self._journal = journal
+        journal.register(model.__name__, self)
+
+    def restore(self, obj):
+        """Store an entity recovered from the journal without logging it."""
+        super().add(obj)
+
+    def add(self, obj):
+        with self._lock:
+            super().add(obj)
+            lsn = self._journal.append('put', obj)
+        self._journal.commit(lsn)
+
+    def add_many(self, objects):
+        with self._lock:
+            super().add_many(objects)
+            lsn = None
+            for obj in objects:
+                lsn = self._journal.append('put', obj)
+        # One wait for the whole batch
+        if lsn is not None:
+            self._journal.commit(lsn)
+
+    def update(self, obj_id, data):
+        with self._lock:
+            super().update(obj_id, data)
+            obj = self.get(obj_id)
+            if not obj:
+                return
+            lsn = self._journal.append('put', obj)
+        self._journal.commit(lsn)
+
+    def delete(self, obj_id):
+        with self._lock:
+            obj = self.get(obj_id)
+            if not obj:
+                return
+            super().delete(obj_id)
+            lsn = self._journal.append('del', obj)
+        self._journal.commit(lsn)
+
+    def save(self, obj):
+        with self._lock:
+            if self.get(obj.id) is not obj:
+                return
+            lsn = self._journal.append('put', obj)
+        self._journal.commit(lsn)
@@ -0,0 +1,278 @@
+"""
+Spatial index over place coordinates for the HBnB application.
+Buckets points into a fixed latitude/longitude grid so that radius and
+bounding-box queries only look at the cells they overlap.
+"""
+import heapq
+import math
+import threading
+
+from app.persistence.columnar import numpy
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Return the great-circle distance between two points.
+
+    Args:
+        lat1 (float): Latitude of the first point in degrees
+        lon1 (float): Longitude of the first point in degrees
+        lat2 (float): Latitude of the second point in degrees
+        lon2 (float): Longitude of the second point in degrees
+
+    Returns:
+        float: Distance in kilometers
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _haversine_vector(lat, lon, lats, lons):
+    """Vectorised haversine_km from one point to NumPy arrays of points."""
+    phi1 = math.radians(lat)
+    phi2 = numpy.radians(lats)
+    dphi = phi2 - phi1
+    dlambda = numpy.radians(lons - lon)
+    a = numpy.sin(dphi / 2) ** 2 + math.cos(phi1) * numpy.cos(phi2) * numpy.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1.0)))
+
+
+def k_nearest(store, lat, lon, k):
+    """
+    Return the k points of a column store nearest to a point.
+
+    With NumPy, distances to every point are computed in one vectorised
+    pass over the 'latitude' and 'longitude' columns and the k smallest
+    are selected with argpartition; without it, a heap selection runs
+    over the same columns.
+
+    Args:
+        store (ColumnStore): Store with 'latitude' and 'longitude' columns
+        lat (float): Latitude of the reference point
+        lon (float): Longitude of the reference point
+        k (int): Number of neighbours to return
+
+    Returns:
+        list: (id, distance_km) tuples sorted by distance
+    """
+    with store.lock:
+        k = min(k, len(store))
+        if k <= 0:
+            return []
+        if numpy is None:
+            columns = zip(store.column('latitude'), store.column('longitude'), store.live)
+            nearest = heapq.nsmallest(k, (
+                (haversine_km(lat, lon, point_lat, point_lon), ordinal)
+                for ordinal, (point_lat, point_lon, used) in enumerate(columns) if used))
+            return [(store.id_at(ordinal), distance) for distance, ordinal in nearest]
+
+        lats, lons, live = store.view('latitude'), store.view('longitude'), store.view('live')
+        distances = _haversine_vector(lat, lon, lats, lons)
+        distances[live == 0] = numpy.inf
+        # Views must not outlive the lock: the arrays cannot grow meanwhile
+        del lats, lons, live
+        if k < len(distances):
+            candidates = numpy.argpartition(distances, k - 1)[:k]
+        else:
+            candidates = numpy.arange(len(distances))
+        candidates = candidates[numpy.argsort(distances[candidates], kind='stable')]
+        return [(store.id_at(int(ordinal)), float(distances[ordinal])) for ordinal in candidates]
+
+
+class GeoGridIndex:
+    """
+    Grid index of points keyed by an object ID.
+
+    Queries cost the number of overlapped cells plus the number of points
+    in them, instead of the total number of points. Reads and writes hold
+    the same lock, so queries may run while other threads move points.
+    """
+
+    def __init__(self, cell_degrees=0.25):
+        """
+        Initialize an empty index.
+
+        Args:
+            cell_degrees (float): Side of a grid cell in degrees
+        """
+        self.cell_degrees = cell_degrees
+        self._rows = math.ceil(180 / cell_degrees)
+        self._cols = math.ceil(360 / cell_degrees)
+        self._cells = {}
+        self._points = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, obj_id):
+        return obj_id in self._points
+
+    def _cell(self, lat, lon):
+        """Return the (row, col) of the cell containing a point."""
+        row = min(int((lat + 90) / self.cell_degrees), self._rows - 1)
+        col = int((lon + 180) / self.cell_degrees) % self._cols
+        return row, col
+
+    def insert(self, obj_id, lat, lon):
+        """Add a point, moving it if the ID is already indexed."""
+        lat, lon = float(lat), float(lon)
+        cell = self._cell(lat, lon)
+        with self._lock:
+            self.remove(obj_id)
+            self._cells.setdefault(cell, {})[obj_id] = (lat, lon)
+            self._points[obj_id] = cell
+
+    def remove(self, obj_id):
+        """Remove a point if it is indexed."""
+        with self._lock:
+            cell = self._points.pop(obj_id, None)
+            if cell is None:
+                return
+            bucket = self._cells[cell]
+            del bucket[obj_id]
+            if not bucket:
+                del self._cells[cell]
+
+    def point(self, obj_id):
+        """Return the (lat, lon) of an indexed ID, or None."""
+        with self._lock:
+            cell = self._points.get(obj_id)
+            return None if cell is None else self._cells[cell][obj_id]
+
+    def _overlapping_cells(self, min_lat, max_lat, lon_ranges):
+        """Return the occupied or possible cells overlapping a box; the lock must be held."""
+        first_row, _ = self._cell(max(min_lat, -90.0), 0.0)
+        last_row, _ = self._cell(min(max_lat, 90.0), 0.0)
+        cols = set()
+        for min_lon, max_lon in lon_ranges:
+            first_col = int((min_lon + 180) / self.cell_degrees)
+            last_col = int((max_lon + 180) / self.cell_degrees)
+            cols.update(col % self._cols for col in range(first_col, last_col + 1))
+
+        if (last_row - first_row + 1) * len(cols) > len(self._cells):
+            # Visiting the occupied cells is cheaper than the grid area
+            cells = [cell for cell in self._cells
+                     if first_row <= cell[0] <= last_row and cell[1] in cols]
+        else:
+            cells = [(row, col) for row in range(first_row, last_row + 1) for col in cols]
+        return cells
+
+    def _candidates(self, min_lat, max_lat, lon_ranges):
+        """Return (id, lat, lon) for points in the cells overlapping a box."""
+        with self._lock:
+            return [(obj_id, lat, lon)
+                    for cell in self._overlapping_cells(min_lat, max_lat, lon_ranges)
+                    for obj_id, (lat, lon) in self._cells.get(cell, {}).items()]
+
+    def estimate_bbox(self, min_lon, min_lat, max_lon, max_lat):
+        """
+        Return an upper bound of the number of points inside a bounding box.
+
+        Counts the points of the overlapped cells without looking at them,
+        so it is much cheaper than within_bbox.
+        """
+        with self._lock:
+            cells = self._overlapping_cells(min_lat, max_lat, _bbox_longitudes(min_lon, max_lon))
+            return sum(len(self._cells.get(cell, ())) for cell in cells)
+
+    def within_radius(self, lat, lon, radius_km):
+        """
+        Return the points within a distance of a center, nearest first.
+
+        Args:
+            lat (float): Latitude of the center
+            lon (float): Longitude of the center
+            radius_km (float): Search radius in kilometers
+
+        Returns:
+            list: (id, distance_km) tuples sorted by distance
+        """
+        dlat = radius_km / KM_PER_DEGREE
+        angular_radius = radius_km / EARTH_RADIUS_KM
+        cos_lat = math.cos(math.radians(lat))
+        if abs(lat) + dlat >= 90 or angular_radius >= math.pi / 2 \
+                or math.sin(angular_radius) >= cos_lat:
+            # The circle reaches a pole or wraps around the globe
+            lon_ranges = [(-180.0, 180.0)]
+        else:
+            # Widest longitude span of a spherical circle
+            dlon = math.degrees(math.asin(math.sin(angular_radius) / cos_lat))
+            lon_ranges = _split_longitudes(lon - dlon, lon + dlon)
+
+        results = []
+        for obj_id, point_lat, point_lon in self._candidates(lat - dlat, lat + dlat, lon_ranges):
+            distance = haversine_km(lat, lon, point_lat, point_lon)
+            if distance <= radius_km:
+                results.append((obj_id, distance))
+        results.sort(key=lambda result: result[1])
+        return results
+
+    def within_bbox(self, min_lon, min_lat, max_lon, max_lat, lat=None, lon=None):
+        """
+        Return the points inside a bounding box, nearest to a center first.
+
+        A box whose min_lon is greater than its max_lon crosses the
+        antimeridian.
+
+        Args:
+            min_lon (float): Western edge
+            min_lat (float): Southern edge
+            max_lon (float): Eastern edge
+            max_lat (float): Northern edge
+            lat (float, optional): Latitude to sort by, box center by default
+            lon (float, optional): Longitude to sort by, box center by default
+
+        Returns:
+            list: (id, distance_km) tuples sorted by distance
+        """
+        lon_ranges = _bbox_longitudes(min_lon, max_lon)
+        if lat is None or lon is None:
+            lat = (min_lat + max_lat) / 2
+            width = (max_lon - min_lon) % 360
+            lon = (min_lon + width / 2 + 180) % 360 - 180
+
+        results = []
+        for obj_id, point_lat, point_lon in self._candidates(min_lat, max_lat, lon_ranges):
+            if not min_lat <= point_lat <= max_lat:
+                continue
+            if not any(low <= point_lon <= high for low, high in lon_ranges):
+                continue
+            results.append((obj_id, haversine_km(lat, lon, point_lat, point_lon)))
+        results.sort(key=lambda result: result[1])
+        return results
+
+    def ids_in_bbox(self, min_lon, min_lat, max_lon, max_lat):
+        """
+        Return the IDs of the points inside a bounding box, in no particular order.
+
+        Same box semantics as within_bbox, without computing distances.
+        """
+        lon_ranges = _bbox_longitudes(min_lon, max_lon)
+        return [obj_id for obj_id, point_lat, point_lon
+                in self._candidates(min_lat, max_lat, lon_ranges)
+                if min_lat <= point_lat <= max_lat
+                and any(low <= point_lon <= high for low, high in lon_ranges)]
+
+
+def _bbox_longitudes(min_lon, max_lon):
+    """Return the longitude intervals of a box, two if it crosses the antimeridian."""
+    if min_lon <= max_lon:
+        return [(min_lon, max_lon)]
+    return [(min_lon, 180.0), (-180.0, max_lon)]
+
+
+def _split_longitudes(low, high):
+    """Split a longitude interval that crosses the antimeridian in two."""
+    if low < -180:
+        return [(low + 360, 180.0), (-180.0, high)]
+    if high > 180:
+        return [(low, 180.0), (-180.0, high - 360)]
+    return [(low, high)]
@@ -0,0 +1,240 @@
+"""
+Append-only write-ahead log and snapshots for the in-memory store.
+Every write is recorded as the full encoded state of the entity, so replay
+is idempotent and only the last record of an entity matters.
+"""
+import atexit
+import json
+import os
+import threading
+
+from app.persistence.codec import dump_state, load_state, new_instance
+
+FSYNC_POLICIES = ('always', 'interval', 'os')
+
+
+class Journal:
+    """
+    Write-ahead log shared by all durable repositories of a facade.
+
+    Fsync policies trade durability against write throughput:
+        - 'always': a write returns once it is on disk. Concurrent writers
+          are group-committed: one fsync covers every record appended
+          before it started.
+        - 'interval': a background thread fsyncs every interval_ms, so up
+          to that much acknowledged data may be lost on power failure.
+        - 'os': records are handed to the OS on every write and flushed to
+          disk whenever the OS decides; survives a process crash only.
+
+    Once snapshot_every records have been logged, a compacted snapshot of
+    every repository is written and the log is truncated.
+    """
+
+    def __init__(self, directory, fsync='always', interval_ms=50, snapshot_every=10000):
+        """
+        Initialize the journal.
+
+        Args:
+            directory (str): Directory holding the log and snapshot files
+            fsync (str): One of FSYNC_POLICIES
+            interval_ms (int): Fsync period of the 'interval' policy
+            snapshot_every (int): Number of records between two snapshots,
+                0 to disable automatic snapshots
+
+        Raises:
+            ValueError: If the fsync policy is unknown
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self.log_path = os.path.join(directory, 'hbnb.log')
+        self.snapshot_path = os.path.join(directory, 'hbnb.snapshot')
+        self._fsync = fsync
+        self._interval = interval_ms / 1000
+        self._snapshot_every = snapshot_every
+        self._repositories = {}
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._file = None
+        self._lsn = 0
+        self._synced = 0
+        self._since_snapshot = 0
+        self._closed = threading.Event()
+
+    def register(self, class_name, repository):
+        """
+        Attach the repository holding the entities of a model class.
+
+        Args:
+            class_name (str): Name of the model class
+            repository (DurableRepository): Repository to snapshot and restore
+        """
+        self._repositories[class_name] = repository
+
+    # ==================== Recovery ====================
+
+    def recover(self):
+        """
+        Load the snapshot, replay the log tail and open the log for writing.
+
+        Must be called once every repository is registered and before the
+        application serves traffic.
+        """
+        states = {}
+        snapshot_lsn = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding='utf-8') as snapshot:
+                header = json.loads(snapshot.readline())
+                snapshot_lsn = header['lsn']
+                for line in snapshot:
+                    class_name, obj_id, state = json.loads(line)
+                    states[(class_name, obj_id)] = state
+
+        self._lsn = snapshot_lsn
+        valid_size = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash: drop the tail
+                        break
+                    valid_size += len(line)
+                    if record['lsn'] <= snapshot_lsn:
+                        continue
+                    key = (record['cls'], record['id'])
+                    if record['op'] == 'put':
+                        states[key] = record['state']
+                    else:
+                        states.pop(key, None)
+                    self._lsn = record['lsn']
+        self._restore(states)
+
+        self._file = open(self.log_path, 'ab')
+        self._file.truncate(valid_size)
+        self._synced = self._lsn
+        if self._fsync == 'interval':
+            threading.Thread(target=self._sync_periodically, daemon=True).start()
+        atexit.register(self.close)
+
+    def _restore(self, states):
+        """Rebuild live instances from their encoded states and store them."""
+        # All instances exist before any state is loaded so that references
+        # resolve whatever order the entities were written in
+        objects = {key: new_instance(key[0]) for key in states}
+
+        def resolve(class_name, obj_id):
+            return objects.get((class_name, obj_id))
+
+        for key, state in states.items():
+            load_state(objects[key], state, resolve)
+        for (class_name, _), obj in objects.items():
+            repository = self._repositories.get(class_name)
+            if repository is not None:
+                repository.restore(obj)
+
+    # ==================== Writing ====================
+
+    def append(self, op, obj):
+        """
+        Log a write.
+
+        The record is not guaranteed to be on disk until commit() returns,
+        which lets callers release their own locks before waiting.
+
+        Args:
+            op (str): 'put' with the current state of obj, or 'del'
+            obj (BaseModel): The entity written
+
+        Returns:
+            int: Log sequence number of the record
+        """
+        record = {'op': op, 'cls': type(obj).__name__, 'id': obj.id}
+        if op == 'put':
+            record['state'] = dump_state(obj)
+        with self._lock:
+            self._lsn += 1
+            record['lsn'] = self._lsn
+            self._file.write(json.dumps(record).encode('utf-8') + b'\n')
+            if self._fsync == 'os':
+                self._file.flush()
+            self._since_snapshot += 1
+            return self._lsn
+
+    def commit(self, lsn):
+        """
+        Wait until a record satisfies the fsync policy.
+
+        Also takes a snapshot when enough records were logged since the last.
+
+        Args:
+            lsn (int): Log sequence number returned by append()
+        """
+        if self._fsync == 'always':
+            self._sync_to(lsn)
+        if self._snapshot_every and self._since_snapshot >= self._snapshot_every:
+            with self._lock:
+                if self._since_snapshot >= self._snapshot_every:
+                    self.snapshot()
+
+    def _sync_to(self, lsn):
+        """Fsync the log unless a concurrent fsync already covered lsn."""
+        with self._sync_lock:
+            if self._synced >= lsn:
+                return
+            with self._lock:
+                self._file.flush()
+                target = self._lsn
+            os.fsync(self._file.fileno())
+            self._synced = target
+
+    def _sync_periodically(self):
+        """Background loop of the 'interval' fsync policy."""
+        while not self._closed.wait(self._interval):
+            if self._synced < self._lsn:
+                self._sync_to(self._lsn)
+
+    def snapshot(self):
+        """
+        Write a compacted snapshot of every repository and truncate the log.
+
+        Writes are blocked while the snapshot is taken.
+        """
+        with self._lock:
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as snapshot:
+                snapshot.write(json.dumps({'lsn': self._lsn}) + '\n')
+                for class_name, repository in self._repositories.items():
+                    for obj in repository.get_all():
+                        snapshot.write(json.dumps([class_name, obj.id, dump_state(obj)]) + '\n')
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self._sync_directory()
+
+            self._file.seek(0)
+            self._file.truncate()
+            os.fsync(self._file.fileno())
+            self._synced = self._lsn
+            self._since_snapshot = 0
+
+    def _sync_directory(self):
+        """Make the snapshot rename durable where the platform supports it."""
+        if hasattr(os, 'O_DIRECTORY'):
+            fd = os.open(self._directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def close(self):
+        """Flush pending records to disk and stop the background thread."""
+        if self._file is None or self._file.closed:
+            return
+        self._closed.set()
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
@@ -0,0 +1,112 @@
+"""
+Relationship index for the HBnB application.
+Stores a one-to-many relationship by ID in both directions, so children
+can be listed, paginated and unlinked without scanning the repositories.
+"""
+import itertools
+import threading
+
+from app.persistence.repository import OrderedKeys
+
+
+class RelationIndex:
+    """
+    One-to-many relationship between parent IDs and child IDs.
+
+    Each parent keeps its children in link order; each child knows its
+    parent. Linking and unlinking cost O(1) amortized. Reads and writes
+    hold the same lock, so pages stay consistent under concurrent writes.
+    Positions come from one counter shared by every parent, so a parent
+    that loses its last child and gets new ones never reuses a position
+    a page cursor may still hold.
+    """
+
+    def __init__(self):
+        """Initialize an empty relationship."""
+        self._children = {}
+        self._parents = {}
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+
+    def __contains__(self, child_id):
+        return child_id in self._parents
+
+    def link(self, parent_id, child_id):
+        """Attach a child to a parent, detaching it from a previous one."""
+        with self._lock:
+            if self._parents.get(child_id) == parent_id:
+                return
+            self.unlink(child_id)
+            self._parents[child_id] = parent_id
+            children = self._children.get(parent_id)
+            if children is None:
+                children = self._children[parent_id] = OrderedKeys(self._sequence)
+            children.add(child_id)
+
+    def unlink(self, child_id):
+        """
+        Detach a child from its parent.
+
+        Returns:
+            str: ID of the former parent, or None if the child was not linked
+        """
+        with self._lock:
+            parent_id = self._parents.pop(child_id, None)
+            if parent_id is None:
+                return None
+            children = self._children[parent_id]
+            children.discard(child_id)
+            if not len(children):
+                # Drops the parent's tombstones along with it
+                del self._children[parent_id]
+            return parent_id
+
+    def unlink_parent(self, parent_id):
+        """
+        Detach every child of a parent.
+
+        Returns:
+            list: IDs of the former children, in link order
+        """
+        with self._lock:
+            children = self.children(parent_id)
+            for child_id in children:
+                del self._parents[child_id]
+            self._children.pop(parent_id, None)
+            return children
+
+    def parent_of(self, child_id):
+        """Return the parent ID of a child, or None."""
+        return self._parents.get(child_id)
+
+    def count(self, parent_id):
+        """Return the number of children of a parent."""
+        children = self._children.get(parent_id)
+        return len(children) if children else 0
+
+    def children(self, parent_id):
+        """Return the child IDs of a parent in link order."""
+        with self._lock:
+            children = self._children.get(parent_id)
+            if not children:
+                return []
+            keys, _ = children.page(len(children))
+            return keys
+
+    def page(self, parent_id, limit, after=None):
+        """
+        Return one page of the children of a parent.
+
+        Args:
+            parent_id (str): ID of the parent
+            limit (int): Maximum number of child IDs to return
+            after (int, optional): Position returned by the previous page
+
+        Returns:
+            tuple: (child IDs, position to resume after or None)
+        """
+        with self._lock:
+            children = self._children.get(parent_id)
+            if not children:
+                return [], None
+            return children.page(limit, after)
@@ -1,4 +1,10 @@
+import base64
+import itertools
+import threading
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+
+from app.models.base_model import id_key
 
 class Repository(ABC):
     @abstractmethod
@@ -25,27 +31,419 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_page(self, limit, cursor=None):
+        """Return (objects, next_cursor) for up to limit objects after cursor.
+
+        next_cursor is None once the last object has been returned.
+        """
+        pass
+
+    def save(self, obj):
+        """Persist in-place changes (e.g. relationship lists) of a stored object.
+
+        Backends holding live objects have nothing to do.
+        """
+        pass
+
+    def get_many(self, obj_ids):
+        """Return the objects of a list of IDs, in the same order.
+
+        Each missing ID gives None at its position.
+        """
+        return [self.get(obj_id) for obj_id in obj_ids]
+
+    @abstractmethod
+    def get_positions(self, obj_ids):
+        """Return the insertion sequence numbers of a list of IDs, in the same order.
+
+        Sequence numbers only grow, never get reused and are what get_page
+        cursors encode, so they order objects like get_page does. Each
+        missing ID gives None at its position.
+        """
+        pass
+
+    def add_many(self, objects):
+        """Store a list of objects, all of them or none.
+
+        Backends override this to write the batch at once; by default the
+        objects are added one by one and deleted again if one is rejected.
+        """
+        added = []
+        try:
+            for obj in objects:
+                self.add(obj)
+                added.append(obj)
+        except ValueError:
+            for obj in added:
+                self.delete(obj.id)
+            raise
+
+    def iter_all(self, page_size=1000):
+        """Yield every stored object, fetching them page by page.
+
+        Only one page is held at a time, and objects added or deleted
+        during the iteration are seen or skipped like in get_page.
+        """
+        cursor = None
+        while True:
+            objects, cursor = self.get_page(page_size, cursor)
+            yield from objects
+            if cursor is None:
+                return
+
+
+def encode_cursor(seq):
+    """Return the opaque pagination cursor for an insertion sequence number."""
+    return base64.urlsafe_b64encode(str(seq).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Return the insertion sequence number encoded in a pagination cursor.
+
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeError, TypeError):
+        raise ValueError("Invalid cursor") from None
+
+
+class DuplicateKeyError(ValueError):
+    """Raised when a write would break a unique index."""
+
+    def __init__(self, message, attr_name=None, value=None):
+        """
+        Initialize the error.
+
+        Args:
+            message (str): Human readable description of the conflict
+            attr_name (str, optional): Name of the unique attribute
+            value (optional): The conflicting value
+        """
+        super().__init__(message)
+        self.attr_name = attr_name
+        self.value = value
+
+
+def index_key(value, key=None):
+    """
+    Return the key under which a value is indexed.
+
+    Args:
+        value: The raw attribute value
+        key (callable, optional): Normalizes non-None values
+
+    Returns:
+        The normalized key, or None if the value cannot be indexed
+    """
+    if value is not None and key is not None:
+        value = key(value)
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return value
+
+
+class HashIndex:
+    """
+    Secondary hash index mapping an attribute value to the objects holding it.
+
+    Each bucket keeps insertion order so that a lookup returns the same
+    object a linear scan over the storage would have returned first.
+    """
+
+    def __init__(self, attr_name, unique=False, key=None):
+        """
+        Initialize an empty index.
+
+        Args:
+            attr_name (str): Name of the indexed attribute
+            unique (bool): Whether two objects may share the same key
+            key (callable, optional): Normalizes values before indexing,
+                e.g. to make the index case-insensitive
+        """
+        self.attr_name = attr_name
+        self.unique = unique
+        self._key = key
+        self._buckets = {}
+
+    def normalize(self, value):
+        """Return the index key for a raw value, or None if it is not indexable."""
+        return index_key(value, self._key)
+
+    def key_for(self, obj):
+        """Return the index key of an object, or None if it is not indexable."""
+        return self.normalize(getattr(obj, self.attr_name, None))
+
+    def check(self, value, obj_key=None):
+        """
+        Ensure a value can be stored without breaking uniqueness.
+
+        Args:
+            value: The raw attribute value about to be written
+            obj_key (optional): Compact key of the object being written,
+                which may already hold the value
+
+        Raises:
+            DuplicateKeyError: If another object already holds the value
+        """
+        if not self.unique:
+            return
+        key = self.normalize(value)
+        bucket = self._buckets.get(key) if key is not None else None
+        if bucket and any(other_key != obj_key for other_key in bucket):
+            raise DuplicateKeyError(
+                f"Duplicate value for unique attribute '{self.attr_name}'",
+                self.attr_name, value)
+
+    def insert(self, obj):
+        """Add an object to the bucket of its current attribute value."""
+        key = self.key_for(obj)
+        if key is not None:
+            self._buckets.setdefault(key, {})[obj.key] = obj
+
+    def remove(self, obj):
+        """Remove an object from the bucket of its current attribute value."""
+        key = self.key_for(obj)
+        bucket = self._buckets.get(key) if key is not None else None
+        if bucket is not None:
+            bucket.pop(obj.key, None)
+            if not bucket:
+                del self._buckets[key]
+
+    def first(self, value):
+        """
+        Return the first object indexed under a value.
+
+        Args:
+            value: The attribute value to look up
+
+        Returns:
+            The matching object or None if there is none
+        """
+        key = self.normalize(value)
+        bucket = self._buckets.get(key) if key is not None else None
+        if not bucket:
+            return None
+        return next(iter(bucket.values()))
+
+
+class OrderedKeys:
+    """
+    Keys in insertion order, able to return one page after a position
+    without materializing the whole sequence.
+
+    Every key gets an increasing sequence number; removed keys leave a
+    tombstone that is compacted away once tombstones are the majority.
+    """
+
+    def __init__(self, sequence=None):
+        """
+        Initialize an empty sequence.
+
+        Args:
+            sequence (iterator, optional): Source of increasing sequence
+                numbers, which several sequences may share; a new counter
+                from 0 by default
+        """
+        self._seqs = []
+        self._keys = []
+        self._positions = {}
+        self._sequence = sequence if sequence is not None else itertools.count()
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._positions)
+
+    def position(self, key):
+        """Return the sequence number of a key, or None if it is not present."""
+        return self._positions.get(key)
+
+    def add(self, key):
+        """Append a key unless it is already present."""
+        if key in self._positions:
+            return
+        seq = next(self._sequence)
+        self._positions[key] = seq
+        self._seqs.append(seq)
+        self._keys.append(key)
+
+    def discard(self, key):
+        """Remove a key if it is present."""
+        seq = self._positions.pop(key, None)
+        if seq is None:
+            return
+        self._keys[bisect_left(self._seqs, seq)] = None
+        self._removed += 1
+        if self._removed > 64 and self._removed * 2 > len(self._keys):
+            self._compact()
+
+    def _compact(self):
+        """Drop the tombstones left by removed keys."""
+        live = [(seq, key) for seq, key in zip(self._seqs, self._keys) if key is not None]
+        self._seqs = [seq for seq, _ in live]
+        self._keys = [key for _, key in live]
+        self._removed = 0
+
+    def page(self, limit, after=None):
+        """
+        Return up to limit keys following a sequence number.
+
+        Args:
+            limit (int): Maximum number of keys to return
+            after (int, optional): Sequence number of the last key already
+                seen, None to start from the beginning
+
+        Returns:
+            tuple: (keys, seq) where seq is the sequence number to resume
+                after, or None if no key follows the page
+        """
+        seqs, keys = self._seqs, self._keys
+        i = bisect_right(seqs, after) if after is not None else 0
+        end = len(keys)
+        page = []
+        last = None
+        # Copy slices, scanning again only for the keys tombstones replaced;
+        # resuming after a tombstone's sequence number is equivalent
+        while i < end and len(page) < limit:
+            stop = min(end, i + limit - len(page))
+            chunk = keys[i:stop]
+            page.extend(chunk if None not in chunk else [key for key in chunk if key is not None])
+            last = seqs[stop - 1]
+            i = stop
+        while i < end and keys[i] is None:
+            i += 1
+        return page, (last if i < end else None)
+
+
 class InMemoryRepository(Repository):
-    def __init__(self):
+    def __init__(self, indexes=None):
+        """
+        Initialize the repository.
+
+        Args:
+            indexes (iterable, optional): Attribute names to maintain a hash
+                index on, making get_by_attribute O(1) for them
+        """
+        # Keyed on the compact form of the IDs (BaseModel.key)
         self._storage = {}
+        self._order = OrderedKeys()
+        self._indexes = {}
+        # Writes check unique indexes and insert under the same lock so
+        # that two concurrent requests can never both claim the same key
+        self._lock = threading.RLock()
+        for attr_name in indexes or ():
+            self.add_index(attr_name)
+
+    def add_index(self, attr_name, unique=False, key=None):
+        """
+        Declare a secondary index on an attribute.
+
+        Objects already stored are indexed immediately; the index is then kept
+        up to date by add, update and delete. Attributes must therefore only
+        be changed through update() once an object is stored.
+
+        Args:
+            attr_name (str): Name of the attribute to index
+            unique (bool): Reject writes that would duplicate a key
+            key (callable, optional): Normalizes values before indexing
+
+        Raises:
+            DuplicateKeyError: If unique and stored objects already collide
+        """
+        index = HashIndex(attr_name, unique=unique, key=key)
+        with self._lock:
+            for obj in self._storage.values():
+                index.check(getattr(obj, attr_name, None), obj.key)
+                index.insert(obj)
+            self._indexes[attr_name] = index
+
+    def _insert(self, obj):
+        """Check the unique indexes, then store obj; the lock must be held."""
+        for index in self._indexes.values():
+            index.check(getattr(obj, index.attr_name, None), obj.key)
+        self._storage[obj.key] = obj
+        self._order.add(obj.key)
+        for index in self._indexes.values():
+            index.insert(obj)
+
+    def _remove(self, key):
+        """Remove the object stored under a key; the lock must be held."""
+        obj = self._storage.pop(key)
+        self._order.discard(key)
+        for index in self._indexes.values():
+            index.remove(obj)
 
     def add(self, obj):
-        self._storage[obj.id] = obj
+        with self._lock:
+            self._insert(obj)
+
+    def add_many(self, objects):
+        with self._lock:
+            added = []
+            try:
+                for obj in objects:
+                    self._insert(obj)
+                    added.append(obj.key)
+            except DuplicateKeyError:
+                for key in added:
+                    self._remove(key)
+                raise
 
     def get(self, obj_id):
-        return self._storage.get(obj_id)
-    
+        return self._storage.get(id_key(obj_id))
+
+    def get_many(self, obj_ids):
+        get = self._storage.get
+        return [get(id_key(obj_id)) for obj_id in obj_ids]
+
+    def get_positions(self, obj_ids):
+        with self._lock:
+            position = self._order.position
+            return [position(id_key(obj_id)) for obj_id in obj_ids]
+
     def get_all(self):
         return list(self._storage.values())
-    
+
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
-        if obj:
-            obj.update(data)
+        with self._lock:
+            obj = self.get(obj_id)
+            if obj:
+                touched = [index for attr_name, index in self._indexes.items()
+                           if attr_name in data and hasattr(obj, attr_name)]
+                for index in touched:
+                    index.check(data[index.attr_name], obj.key)
+                for index in touched:
+                    index.remove(obj)
+                try:
+                    obj.update(data)
+                finally:
+                    for index in touched:
+                        index.insert(obj)
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        with self._lock:
+            key = id_key(obj_id)
+            if key in self._storage:
+                self._remove(key)
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
\ No newline at end of file
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            return index.first(attr_value)
+        return next((obj for obj in self._storage.values()
+                     if getattr(obj, attr_name) == attr_value), None)
+
+    def get_page(self, limit, cursor=None):
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        after = decode_cursor(cursor) if cursor else None
+        with self._lock:
+            keys, last = self._order.page(limit, after)
+            objects = [self._storage[key] for key in keys]
+        return objects, (encode_cursor(last) if last is not None else None)
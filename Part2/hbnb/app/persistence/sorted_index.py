@@ -0,0 +1,152 @@
+"""
+Sorted secondary index for range queries in the HBnB application.
+Keeps (key, id) entries in a bisect-maintained list so that a range of
+k entries is found in O(log n + k).
+"""
+import base64
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+
+class _Highest:
+    """Sentinel comparing greater than any object ID."""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_HIGHEST = _Highest()
+
+# Entries copied out per lock acquisition while iterating a range
+_CHUNK = 256
+
+
+def encode_key_cursor(key, obj_id):
+    """Return the opaque pagination cursor for a (key, id) index entry."""
+    raw = json.dumps([key, obj_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_key_cursor(cursor):
+    """
+    Return the (key, id) index entry encoded in a pagination cursor.
+
+    Raises:
+        ValueError: If the cursor was not produced by encode_key_cursor
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, obj_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if not isinstance(obj_id, str) or isinstance(key, (dict, str)):
+        raise ValueError("Invalid cursor")
+    return (tuple(key) if isinstance(key, list) else key), obj_id
+
+
+class SortedIndex:
+    """
+    Index of object IDs ordered by a key, ties broken by ID.
+
+    Keys must be mutually comparable: numbers, tuples of numbers, or
+    strings. Reads and writes hold the same lock; a range is copied out
+    one chunk at a time, so iterating it never blocks writers for long.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._entries = []
+        self._keys = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, obj_id):
+        return obj_id in self._keys
+
+    def key_of(self, obj_id):
+        """Return the key an object ID is indexed under, or None."""
+        return self._keys.get(obj_id)
+
+    def insert(self, obj_id, key):
+        """Index an object ID under a key, moving it if already indexed."""
+        with self._lock:
+            if self._keys.get(obj_id, _HIGHEST) == key:
+                return
+            self.remove(obj_id)
+            insort(self._entries, (key, obj_id))
+            self._keys[obj_id] = key
+
+    def remove(self, obj_id):
+        """Remove an object ID if it is indexed."""
+        with self._lock:
+            key = self._keys.pop(obj_id, None)
+            if key is None:
+                return
+            del self._entries[bisect_left(self._entries, (key, obj_id))]
+
+    def _bounds(self, low, high):
+        """Return the slice of entries whose key lies in [low, high]; the lock must be held."""
+        start = 0 if low is None else bisect_left(self._entries, (low, ''))
+        stop = (len(self._entries) if high is None
+                else bisect_right(self._entries, (high, _HIGHEST)))
+        return start, stop
+
+    def count(self, low=None, high=None):
+        """Return the number of entries whose key lies in [low, high]."""
+        with self._lock:
+            start, stop = self._bounds(low, high)
+        return max(0, stop - start)
+
+    def range(self, low=None, high=None, after=None, reverse=False):
+        """
+        Yield (key, id) entries whose key lies in [low, high].
+
+        Args:
+            low (optional): Smallest key, None for no lower bound
+            high (optional): Largest key, None for no upper bound
+            after (tuple, optional): (key, id) of the last entry already
+                returned, to resume a previous iteration
+            reverse (bool): Iterate from the largest key down
+
+        Yields:
+            tuple: (key, id) in key order
+        """
+        after = None if after is None else tuple(after)
+        while True:
+            with self._lock:
+                start, stop = self._bounds(low, high)
+                entries = self._entries
+                if not reverse:
+                    if after is not None:
+                        start = max(start, bisect_right(entries, after))
+                    chunk = entries[start:min(stop, start + _CHUNK)]
+                else:
+                    if after is not None:
+                        stop = min(stop, bisect_left(entries, after))
+                    chunk = entries[max(start, stop - _CHUNK):stop][::-1]
+            yield from chunk
+            if len(chunk) < _CHUNK:
+                return
+            # Resume from the last entry, wherever writes have moved it since
+            after = chunk[-1]
+
+    def starting_with(self, prefix):
+        """
+        Yield (key, id) entries whose string key starts with a prefix.
+
+        Args:
+            prefix (str): Prefix of the keys
+
+        Yields:
+            tuple: (key, id) in key order
+        """
+        for entry in self.range(low=prefix):
+            if not entry[0].startswith(prefix):
+                return
+            yield entry
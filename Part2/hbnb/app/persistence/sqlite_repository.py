@@ -0,0 +1,456 @@
+"""
+SQLite-backed repository for the HBnB application.
+Stores one row per entity so that data survives restarts and the dataset
+no longer has to fit in the Flask process heap.
+"""
+import json
+import sqlite3
+import threading
+import weakref
+from functools import partial
+
+from app.models.base_model import Deferred, is_writable
+from app.persistence.codec import dump_state, load_state, new_instance, references
+from app.persistence.repository import (
+    Repository, DuplicateKeyError, index_key, encode_cursor, decode_cursor)
+
+# IDs per query of get_many, below SQLite's limit on bound parameters
+_IDS_PER_QUERY = 500
+
+
+def _reference_id(value):
+    """Return the ID of a reference encoded by the codec, or None."""
+    if isinstance(value, dict) and '$ref' in value:
+        return value['$ref'][1]
+    return None
+
+
+class SQLiteRepository(Repository):
+    """
+    Repository storing entities in a SQLite table.
+
+    Every thread gets its own connection, the database runs in WAL mode so
+    readers do not block the writer, and statements are built once so
+    sqlite3 reuses its prepared statements. Loaded entities are kept in a
+    weak identity map: as long as an entity is referenced, every lookup
+    returns that same instance.
+
+    References to other entities are stored as IDs, outside of the row
+    body: a single reference in a ref_<name> column, a list of them in a
+    link table per attribute. Loading an entity loads none of the
+    entities it refers to; each reference is loaded on first read, and
+    saving an entity never rewrites the entities around it.
+    """
+
+    def __init__(self, path, table, model, registry=None):
+        """
+        Initialize the repository and create its table if needed.
+
+        Args:
+            path (str): Path of the SQLite database file
+            table (str): Name of the table holding the entities
+            model (type): Model class stored in this repository
+            registry (dict, optional): Repositories by model class name,
+                shared by all repositories of the facade to resolve
+                references between entities
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self._path = path
+        self._table = table
+        self._registry = registry if registry is not None else {}
+        self._registry[model.__name__] = self
+        self._local = threading.local()
+        self._identity = weakref.WeakValueDictionary()
+        self._indexes = {}
+        # Two threads loading the same row must end up with one instance
+        self._load_lock = threading.Lock()
+        model_references = references(model)
+        self._references = {name: reference for name, reference in model_references.items()
+                            if not reference.many}
+        self._lists = {name: reference for name, reference in model_references.items()
+                       if reference.many}
+        self._loaders = {name: partial(self._resolve_many if reference.many else self._resolve,
+                                       reference.class_name)
+                         for name, reference in model_references.items()}
+
+        with self._connection() as conn:
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" ('
+                'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'id TEXT NOT NULL UNIQUE, '
+                'cls TEXT NOT NULL, '
+                'body TEXT NOT NULL)')
+            self._create_reference_storage(conn)
+        self._prepare()
+
+    def _link_table(self, name):
+        """Return the name of the link table of a list of references."""
+        return f'{self._table}_{name}'
+
+    def _create_reference_storage(self, conn):
+        """Create the reference columns and link tables that do not exist yet."""
+        table = self._table
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+        tables = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        missing = [name for name in self._references if f'ref_{name}' not in existing]
+        missing += [name for name in self._lists if self._link_table(name) not in tables]
+        for name in self._references:
+            if f'ref_{name}' not in existing:
+                conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "ref_{name}" TEXT')
+        for name in self._lists:
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self._link_table(name)}" ('
+                'parent_id TEXT NOT NULL, '
+                'pos INTEGER NOT NULL, '
+                'child_id TEXT NOT NULL, '
+                'PRIMARY KEY (parent_id, pos))')
+        if missing:
+            self._migrate_references(conn)
+
+    def _migrate_references(self, conn):
+        """Move the references embedded in row bodies by earlier versions to their storage."""
+        table = self._table
+        assignments = ', '.join(['body = ?'] + [f'"ref_{name}" = COALESCE(?, "ref_{name}")'
+                                                for name in self._references])
+        rows = conn.execute(f'SELECT id, body FROM "{table}"').fetchall()
+        for obj_id, body in rows:
+            state = json.loads(body)
+            if not any(name in state for name in self._loaders):
+                continue
+            ref_ids = [_reference_id(state.pop(name, None)) for name in self._references]
+            for name in self._lists:
+                child_ids = [_reference_id(item) for item in state.pop(name, None) or ()]
+                conn.executemany(
+                    f'INSERT OR IGNORE INTO "{self._link_table(name)}" '
+                    '(parent_id, pos, child_id) VALUES (?, ?, ?)',
+                    ((obj_id, pos, child_id) for pos, child_id in enumerate(child_ids)
+                     if child_id is not None))
+            conn.execute(f'UPDATE "{table}" SET {assignments} WHERE id = ?',
+                         (json.dumps(state), *ref_ids, obj_id))
+
+    def _connection(self):
+        """Return the connection of the current thread, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self._path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _prepare(self):
+        """Build the SQL statements for the current set of indexed columns."""
+        table = self._table
+        columns = ([f'"ref_{name}"' for name in self._references]
+                   + [f'"ix_{attr_name}"' for attr_name in self._indexes])
+        names = ', '.join(['id', 'cls', 'body'] + columns)
+        marks = ', '.join('?' * (3 + len(columns)))
+        assignments = ', '.join(['body = ?'] + [f'{column} = ?' for column in columns])
+        # Rows are read with their single references, which become Deferred
+        selected = ', '.join(['id', 'cls', 'body'] + columns[:len(self._references)])
+        self._selected = selected
+        self._sql_insert = f'INSERT INTO "{table}" ({names}) VALUES ({marks})'
+        self._sql_update = f'UPDATE "{table}" SET {assignments} WHERE id = ?'
+        self._sql_delete = f'DELETE FROM "{table}" WHERE id = ?'
+        self._sql_get = f'SELECT {selected} FROM "{table}" WHERE id = ?'
+        self._sql_all = f'SELECT {selected} FROM "{table}" ORDER BY seq'
+        self._sql_page = (f'SELECT seq, {selected} FROM "{table}" '
+                          'WHERE seq > ? ORDER BY seq LIMIT ?')
+        self._sql_json = (f'SELECT {selected} FROM "{table}" '
+                          'WHERE json_extract(body, ?) IS ? ORDER BY seq LIMIT 1')
+        self._sql_index = {
+            attr_name: (f'SELECT {selected} FROM "{table}" '
+                        f'WHERE "ix_{attr_name}" = ? ORDER BY seq LIMIT 1')
+            for attr_name in self._indexes
+        }
+        self._sql_links = {
+            name: (f'DELETE FROM "{self._link_table(name)}" WHERE parent_id = ?',
+                   f'INSERT INTO "{self._link_table(name)}" (parent_id, pos, child_id) '
+                   'VALUES (?, ?, ?)')
+            for name in self._lists
+        }
+
+    def add_index(self, attr_name, unique=False, key=None):
+        """
+        Declare an SQL index on an attribute.
+
+        The attribute is copied into its own column on every write so that
+        get_by_attribute becomes an index lookup.
+
+        Args:
+            attr_name (str): Name of the attribute to index
+            unique (bool): Reject writes that would duplicate a key
+            key (callable, optional): Normalizes values before indexing
+
+        Raises:
+            DuplicateKeyError: If unique and stored rows already collide
+        """
+        if not attr_name.isidentifier():
+            raise ValueError(f"Invalid attribute name: {attr_name}")
+        table = self._table
+        column = f'ix_{attr_name}'
+        conn = self._connection()
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+        try:
+            with conn:
+                if column not in existing:
+                    conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}"')
+                    rows = conn.execute(f'SELECT id, body FROM "{table}"').fetchall()
+                    conn.executemany(
+                        f'UPDATE "{table}" SET "{column}" = ? WHERE id = ?',
+                        ((self._column_value(json.loads(body).get(attr_name), key), obj_id)
+                         for obj_id, body in rows))
+                conn.execute(
+                    f'CREATE {"UNIQUE " if unique else ""}INDEX IF NOT EXISTS '
+                    f'"{table}_{column}" ON "{table}" ("{column}")')
+        except sqlite3.IntegrityError:
+            raise DuplicateKeyError(
+                f"Duplicate value for unique attribute '{attr_name}'", attr_name) from None
+        self._indexes[attr_name] = key
+        self._prepare()
+
+    @staticmethod
+    def _column_value(value, key):
+        """Return the value stored in an index column."""
+        value = index_key(value, key)
+        return value if isinstance(value, (str, int, float)) else None
+
+    def _row(self, obj):
+        """Return the body, then the reference and index column values of an entity."""
+        body = json.dumps(dump_state(obj, exclude=self._loaders))
+        values = [obj.reference_ids(name) for name in self._references]
+        values += [self._column_value(getattr(obj, attr_name, None), key)
+                   for attr_name, key in self._indexes.items()]
+        return body, values
+
+    def _write_links(self, conn, obj, replace=False):
+        """
+        Store the lists of references of an entity in their link tables.
+
+        Args:
+            conn (sqlite3.Connection): Connection in the write transaction
+            obj (BaseModel): The entity
+            replace (bool): Whether the entity already has stored links
+        """
+        for name, (delete, insert) in self._sql_links.items():
+            if replace:
+                # A list never loaded cannot have changed since it was stored
+                if not obj.is_loaded(name):
+                    continue
+                conn.execute(delete, (obj.id,))
+            conn.executemany(insert, ((obj.id, pos, child_id) for pos, child_id
+                                      in enumerate(obj.reference_ids(name))))
+
+    def _duplicate(self, error, obj):
+        """Translate a UNIQUE constraint failure into a DuplicateKeyError.
+
+        obj is None when the failing entity of a batch is not known.
+        """
+        message = str(error)
+        for attr_name in self._indexes:
+            if f'{self._table}.ix_{attr_name}' in message:
+                return DuplicateKeyError(
+                    f"Duplicate value for unique attribute '{attr_name}'",
+                    attr_name, getattr(obj, attr_name, None))
+        obj_id = getattr(obj, 'id', None)
+        return DuplicateKeyError(f"Duplicate id: {obj_id}", 'id', obj_id)
+
+    def _write(self, obj):
+        """Rewrite the row of a stored entity."""
+        body, values = self._row(obj)
+        try:
+            with self._connection() as conn:
+                conn.execute(self._sql_update, (body, *values, obj.id))
+                self._write_links(conn, obj, replace=True)
+        except sqlite3.IntegrityError as e:
+            raise self._duplicate(e, obj) from None
+
+    def _resolve(self, class_name, obj_id):
+        """Load a referenced entity from the repository holding its class."""
+        repository = self._registry.get(class_name)
+        return repository.get(obj_id) if repository is not None else None
+
+    def _resolve_many(self, class_name, obj_ids):
+        """Load a list of referenced entities, dropping those deleted since."""
+        repository = self._registry.get(class_name)
+        if repository is None:
+            return []
+        return [obj for obj in repository.get_many(obj_ids) if obj is not None]
+
+    def _materialize(self, rows):
+        """
+        Return the live instances for rows, loading those not loaded yet.
+
+        Args:
+            rows (list): (id, cls, body, *single reference IDs) tuples
+
+        Returns:
+            list: The entities, in the order of rows
+        """
+        identity = self._identity
+        loaded = [identity.get(row[0]) for row in rows]
+        unloaded = [row[0] for row, obj in zip(rows, loaded) if obj is None]
+        if not unloaded:
+            return loaded
+        # The lists of references of all the rows, one query per attribute
+        lists = {name: {} for name in self._lists}
+        for name, children in lists.items():
+            for parent_id, child_id in self._select_ids(
+                    'parent_id, child_id', unloaded, self._link_table(name), 'parent_id',
+                    order='parent_id, pos'):
+                children.setdefault(parent_id, []).append(child_id)
+        with self._load_lock:
+            for i, row in enumerate(rows):
+                if loaded[i] is None:
+                    loaded[i] = identity.get(row[0]) or self._load(row, lists)
+        return loaded
+
+    def _load(self, row, lists):
+        """Create the instance of a row, its references deferred; the load lock must be held."""
+        obj_id, class_name, body, *ref_ids = row
+        obj = new_instance(class_name)
+        state = json.loads(body)
+        for name in self._loaders:
+            state.pop(name, None)
+        load_state(obj, state, self._resolve)
+        deferred = {}
+        for name, ref_id in zip(self._references, ref_ids):
+            if ref_id is None:
+                setattr(obj, name, None)
+            else:
+                deferred[name] = Deferred(ref_id, self._loaders[name])
+        for name, children in lists.items():
+            if obj_id in children:
+                deferred[name] = Deferred(children[obj_id], self._loaders[name])
+            else:
+                setattr(obj, name, [])
+        if deferred:
+            obj._deferred = deferred
+        self._identity[obj_id] = obj
+        return obj
+
+    def add(self, obj):
+        body, values = self._row(obj)
+        try:
+            with self._connection() as conn:
+                conn.execute(self._sql_insert, (obj.id, type(obj).__name__, body, *values))
+                self._write_links(conn, obj)
+        except sqlite3.IntegrityError as e:
+            raise self._duplicate(e, obj) from None
+        self._identity[obj.id] = obj
+
+    def add_many(self, objects):
+        rows = []
+        for obj in objects:
+            body, values = self._row(obj)
+            rows.append((obj.id, type(obj).__name__, body, *values))
+        # One transaction: a rejected row rolls the whole batch back
+        try:
+            with self._connection() as conn:
+                conn.executemany(self._sql_insert, rows)
+                for obj in objects:
+                    self._write_links(conn, obj)
+        except sqlite3.IntegrityError as e:
+            raise self._duplicate(e, None) from None
+        for obj in objects:
+            self._identity[obj.id] = obj
+
+    def get(self, obj_id):
+        obj = self._identity.get(obj_id)
+        if obj is not None:
+            return obj
+        row = self._connection().execute(self._sql_get, (obj_id,)).fetchone()
+        return self._materialize([row])[0] if row else None
+
+    def get_many(self, obj_ids):
+        found = {}
+        missing = []
+        for obj_id in obj_ids:
+            obj = self._identity.get(obj_id)
+            if obj is not None:
+                found[obj_id] = obj
+            elif isinstance(obj_id, str):
+                missing.append(obj_id)
+        rows = list(self._select_ids(self._selected, missing))
+        for row, obj in zip(rows, self._materialize(rows)):
+            found[row[0]] = obj
+        return [found.get(obj_id) for obj_id in obj_ids]
+
+    def get_positions(self, obj_ids):
+        positions = dict(self._select_ids('id, seq', [obj_id for obj_id in obj_ids
+                                                      if isinstance(obj_id, str)]))
+        return [positions.get(obj_id) for obj_id in obj_ids]
+
+    def _select_ids(self, columns, obj_ids, table=None, key='id', order=None):
+        """
+        Yield columns of the rows of a list of IDs, a few hundred IDs per query.
+
+        Args:
+            columns (str): Columns to select
+            obj_ids (iterable): IDs to look up
+            table (str, optional): Table to read, the entity table by default
+            key (str): Column holding the IDs
+            order (str, optional): ORDER BY clause within each query
+        """
+        obj_ids = list(dict.fromkeys(obj_ids))
+        conn = self._connection()
+        for start in range(0, len(obj_ids), _IDS_PER_QUERY):
+            chunk = obj_ids[start:start + _IDS_PER_QUERY]
+            sql = (f'SELECT {columns} FROM "{table or self._table}" '
+                   f'WHERE {key} IN ({", ".join("?" * len(chunk))})')
+            if order:
+                sql += f' ORDER BY {order}'
+            yield from conn.execute(sql, chunk)
+
+    def get_all(self):
+        return self._materialize(self._connection().execute(self._sql_all).fetchall())
+
+    def update(self, obj_id, data):
+        obj = self.get(obj_id)
+        if obj:
+            previous = {name: getattr(obj, name)
+                        for name in [*data, 'updated_at'] if is_writable(obj, name)}
+            obj.update(data)
+            try:
+                self._write(obj)
+            except DuplicateKeyError:
+                # Keep the live instance in line with the row that was kept
+                for name, value in previous.items():
+                    setattr(obj, name, value)
+                raise
+
+    def delete(self, obj_id):
+        with self._connection() as conn:
+            conn.execute(self._sql_delete, (obj_id,))
+            for delete, _ in self._sql_links.values():
+                conn.execute(delete, (obj_id,))
+        self._identity.pop(obj_id, None)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        conn = self._connection()
+        if attr_name in self._indexes:
+            value = self._column_value(attr_value, self._indexes[attr_name])
+            if value is None:
+                return None
+            row = conn.execute(self._sql_index[attr_name], (value,)).fetchone()
+        elif attr_value is None or isinstance(attr_value, (str, int, float)):
+            row = conn.execute(self._sql_json, (f'$.{attr_name}', attr_value)).fetchone()
+        else:
+            return next((obj for obj in self.get_all()
+                         if getattr(obj, attr_name, None) == attr_value), None)
+        return self._materialize([row])[0] if row else None
+
+    def get_page(self, limit, cursor=None):
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        after = decode_cursor(cursor) if cursor else 0
+        # One extra row tells whether another page follows
+        rows = self._connection().execute(self._sql_page, (after, limit + 1)).fetchall()
+        objects = self._materialize([row[1:] for row in rows[:limit]])
+        next_cursor = encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+        return objects, next_cursor
+
+    def save(self, obj):
+        self._write(obj)
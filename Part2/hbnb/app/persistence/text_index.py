@@ -0,0 +1,183 @@
+"""
+Full-text inverted index for the HBnB application.
+Ranks documents with Okapi BM25. A document is built from several text
+sources (e.g. a place's title, description and reviews) that can be
+replaced one at a time, so updates cost the size of the changed text.
+"""
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from operator import itemgetter
+
+_TOKEN = re.compile(r'\w+')
+
+
+def fold(text):
+    """Return a text casefolded and stripped of accents."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """
+    Split a text into lowercase, accent-free word tokens.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Tokens in order of appearance
+    """
+    if not text:
+        return []
+    return _TOKEN.findall(fold(text))
+
+
+class TextIndex:
+    """
+    Inverted index of documents keyed by an ID, ranked with BM25.
+
+    Postings map each term to the term frequency in every document that
+    contains it, so a query only visits the postings of its own terms.
+    Searches and updates hold the same lock.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1 (float): BM25 term frequency saturation
+            b (float): BM25 document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._sources = {}
+        self._lengths = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._lengths
+
+    def _apply(self, doc_id, terms, sign):
+        """Add (sign=1) or subtract (sign=-1) term counts; the lock must be held."""
+        for term, count in terms.items():
+            postings = self._postings.setdefault(term, {})
+            frequency = postings.get(doc_id, 0) + sign * count
+            if frequency:
+                postings[doc_id] = frequency
+            else:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        delta = sign * sum(terms.values())
+        self._total_length += delta
+        length = self._lengths.get(doc_id, 0) + delta
+        if length or self._sources.get(doc_id):
+            self._lengths[doc_id] = length
+        else:
+            self._lengths.pop(doc_id, None)
+
+    def set_source(self, doc_id, source_id, text, weight=1):
+        """
+        Replace the text of one source of a document.
+
+        Args:
+            doc_id (str): ID of the document
+            source_id (str): ID of the source within the document
+            text (str): New text of the source
+            weight (int): Times each token of the source is counted
+        """
+        terms = Counter(tokenize(text))
+        if weight != 1:
+            terms = Counter({term: count * weight for term, count in terms.items()})
+        with self._lock:
+            sources = self._sources.setdefault(doc_id, {})
+            previous = sources.pop(source_id, None)
+            if terms:
+                sources[source_id] = terms
+            if previous:
+                self._apply(doc_id, previous, -1)
+            if terms:
+                self._apply(doc_id, terms, 1)
+            if not sources:
+                del self._sources[doc_id]
+                self._lengths.pop(doc_id, None)
+
+    def remove_source(self, doc_id, source_id):
+        """Remove one source of a document."""
+        with self._lock:
+            if source_id in self._sources.get(doc_id, {}):
+                self.set_source(doc_id, source_id, '')
+
+    def remove_document(self, doc_id):
+        """Remove a document and all of its sources."""
+        with self._lock:
+            for source_id in list(self._sources.get(doc_id, {})):
+                self.remove_source(doc_id, source_id)
+
+    def search(self, query, limit=None):
+        """
+        Rank the documents matching any term of a query.
+
+        Args:
+            query (str): Free text query
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: (id, score) tuples, best match first
+        """
+        query_terms = set(tokenize(query))
+        with self._lock:
+            scores = self._score(query_terms, limit)
+        if limit is None:
+            return sorted(scores.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+
+    def _score(self, query_terms, limit):
+        """Return the BM25 score of each candidate document; the lock must be held."""
+        count = len(self._lengths)
+        if not count:
+            return {}
+        # norm(d) = base + per_token * len(d), hoisted out of the postings loop
+        base = self.k1 * (1 - self.b)
+        per_token = self.k1 * self.b * count / self._total_length if self._total_length else 0.0
+        lengths = self._lengths
+        terms = []
+        for term in query_terms:
+            postings = self._postings.get(term)
+            if postings:
+                df = len(postings)
+                # A term adds less than idf * (k1 + 1) to any document score
+                weight = math.log(1 + (count - df + 0.5) / (df + 0.5)) * (self.k1 + 1)
+                terms.append((weight, postings))
+        # Rare (high weight) terms first, so common terms can often be pruned
+        terms.sort(key=itemgetter(0), reverse=True)
+        remaining = sum(weight for weight, _ in terms)
+
+        scores = {}
+        for weight, postings in terms:
+            get = scores.get
+            if limit is not None and len(scores) >= limit \
+                    and remaining <= heapq.nlargest(limit, scores.values())[-1]:
+                # MaxScore: a document matching none of the terms scored so far
+                # cannot reach the top results, so only update the candidates
+                for doc_id, score in scores.items():
+                    frequency = postings.get(doc_id)
+                    if frequency:
+                        scores[doc_id] = score + weight * frequency / (
+                            frequency + base + per_token * lengths[doc_id])
+            else:
+                for doc_id, frequency in postings.items():
+                    scores[doc_id] = get(doc_id, 0.0) + weight * frequency / (
+                        frequency + base + per_token * lengths[doc_id])
+            remaining -= weight
+        return scores
@@ -0,0 +1,285 @@
+"""
+Bulk import of users, amenities, places and reviews.
+Rows are JSON objects, one per line (NDJSON), tagged with their entity
+type. They are validated and stored batch by batch: references such as
+owner_id, user_id and place_id resolve through in-memory maps of the
+entities imported so far before falling back to the repositories, each
+batch is written with one add_many per repository, and the facade indexes
+are filled once at the end. A rejected row is reported with its line
+number and the import goes on.
+"""
+import json
+import uuid
+
+from app.models.amenity import Amenity
+from app.models.base_model import relations
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+# Entity types of the rows, in the order their batches are written, with
+# the name they are counted under in the report
+COLLECTIONS = {'user': 'users', 'amenity': 'amenities', 'place': 'places', 'review': 'reviews'}
+ENTITY_TYPES = tuple(COLLECTIONS)
+# Unique attributes, checked against the rows of the import as well
+UNIQUE_ATTRIBUTES = {'user': 'email', 'amenity': 'name'}
+# Rows validated and written at once
+BATCH_SIZE = 1000
+# Errors listed in a report; the others are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+class BulkLoader:
+    """Imports NDJSON rows through the repositories of a facade."""
+
+    def __init__(self, facade, batch_size=BATCH_SIZE):
+        """
+        Initialize a loader.
+
+        Args:
+            facade (HBnBFacade): Facade whose repositories and indexes
+                receive the entities
+            batch_size (int): Number of rows written at once
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be a positive integer")
+        self.facade = facade
+        self.batch_size = batch_size
+        self._repositories = {'user': facade.user_repo, 'amenity': facade.amenity_repo,
+                              'place': facade.place_repo, 'review': facade.review_repo}
+        self._builders = {'user': self._build_user, 'amenity': self._build_amenity,
+                          'place': self._build_place, 'review': self._build_review}
+
+    def load(self, lines):
+        """
+        Import rows.
+
+        Args:
+            lines (iterable): NDJSON lines (str or bytes), each an object
+                with a "type" of user, amenity, place or review, an
+                optional "id" and the fields of the matching POST endpoint
+
+        Returns:
+            dict: The import report: entities created per type, number of
+                rows failed and the first errors as {"line", "error"}
+        """
+        self._imported = {kind: {} for kind in ENTITY_TYPES}
+        self._unique = {kind: set() for kind in UNIQUE_ATTRIBUTES}
+        self._created = {kind: [] for kind in ENTITY_TYPES}
+        self._touched_places = {}
+        self._failed = 0
+        self._errors = []
+        batch = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            batch.append((number, line))
+            if len(batch) == self.batch_size:
+                self._load_batch(batch)
+                batch = []
+        if batch:
+            self._load_batch(batch)
+
+        places = {place.id: place for place in self._created['place']}
+        places.update(self._touched_places)
+        self.facade.index_entities(self._created['user'], places.values(),
+                                   self._created['review'], self._created['amenity'])
+        report = {
+            'created': {COLLECTIONS[kind]: len(self._created[kind]) for kind in ENTITY_TYPES},
+            'failed': self._failed,
+            'errors': self._errors
+        }
+        self._imported = self._unique = self._created = self._touched_places = None
+        return report
+
+    def _fail(self, number, message):
+        """Record a rejected row."""
+        self._failed += 1
+        if len(self._errors) < MAX_REPORTED_ERRORS:
+            self._errors.append({'line': number, 'error': message})
+
+    def _load_batch(self, batch):
+        """Validate the rows of a batch, then write the entities they built."""
+        pending = {kind: [] for kind in ENTITY_TYPES}
+        # Places whose rating aggregates changed, saved once per batch
+        changed = {}
+        for number, line in batch:
+            try:
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"Invalid JSON: {e}") from None
+                if not isinstance(row, dict):
+                    raise ValueError("Row must be a JSON object")
+                kind = row.get('type')
+                if kind not in self._builders:
+                    raise ValueError(f"Type must be one of: {', '.join(ENTITY_TYPES)}")
+                # Checked first, so that a row with an invalid ID is not built at all
+                obj_id = self._new_id(kind, row['id']) if 'id' in row else None
+                obj = self._builders[kind](row)
+            except (ValueError, TypeError) as e:
+                self._fail(number, str(e))
+                continue
+            # Stored rows are linked when indexed at the end, under their final ID
+            self._unlink(kind, obj)
+            if obj_id is not None:
+                obj.id = obj_id
+            self._imported[kind][obj.id] = obj
+            if kind in UNIQUE_ATTRIBUTES:
+                self._unique[kind].add(self._unique_key(kind, obj))
+            pending[kind].append((number, obj))
+
+        discarded = set()
+        for kind in ENTITY_TYPES:
+            if discarded:
+                pending[kind] = self._drop_orphans(kind, pending[kind], discarded)
+            stored = self._write(kind, pending[kind])
+            if len(stored) < len(pending[kind]):
+                stored_ids = {obj.id for obj in stored}
+                discarded.update(obj.id for _, obj in pending[kind] if obj.id not in stored_ids)
+            self._created[kind].extend(stored)
+            if kind == 'review':
+                for obj in stored:
+                    obj.place.add_rating(obj.rating)
+                    changed[obj.place_id] = obj.place
+        for place in changed.values():
+            self.facade.place_repo.save(place)
+        self._touched_places.update(changed)
+
+    def _write(self, kind, pending):
+        """
+        Store the entities of one type built from a batch.
+
+        Returns:
+            list: The entities stored
+        """
+        if not pending:
+            return []
+        repository = self._repositories[kind]
+        objects = [obj for _, obj in pending]
+        try:
+            repository.add_many(objects)
+            return objects
+        except ValueError:
+            # Raced with another writer: find the rejected rows one by one
+            pass
+        stored = []
+        for number, obj in pending:
+            try:
+                repository.add(obj)
+                stored.append(obj)
+            except ValueError as e:
+                self._discard(kind, obj)
+                self._fail(number, str(e))
+        return stored
+
+    def _drop_orphans(self, kind, pending, discarded):
+        """Reject the rows referring to entities of the batch that were not stored."""
+        kept = []
+        for number, obj in pending:
+            if kind == 'place':
+                references = [obj.owner_id, *obj.amenity_ids]
+            elif kind == 'review':
+                references = [obj.place_id, obj.user_id]
+            else:
+                references = []
+            if discarded.intersection(references):
+                self._discard(kind, obj)
+                self._fail(number, "Refers to an entity that could not be stored")
+            else:
+                kept.append((number, obj))
+        return kept
+
+    def _discard(self, kind, obj):
+        """Forget an entity that could not be stored."""
+        del self._imported[kind][obj.id]
+        if kind in UNIQUE_ATTRIBUTES:
+            self._unique[kind].discard(self._unique_key(kind, obj))
+
+    @staticmethod
+    def _unlink(kind, obj):
+        """Undo the relationship links the model constructor made for an entity."""
+        if kind == 'place':
+            relations.unlink('user_places', obj.id)
+        elif kind == 'review':
+            relations.unlink('place_reviews', obj.id)
+            relations.unlink('user_reviews', obj.id)
+
+    def _new_id(self, kind, obj_id):
+        """
+        Validate the ID given to a row.
+
+        Raises:
+            ValueError: If it is not a UUID or is already taken
+        """
+        try:
+            obj_id = str(uuid.UUID(obj_id))
+        except (TypeError, ValueError, AttributeError):
+            raise ValueError("Id must be a UUID") from None
+        if obj_id in self._imported[kind] or self._repositories[kind].get(obj_id) is not None:
+            raise ValueError(f"Duplicate id: {obj_id}")
+        return obj_id
+
+    def _resolve(self, kind, obj_id, message):
+        """
+        Return the entity a row refers to, imported or stored.
+
+        Raises:
+            ValueError: With message if it does not exist
+        """
+        if isinstance(obj_id, str):
+            obj = self._imported[kind].get(obj_id) or self._repositories[kind].get(obj_id)
+            if obj is not None:
+                return obj
+        raise ValueError(message)
+
+    @staticmethod
+    def _unique_key(kind, obj):
+        """Return the unique attribute of an entity as its index compares it."""
+        return getattr(obj, UNIQUE_ATTRIBUTES[kind]).strip().lower()
+
+    def _check_unique(self, kind, obj, message):
+        """
+        Reject an entity whose unique attribute an imported or stored one uses.
+
+        Raises:
+            ValueError: With message if the value is taken
+        """
+        attr_name = UNIQUE_ATTRIBUTES[kind]
+        if self._unique_key(kind, obj) in self._unique[kind] \
+                or self._repositories[kind].get_by_attribute(attr_name, getattr(obj, attr_name)):
+            raise ValueError(message)
+
+    def _build_user(self, row):
+        """Validate a user row."""
+        user = User(first_name=row.get('first_name'), last_name=row.get('last_name'),
+                    email=row.get('email'), is_admin=row.get('is_admin', False))
+        self._check_unique('user', user, "Email already registered")
+        return user
+
+    def _build_amenity(self, row):
+        """Validate an amenity row."""
+        amenity = Amenity(name=row.get('name'))
+        self._check_unique('amenity', amenity, "Amenity with this name already exists")
+        return amenity
+
+    def _build_place(self, row):
+        """Validate a place row and resolve its owner and amenities."""
+        owner = self._resolve('user', row.get('owner_id'), "Owner not found")
+        amenity_ids = row.get('amenities') or []
+        if not isinstance(amenity_ids, list):
+            raise ValueError("Amenities must be a list of IDs")
+        amenities = [self._resolve('amenity', amenity_id, f"Amenity not found: {amenity_id}")
+                     for amenity_id in amenity_ids]
+        place = Place(title=row.get('title'), description=row.get('description', ''),
+                      price=row.get('price'), latitude=row.get('latitude'),
+                      longitude=row.get('longitude'), owner=owner)
+        for amenity in amenities:
+            place.add_amenity(amenity)
+        return place
+
+    def _build_review(self, row):
+        """Validate a review row and resolve its place and user."""
+        place = self._resolve('place', row.get('place_id'), "Place not found")
+        user = self._resolve('user', row.get('user_id'), "User not found")
+        return Review(text=row.get('text'), rating=row.get('rating'), place=place, user=user)
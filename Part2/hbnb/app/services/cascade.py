@@ -0,0 +1,118 @@
+"""
+Cascading deletes for the HBnB application.
+Relationships between entity types are declared once; deleting an entity
+then walks only its dependents, removes or detaches them and lets each
+entity type clean up its own repository and index entries.
+"""
+
+CASCADE = 'cascade'
+DETACH = 'detach'
+
+
+class Relationship:
+    """Declared link from a parent entity type to its dependents."""
+
+    def __init__(self, parent, child, dependents, on_delete=CASCADE, detach=None):
+        """
+        Declare a relationship.
+
+        Args:
+            parent (str): Entity type whose deletion is propagated
+            child (str): Entity type of the dependents
+            dependents (callable): Returns the child IDs of a parent ID,
+                in time proportional to their number
+            on_delete (str): CASCADE to delete the dependents, DETACH to
+                keep them and only drop the link
+            detach (callable, optional): Called with (child_id, parent_id)
+                to drop the link; required with DETACH
+
+        Raises:
+            ValueError: If on_delete is unknown or detach is missing
+        """
+        if on_delete not in (CASCADE, DETACH):
+            raise ValueError(f"Unknown on_delete action: {on_delete}")
+        if on_delete == DETACH and detach is None:
+            raise ValueError("A detach callback is required with DETACH")
+        self.parent = parent
+        self.child = child
+        self.dependents = dependents
+        self.on_delete = on_delete
+        self.detach = detach
+
+
+class CascadeEngine:
+    """
+    Deletes entities together with their dependents.
+
+    Every entity type registers a remover, called as remover(obj_id, doomed)
+    where doomed is the set of (type, id) pairs deleted by the same call,
+    so a remover can skip updating parents that are going away too.
+    """
+
+    def __init__(self):
+        """Initialize an engine without relationships."""
+        self._relationships = {}
+        self._removers = {}
+
+    def register(self, kind, remover):
+        """Register the function removing one entity of a type."""
+        self._removers[kind] = remover
+
+    def declare(self, relationship):
+        """Declare a relationship between two registered entity types."""
+        self._relationships.setdefault(relationship.parent, []).append(relationship)
+
+    def plan(self, kind, obj_id):
+        """
+        Collect what deleting an entity implies.
+
+        Args:
+            kind (str): Entity type
+            obj_id (str): ID of the entity
+
+        Returns:
+            tuple: (list of (type, id) to delete, dependents first, and
+                list of (relationship, child_id, parent_id) links to drop)
+        """
+        doomed = {}
+        detaches = []
+
+        def visit(kind, obj_id):
+            if (kind, obj_id) in doomed:
+                return
+            # Placeholder so cycles stop here; the order is fixed below
+            doomed[(kind, obj_id)] = None
+            for relationship in self._relationships.get(kind, ()):
+                for child_id in list(relationship.dependents(obj_id)):
+                    if relationship.on_delete == CASCADE:
+                        visit(relationship.child, child_id)
+                    else:
+                        detaches.append((relationship, child_id, obj_id))
+            # Post-order: dependents are removed before their parent
+            del doomed[(kind, obj_id)]
+            doomed[(kind, obj_id)] = True
+
+        visit(kind, obj_id)
+        return list(doomed), detaches
+
+    def delete(self, kind, obj_id):
+        """
+        Delete an entity and its dependents in one pass.
+
+        Args:
+            kind (str): Entity type
+            obj_id (str): ID of the entity
+
+        Returns:
+            dict: Number of deleted entities per type
+        """
+        order, detaches = self.plan(kind, obj_id)
+        doomed = set(order)
+        for relationship, child_id, parent_id in detaches:
+            if (relationship.child, child_id) not in doomed:
+                relationship.detach(child_id, parent_id)
+        counts = {}
+        for kind, obj_id in order:
+            self._removers[kind](obj_id, doomed)
+            counts[kind] = counts.get(kind, 0) + 1
+        return counts
@@ -2,11 +2,39 @@
 Facade pattern implementation for the HBnB application.
 Provides a simplified interface for interacting with the business logic.
 """
+import os
+from config import config
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
-from app.persistence.repository import InMemoryRepository
+from app.models.base_model import relations
+from app.persistence.repository import (InMemoryRepository, DuplicateKeyError,
+                                        encode_cursor, decode_cursor)
+from app.persistence.sqlite_repository import SQLiteRepository
+from app.persistence.durable_repository import DurableRepository
+from app.persistence.journal import Journal
+from app.persistence.geo_index import GeoGridIndex, k_nearest
+from app.persistence.columnar import (ColumnStore, numpy, row_mask, ordinal_mask, value_mask,
+                                      column_summary, column_counts, column_distinct)
+from app.persistence.sorted_index import SortedIndex
+from app.persistence.bitmap_index import BitmapIndex, iter_bits
+from app.persistence.text_index import TextIndex, fold
+from app.persistence.relation_index import RelationIndex
+from app.services.query_planner import PlaceQueryPlanner
+from app.services.cascade import CascadeEngine, Relationship, DETACH
+
+# Times a title token counts compared to description and review tokens
+TITLE_WEIGHT = 2
+# place_columns columns holding the number of reviews rated 1 to 5
+RATING_COLUMNS = ('rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5')
+# Entities fetched per repository page while iterating a whole collection
+EXPORT_PAGE_SIZE = 1000
+
+
+def _fold(value):
+    """Normalize a unique key so that case and surrounding spaces are ignored."""
+    return value.strip().lower() if isinstance(value, str) else value
 
 
 class HBnBFacade:
@@ -15,12 +43,223 @@ class HBnBFacade:
     Provides methods for managing users, places, reviews, and amenities.
     """
     
-    def __init__(self):
-        """Initialize repositories for each entity."""
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+    def __init__(self, settings=None):
+        """
+        Initialize repositories for each entity.
+
+        Args:
+            settings (type, optional): Configuration class selecting the
+                storage backend; defaults to the one matching FLASK_ENV
+        """
+        if settings is None:
+            settings = config.get(os.getenv('FLASK_ENV', 'development'), config['default'])
+        self._registry = {}
+        self._journal = None
+        if getattr(settings, 'REPOSITORY_BACKEND', 'memory') == 'durable':
+            self._journal = Journal(settings.JOURNAL_DIR,
+                                    fsync=settings.JOURNAL_FSYNC,
+                                    interval_ms=settings.JOURNAL_FSYNC_INTERVAL_MS,
+                                    snapshot_every=settings.JOURNAL_SNAPSHOT_EVERY)
+        self.user_repo = self._create_repository(settings, 'users', User)
+        self.place_repo = self._create_repository(settings, 'places', Place)
+        self.review_repo = self._create_repository(settings, 'reviews', Review)
+        self.amenity_repo = self._create_repository(settings, 'amenities', Amenity)
+
+        # Uniqueness is enforced by the repositories when the write happens,
+        # which keeps lookups O(1) and closes the check-then-act race
+        self.user_repo.add_index('email', unique=True, key=_fold)
+        self.amenity_repo.add_index('name', unique=True, key=_fold)
+
+        # Durable repositories are filled from the snapshot and log before
+        # the facade (and therefore the app) can serve any request
+        if self._journal is not None:
+            self._journal.recover()
+
+        # Place indexes live next to place_repo and are kept in sync by
+        # create_place, update_place and delete_place; the amenity bitmaps
+        # use the place ordinals of place_columns
+        self.place_geo_index = GeoGridIndex()
+        # Hot numeric fields, column by column, for vectorised scans and
+        # aggregates; references to other entities are stored as ordinals.
+        # Ratings are also aggregated per place in the rating columns, so
+        # place statistics never need a pass over the reviews.
+        self.user_columns = ColumnStore({})
+        self.place_columns = ColumnStore({'latitude': 'd', 'longitude': 'd',
+                                          'price': 'd', 'owner': 'q',
+                                          **{name: 'q' for name in RATING_COLUMNS}})
+        self.review_columns = ColumnStore({'rating': 'b', 'place': 'q', 'user': 'q'})
+        self.place_price_index = SortedIndex()
+        self.place_amenity_index = BitmapIndex()
+        # Leaderboard of rated places: best average, then most reviews first
+        self.place_rating_index = SortedIndex()
+        # One text document per place: its title, description and reviews
+        self.place_text_index = TextIndex()
+        # Type-ahead indexes, keyed by the folded title or name
+        self.place_title_index = SortedIndex()
+        self.amenity_name_index = SortedIndex()
+        # Places of each owner, and reviews of each place and of each user,
+        # in creation order; the models only hold the reference to their parent
+        # and list their children through these indexes
+        self.user_places = RelationIndex()
+        self.place_reviews = RelationIndex()
+        self.user_reviews = RelationIndex()
+        relations.bind('user_places', self.user_places, self.place_repo.get_many)
+        relations.bind('place_reviews', self.place_reviews, self.review_repo.get_many)
+        relations.bind('user_reviews', self.user_reviews, self.review_repo.get_many)
+        self._rebuild_indexes()
+        self.place_query_planner = PlaceQueryPlanner(self)
+        self.cascade = self._create_cascade()
+
+    def _create_repository(self, settings, table, model):
+        """
+        Create the repository of one entity for the configured backend.
+
+        Args:
+            settings (type): Configuration class
+            table (str): Storage name of the entity
+            model (type): Model class stored in the repository
+
+        Returns:
+            Repository: The repository instance
+
+        Raises:
+            ValueError: If the configured backend is unknown
+        """
+        backend = getattr(settings, 'REPOSITORY_BACKEND', 'memory')
+        if backend == 'memory':
+            return InMemoryRepository()
+        if backend == 'durable':
+            return DurableRepository(self._journal, model)
+        if backend == 'sqlite':
+            return SQLiteRepository(settings.SQLITE_PATH, table, model, registry=self._registry)
+        raise ValueError(f"Unknown repository backend: {backend}")
+
+    def _create_cascade(self):
+        """Declare how deletes propagate between the entity types."""
+        cascade = CascadeEngine()
+        cascade.register('user', self._remove_user)
+        cascade.register('place', self._remove_place)
+        cascade.register('review', self._remove_review)
+        cascade.register('amenity', self._remove_amenity)
+        cascade.declare(Relationship('user', 'place', self.user_places.children))
+        cascade.declare(Relationship('user', 'review', self.user_reviews.children))
+        cascade.declare(Relationship('place', 'review', self.place_reviews.children))
+        cascade.declare(Relationship('amenity', 'place', self._places_with_amenity,
+                                     on_delete=DETACH, detach=self._detach_amenity))
+        return cascade
+
+    def _rebuild_indexes(self):
+        """
+        Fill the facade-level indexes from the repositories.
+
+        Each repository is read one page at a time, so that a database
+        larger than memory can be indexed. The rating aggregates of the
+        places are checked against their reviews on the way, and only the
+        places that disagree are loaded again and fixed.
+        """
+        self.index_entities(users=self.user_repo.iter_all(EXPORT_PAGE_SIZE),
+                            amenities=self.amenity_repo.iter_all(EXPORT_PAGE_SIZE))
+        stored = {}
+        for place in self.place_repo.iter_all(EXPORT_PAGE_SIZE):
+            if not hasattr(place, 'rating_histogram'):
+                # Stored before the aggregates existed: counted from the reviews below
+                place.recompute_ratings([0] * 5)
+                stored[place.id] = None
+            else:
+                stored[place.id] = place.rating_histogram
+            self._index_place(place)
+        counted = {place_id: [0] * 5 for place_id in stored}
+        for review in self.review_repo.iter_all(EXPORT_PAGE_SIZE):
+            self.index_entities(reviews=(review,))
+            if review.place_id in counted:
+                counted[review.place_id][review.rating - 1] += 1
+        stale = [place_id for place_id, histogram in counted.items()
+                 if histogram != stored[place_id]]
+        for place in self.place_repo.get_many(stale):
+            if place:
+                place.recompute_ratings(counted[place.id])
+                self.place_repo.save(place)
+                self._index_place_rating(place)
+
+    def index_entities(self, users=(), places=(), reviews=(), amenities=()):
+        """
+        Insert or refresh entities in the facade-level indexes.
+
+        Used for entities written straight to the repositories, such as
+        those of a bulk import, which are indexed once at the end.
+
+        Args:
+            users (iterable): Users to index
+            places (iterable): New places, and places whose reviews or
+                amenities changed; their rating aggregates must be current
+            reviews (iterable): Reviews to index, after their places
+            amenities (iterable): Amenities to index
+        """
+        for user in users:
+            self.user_columns.put(user.id)
+        for place in places:
+            self._index_place(place)
+        for review in reviews:
+            place_id = review.place_id
+            self.place_reviews.link(place_id, review.id)
+            self.user_reviews.link(review.user_id, review.id)
+            self._index_review(review)
+            if place_id in self.place_columns:
+                self.place_text_index.set_source(place_id, review.id, review.text)
+        for amenity in amenities:
+            self.amenity_name_index.insert(amenity.id, fold(amenity.name))
+
+    def _index_place(self, place):
+        """Insert or refresh a place in every place index."""
+        owner_id = place.owner_id
+        self.user_places.link(owner_id, place.id)
+        self.place_geo_index.insert(place.id, place.latitude, place.longitude)
+        ordinal = self.place_columns.put(place.id, latitude=float(place.latitude),
+                                         longitude=float(place.longitude),
+                                         price=float(place.price),
+                                         owner=self.user_columns.put(owner_id))
+        self.place_price_index.insert(place.id, float(place.price))
+        self.place_amenity_index.set(ordinal, place.amenity_ids)
+        self._index_place_rating(place)
+        self.place_text_index.set_source(place.id, 'title', place.title, weight=TITLE_WEIGHT)
+        self.place_text_index.set_source(place.id, 'description', place.description)
+        self.place_title_index.insert(place.id, fold(place.title))
+
+    def _index_place_rating(self, place):
+        """Move a place in the leaderboard after its rating aggregates changed."""
+        # Reviews can outlive their place, which must not come back ranked
+        if place.id in self.place_columns:
+            self.place_columns.put(place.id, **dict(zip(RATING_COLUMNS, place.rating_histogram)))
+        if place.rating_count and place.id in self.place_columns:
+            self.place_rating_index.insert(place.id, (-place.rating_avg, -place.rating_count))
+        else:
+            self.place_rating_index.remove(place.id)
+
+    def _index_review(self, review):
+        """Insert or refresh a review in review_columns."""
+        place_ordinal = self.place_columns.ordinal(review.place_id)
+        self.review_columns.put(review.id, rating=review.rating,
+                                place=-1 if place_ordinal is None else place_ordinal,
+                                user=self.user_columns.put(review.user_id))
+
+    def _unindex_place(self, place):
+        """Remove a place from every place index."""
+        self.place_geo_index.remove(place.id)
+        ordinal = self.place_columns.ordinal(place.id)
+        if ordinal is not None:
+            # Cleared before the ordinal can be recycled by another place
+            self.place_amenity_index.clear(ordinal)
+        self.place_columns.remove(place.id)
+        self.place_price_index.remove(place.id)
+        self.place_rating_index.remove(place.id)
+        self.place_text_index.remove_document(place.id)
+        self.place_title_index.remove(place.id)
+
+    @staticmethod
+    def _split_missing(obj_ids, objects):
+        """Split the result of Repository.get_many into (found, missing IDs)."""
+        return ([obj for obj in objects if obj is not None],
+                [obj_id for obj_id, obj in zip(obj_ids, objects) if obj is None])
 
     # ==================== User Management ====================
     
@@ -39,20 +278,21 @@ class HBnBFacade:
             User: The created user instance
         
         Raises:
-            ValueError: If validation fails or email already exists
+            ValueError: If validation fails
+            DuplicateKeyError: If the email already exists
         """
-        # Check if email already exists
-        existing_user = self.user_repo.get_by_attribute('email', user_data.get('email'))
-        if existing_user:
-            raise ValueError("User with this email already exists")
-        
         user = User(
             first_name=user_data.get('first_name'),
             last_name=user_data.get('last_name'),
             email=user_data.get('email'),
             is_admin=user_data.get('is_admin', False)
         )
-        self.user_repo.add(user)
+        try:
+            self.user_repo.add(user)
+        except DuplicateKeyError as e:
+            raise DuplicateKeyError("User with this email already exists",
+                                    e.attr_name, e.value) from None
+        self.user_columns.put(user.id)
         return user
 
     def get_user(self, user_id):
@@ -88,6 +328,44 @@ class HBnBFacade:
         """
         return self.user_repo.get_all()
 
+    def get_users_by_ids(self, user_ids):
+        """
+        Retrieve several users at once.
+        
+        Args:
+            user_ids (list): The users' UUIDs
+        
+        Returns:
+            tuple: (list of the user instances found, in the order of
+                user_ids; list of the IDs not found)
+        """
+        return self._split_missing(user_ids, self.user_repo.get_many(user_ids))
+
+    def get_users_page(self, limit, cursor=None):
+        """
+        Retrieve one page of users in creation order.
+        
+        Args:
+            limit (int): Maximum number of users to return
+            cursor (str, optional): next_cursor of the previous page
+        
+        Returns:
+            tuple: (list of user instances, next_cursor or None)
+        
+        Raises:
+            ValueError: If the cursor or limit is invalid
+        """
+        return self.user_repo.get_page(limit, cursor)
+
+    def iter_users(self):
+        """
+        Iterate over all users in creation order, one repository page at a time.
+        
+        Returns:
+            generator: The user instances, fetched as they are consumed
+        """
+        return self.user_repo.iter_all(EXPORT_PAGE_SIZE)
+
     def update_user(self, user_id, user_data):
         """
         Update a user's information.
@@ -100,24 +378,22 @@ class HBnBFacade:
             User: The updated user instance or None if not found
         
         Raises:
-            ValueError: If email already exists for another user
+            DuplicateKeyError: If email already exists for another user
         """
         user = self.get_user(user_id)
         if not user:
             return None
         
-        # If email is being updated, check it doesn't exist for another user
-        if 'email' in user_data:
-            existing = self.user_repo.get_by_attribute('email', user_data['email'])
-            if existing and existing.id != user_id:
-                raise ValueError("Email already exists for another user")
-        
-        self.user_repo.update(user_id, user_data)
+        try:
+            self.user_repo.update(user_id, user_data)
+        except DuplicateKeyError as e:
+            raise DuplicateKeyError("Email already exists for another user",
+                                    e.attr_name, e.value) from None
         return user
 
     def delete_user(self, user_id):
         """
-        Delete a user.
+        Delete a user, the places they own and the reviews they wrote.
         
         Args:
             user_id (str): The user's UUID
@@ -127,7 +403,7 @@ class HBnBFacade:
         """
         user = self.get_user(user_id)
         if user:
-            self.user_repo.delete(user_id)
+            self.cascade.delete('user', user_id)
             return True
         return False
 
@@ -165,6 +441,7 @@ class HBnBFacade:
             owner=owner
         )
         self.place_repo.add(place)
+        self._index_place(place)
         return place
 
     def get_place(self, place_id):
@@ -188,6 +465,111 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_by_ids(self, place_ids):
+        """
+        Retrieve several places at once.
+        
+        Args:
+            place_ids (list): The places' UUIDs
+        
+        Returns:
+            tuple: (list of the place instances found, in the order of
+                place_ids; list of the IDs not found)
+        """
+        return self._split_missing(place_ids, self.place_repo.get_many(place_ids))
+
+    def get_places_page(self, limit, cursor=None):
+        """
+        Retrieve one page of places in creation order.
+        
+        Args:
+            limit (int): Maximum number of places to return
+            cursor (str, optional): next_cursor of the previous page
+        
+        Returns:
+            tuple: (list of place instances, next_cursor or None)
+        
+        Raises:
+            ValueError: If the cursor or limit is invalid
+        """
+        return self.place_repo.get_page(limit, cursor)
+
+    def iter_places(self):
+        """
+        Iterate over all places in creation order, one repository page at a time.
+        
+        Returns:
+            generator: The place instances, fetched as they are consumed
+        """
+        return self.place_repo.iter_all(EXPORT_PAGE_SIZE)
+
+    def find_places(self, bbox=None, min_price=None, max_price=None, amenity_ids=None,
+                    min_rating=None, sort=None, limit=None, cursor=None):
+        """
+        Retrieve the places matching every given filter.
+        
+        The query planner drives the query from the most selective index
+        and checks the other filters on its candidates only.
+        
+        Args:
+            bbox (list, optional): min_lon, min_lat, max_lon, max_lat
+            min_price (float, optional): Lowest price, inclusive
+            max_price (float, optional): Highest price, inclusive
+            amenity_ids (list, optional): Amenities the places must all have
+            min_rating (float, optional): Lowest average rating, inclusive
+            sort (str, optional): 'price' or '-price'; creation order if None
+            limit (int, optional): Maximum number of places to return
+            cursor (str, optional): next_cursor of the previous page
+        
+        Returns:
+            tuple: (list of place instances, next_cursor or None, explain
+                dict with the index and candidate count of each step)
+        
+        Raises:
+            ValueError: If a filter, the sort, limit or cursor is invalid
+        """
+        return self.place_query_planner.execute(
+            sort=sort, limit=limit, cursor=cursor, bbox=bbox, min_price=min_price,
+            max_price=max_price, amenity_ids=amenity_ids, min_rating=min_rating)
+
+    def get_top_places(self, n=50, min_reviews=5):
+        """
+        Retrieve the best rated places.
+        
+        Places are ranked by average rating, then by number of reviews.
+        The leaderboard is kept sorted as reviews change, so this walks
+        its first entries instead of sorting every place.
+        
+        Args:
+            n (int): Maximum number of places to return
+            min_reviews (int): Minimum number of reviews of a ranked place
+        
+        Returns:
+            list: Place instances, best rated first
+        
+        Raises:
+            ValueError: If n or min_reviews is invalid
+        """
+        try:
+            n, min_reviews = int(n), int(min_reviews)
+        except (TypeError, ValueError):
+            raise ValueError("n and min_reviews must be integers")
+        if n < 1:
+            raise ValueError("n must be a positive integer")
+        if min_reviews < 0:
+            raise ValueError("min_reviews must not be negative")
+        
+        places = []
+        for (_, negative_count), place_id in self.place_rating_index.range():
+            if len(places) == n:
+                break
+            if -negative_count < min_reviews:
+                continue
+            place = self.get_place(place_id)
+            if place:
+                places.append(place)
+        return places
+
     def update_place(self, place_id, place_data):
         """
         Update a place's information.
@@ -204,11 +586,12 @@ class HBnBFacade:
             return None
         
         self.place_repo.update(place_id, place_data)
+        self._index_place(place)
         return place
 
     def delete_place(self, place_id):
         """
-        Delete a place.
+        Delete a place and its reviews.
         
         Args:
             place_id (str): The place's UUID
@@ -218,7 +601,7 @@ class HBnBFacade:
         """
         place = self.get_place(place_id)
         if place:
-            self.place_repo.delete(place_id)
+            self.cascade.delete('place', place_id)
             return True
         return False
 
@@ -256,6 +639,13 @@ class HBnBFacade:
             user=user
         )
         self.review_repo.add(review)
+        self.place_reviews.link(place.id, review.id)
+        self.user_reviews.link(user.id, review.id)
+        self._index_review(review)
+        place.add_rating(review.rating)
+        self.place_repo.save(place)
+        self._index_place_rating(place)
+        self.place_text_index.set_source(place.id, review.id, review.text)
         return review
 
     def get_review(self, review_id):
@@ -279,6 +669,44 @@ class HBnBFacade:
         """
         return self.review_repo.get_all()
 
+    def get_reviews_by_ids(self, review_ids):
+        """
+        Retrieve several reviews at once.
+        
+        Args:
+            review_ids (list): The reviews' UUIDs
+        
+        Returns:
+            tuple: (list of the review instances found, in the order of
+                review_ids; list of the IDs not found)
+        """
+        return self._split_missing(review_ids, self.review_repo.get_many(review_ids))
+
+    def get_reviews_page(self, limit, cursor=None):
+        """
+        Retrieve one page of reviews in creation order.
+        
+        Args:
+            limit (int): Maximum number of reviews to return
+            cursor (str, optional): next_cursor of the previous page
+        
+        Returns:
+            tuple: (list of review instances, next_cursor or None)
+        
+        Raises:
+            ValueError: If the cursor or limit is invalid
+        """
+        return self.review_repo.get_page(limit, cursor)
+
+    def iter_reviews(self):
+        """
+        Iterate over all reviews in creation order, one repository page at a time.
+        
+        Returns:
+            generator: The review instances, fetched as they are consumed
+        """
+        return self.review_repo.iter_all(EXPORT_PAGE_SIZE)
+
     def get_reviews_by_place(self, place_id):
         """
         Retrieve all reviews for a specific place.
@@ -289,10 +717,32 @@ class HBnBFacade:
         Returns:
             list: List of review instances for the place
         """
-        place = self.get_place(place_id)
-        if not place:
-            return []
-        return place.reviews
+        return self._load_reviews(self.place_reviews.children(place_id))
+
+    def get_reviews_by_place_page(self, place_id, limit, cursor=None):
+        """
+        Retrieve one page of the reviews of a place in creation order.
+        
+        Args:
+            place_id (str): The place's UUID
+            limit (int): Maximum number of reviews to return
+            cursor (str, optional): next_cursor of the previous page
+        
+        Returns:
+            tuple: (list of review instances, next_cursor or None)
+        
+        Raises:
+            ValueError: If the cursor or limit is invalid
+        """
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        after = decode_cursor(cursor) if cursor else None
+        review_ids, last = self.place_reviews.page(place_id, limit, after)
+        return self._load_reviews(review_ids), (encode_cursor(last) if last is not None else None)
+
+    def _load_reviews(self, review_ids):
+        """Load reviews by ID, skipping any that no longer exist."""
+        return [review for review in self.review_repo.get_many(review_ids) if review]
 
     def update_review(self, review_id, review_data):
         """
@@ -304,12 +754,26 @@ class HBnBFacade:
         
         Returns:
             Review: The updated review instance or None if not found
+        
+        Raises:
+            ValueError: If the new rating is invalid
         """
         review = self.get_review(review_id)
         if not review:
             return None
         
+        if 'rating' in review_data:
+            review_data = dict(review_data, rating=Review._validate_rating(review_data['rating']))
+        old_rating = review.rating
         self.review_repo.update(review_id, review_data)
+        if review.rating != old_rating:
+            self._index_review(review)
+            review.place.remove_rating(old_rating)
+            review.place.add_rating(review.rating)
+            self.place_repo.save(review.place)
+            self._index_place_rating(review.place)
+        if 'text' in review_data and review.place.id in self.place_columns:
+            self.place_text_index.set_source(review.place.id, review.id, review.text)
         return review
 
     def delete_review(self, review_id):
@@ -324,7 +788,7 @@ class HBnBFacade:
         """
         review = self.get_review(review_id)
         if review:
-            self.review_repo.delete(review_id)
+            self.cascade.delete('review', review_id)
             return True
         return False
 
@@ -342,15 +806,16 @@ class HBnBFacade:
             Amenity: The created amenity instance
         
         Raises:
-            ValueError: If validation fails or name already exists
+            ValueError: If validation fails
+            DuplicateKeyError: If the name already exists
         """
-        # Check if amenity name already exists
-        existing = self.amenity_repo.get_by_attribute('name', amenity_data.get('name'))
-        if existing:
-            raise ValueError("Amenity with this name already exists")
-        
         amenity = Amenity(name=amenity_data.get('name'))
-        self.amenity_repo.add(amenity)
+        try:
+            self.amenity_repo.add(amenity)
+        except DuplicateKeyError as e:
+            raise DuplicateKeyError("Amenity with this name already exists",
+                                    e.attr_name, e.value) from None
+        self.amenity_name_index.insert(amenity.id, fold(amenity.name))
         return amenity
 
     def get_amenity(self, amenity_id):
@@ -374,6 +839,44 @@ class HBnBFacade:
         """
         return self.amenity_repo.get_all()
 
+    def get_amenities_by_ids(self, amenity_ids):
+        """
+        Retrieve several amenities at once.
+        
+        Args:
+            amenity_ids (list): The amenities' UUIDs
+        
+        Returns:
+            tuple: (list of the amenity instances found, in the order of
+                amenity_ids; list of the IDs not found)
+        """
+        return self._split_missing(amenity_ids, self.amenity_repo.get_many(amenity_ids))
+
+    def get_amenities_page(self, limit, cursor=None):
+        """
+        Retrieve one page of amenities in creation order.
+        
+        Args:
+            limit (int): Maximum number of amenities to return
+            cursor (str, optional): next_cursor of the previous page
+        
+        Returns:
+            tuple: (list of amenity instances, next_cursor or None)
+        
+        Raises:
+            ValueError: If the cursor or limit is invalid
+        """
+        return self.amenity_repo.get_page(limit, cursor)
+
+    def iter_amenities(self):
+        """
+        Iterate over all amenities in creation order, one repository page at a time.
+        
+        Returns:
+            generator: The amenity instances, fetched as they are consumed
+        """
+        return self.amenity_repo.iter_all(EXPORT_PAGE_SIZE)
+
     def update_amenity(self, amenity_id, amenity_data):
         """
         Update an amenity's information.
@@ -384,23 +887,25 @@ class HBnBFacade:
         
         Returns:
             Amenity: The updated amenity instance or None if not found
+
+        Raises:
+            DuplicateKeyError: If the name already exists for another amenity
         """
         amenity = self.get_amenity(amenity_id)
         if not amenity:
             return None
         
-        # If name is being updated, check it doesn't exist
-        if 'name' in amenity_data:
-            existing = self.amenity_repo.get_by_attribute('name', amenity_data['name'])
-            if existing and existing.id != amenity_id:
-                raise ValueError("Amenity name already exists")
-        
-        self.amenity_repo.update(amenity_id, amenity_data)
+        try:
+            self.amenity_repo.update(amenity_id, amenity_data)
+        except DuplicateKeyError as e:
+            raise DuplicateKeyError("Amenity with this name already exists",
+                                    e.attr_name, e.value) from None
+        self.amenity_name_index.insert(amenity.id, fold(amenity.name))
         return amenity
 
     def delete_amenity(self, amenity_id):
         """
-        Delete an amenity.
+        Delete an amenity and remove it from the places having it.
         
         Args:
             amenity_id (str): The amenity's UUID
@@ -410,10 +915,46 @@ class HBnBFacade:
         """
         amenity = self.get_amenity(amenity_id)
         if amenity:
-            self.amenity_repo.delete(amenity_id)
+            self.cascade.delete('amenity', amenity_id)
             return True
         return False
 
+    def suggest_amenities(self, prefix, k=10):
+        """
+        Suggest the amenities whose name starts with a prefix.
+        
+        Args:
+            prefix (str): Start of the name, case and accents ignored
+            k (int): Maximum number of amenities to return
+        
+        Returns:
+            list: Amenity instances in name order
+        
+        Raises:
+            ValueError: If the prefix is empty or k is invalid
+        """
+        return self._suggest(self.amenity_name_index, self.get_amenity, prefix, k)
+
+    def _suggest(self, index, get, prefix, k):
+        """Load the first k entities of a type-ahead index matching a prefix."""
+        if not prefix or not prefix.strip():
+            raise ValueError("Prefix must not be empty")
+        try:
+            k = int(k)
+        except (TypeError, ValueError):
+            raise ValueError("k must be an integer")
+        if k < 1:
+            raise ValueError("k must be a positive integer")
+        
+        results = []
+        for _, obj_id in index.starting_with(fold(prefix.lstrip())):
+            if len(results) == k:
+                break
+            obj = get(obj_id)
+            if obj:
+                results.append(obj)
+        return results
+
     # ==================== Place-Amenity Relationship ====================
     
     def add_amenity_to_place(self, place_id, amenity_id):
@@ -439,6 +980,8 @@ class HBnBFacade:
             raise ValueError("Amenity not found")
         
         place.add_amenity(amenity)
+        self.place_repo.save(place)
+        self.place_amenity_index.add(amenity.id, self.place_columns.ordinal(place.id))
         return True
 
     def remove_amenity_from_place(self, place_id, amenity_id):
@@ -464,4 +1007,299 @@ class HBnBFacade:
             raise ValueError("Amenity not found")
         
         place.remove_amenity(amenity)
-        return True
\ No newline at end of file
+        self.place_repo.save(place)
+        self.place_amenity_index.discard(amenity.id, self.place_columns.ordinal(place.id))
+        return True
+
+    # ==================== Place Search ====================
+
+    def _places_with_distance(self, matches, limit):
+        """Load the places of (id, distance) index matches."""
+        results = []
+        for place_id, distance in matches[:limit] if limit else matches:
+            place = self.get_place(place_id)
+            if place:
+                results.append((place, distance))
+        return results
+
+    def search_places_by_radius(self, latitude, longitude, radius_km, limit=None):
+        """
+        Find the places within a distance of a point, nearest first.
+        
+        Args:
+            latitude (float): Latitude of the center
+            longitude (float): Longitude of the center
+            radius_km (float): Search radius in kilometers
+            limit (int, optional): Maximum number of places to return
+        
+        Returns:
+            list: (place, distance_km) tuples sorted by distance
+        
+        Raises:
+            ValueError: If the coordinates or radius are invalid
+        """
+        latitude = Place._validate_latitude(latitude)
+        longitude = Place._validate_longitude(longitude)
+        try:
+            radius_km = float(radius_km)
+        except (TypeError, ValueError):
+            raise ValueError("Radius must be a number")
+        if radius_km <= 0:
+            raise ValueError("Radius must be a positive value")
+        
+        matches = self.place_geo_index.within_radius(latitude, longitude, radius_km)
+        return self._places_with_distance(matches, limit)
+
+    @staticmethod
+    def validate_bbox(min_lon, min_lat, max_lon, max_lat):
+        """
+        Validate a bounding box, as every bbox filter and search does.
+        
+        Returns:
+            tuple: (min_lon, min_lat, max_lon, max_lat) as floats
+        
+        Raises:
+            ValueError: If a coordinate is invalid or the latitudes are inverted
+        """
+        min_lat = Place._validate_latitude(min_lat)
+        max_lat = Place._validate_latitude(max_lat)
+        min_lon = Place._validate_longitude(min_lon)
+        max_lon = Place._validate_longitude(max_lon)
+        if min_lat > max_lat:
+            raise ValueError("Bounding box min latitude must not exceed max latitude")
+        return min_lon, min_lat, max_lon, max_lat
+
+    def search_places_in_bbox(self, min_lon, min_lat, max_lon, max_lat,
+                              latitude=None, longitude=None, limit=None):
+        """
+        Find the places inside a bounding box.
+        
+        Args:
+            min_lon (float): Western edge
+            min_lat (float): Southern edge
+            max_lon (float): Eastern edge (less than min_lon when the box
+                crosses the antimeridian)
+            max_lat (float): Northern edge
+            latitude (float, optional): Sort by distance to this latitude
+            longitude (float, optional): Sort by distance to this longitude
+            limit (int, optional): Maximum number of places to return
+        
+        Returns:
+            list: (place, distance_km) tuples sorted by distance to the
+                given point, or to the box center
+        
+        Raises:
+            ValueError: If the box or point is invalid
+        """
+        min_lon, min_lat, max_lon, max_lat = self.validate_bbox(min_lon, min_lat,
+                                                                max_lon, max_lat)
+        if latitude is not None and longitude is not None:
+            latitude = Place._validate_latitude(latitude)
+            longitude = Place._validate_longitude(longitude)
+        
+        matches = self.place_geo_index.within_bbox(min_lon, min_lat, max_lon, max_lat,
+                                                   latitude, longitude)
+        return self._places_with_distance(matches, limit)
+
+    def search_places_by_text(self, query, limit=None):
+        """
+        Find the places whose title, description or reviews match a query.
+        
+        Args:
+            query (str): Free text query
+            limit (int, optional): Maximum number of places to return
+        
+        Returns:
+            list: (place, score) tuples, best match first
+        
+        Raises:
+            ValueError: If the query is empty
+        """
+        if not query or not query.strip():
+            raise ValueError("Search query must not be empty")
+        results = []
+        for place_id, score in self.place_text_index.search(query, limit):
+            place = self.get_place(place_id)
+            if place:
+                results.append((place, score))
+        return results
+
+    def suggest_places(self, prefix, k=10):
+        """
+        Suggest the places whose title starts with a prefix.
+        
+        Args:
+            prefix (str): Start of the title, case and accents ignored
+            k (int): Maximum number of places to return
+        
+        Returns:
+            list: Place instances in title order
+        
+        Raises:
+            ValueError: If the prefix is empty or k is invalid
+        """
+        return self._suggest(self.place_title_index, self.get_place, prefix, k)
+
+    def nearest_places(self, latitude, longitude, k=20):
+        """
+        Find the k places nearest to a point.
+        
+        Args:
+            latitude (float): Latitude of the reference point
+            longitude (float): Longitude of the reference point
+            k (int): Number of places to return
+        
+        Returns:
+            list: (place, distance_km) tuples sorted by distance
+        
+        Raises:
+            ValueError: If the coordinates or k are invalid
+        """
+        latitude = Place._validate_latitude(latitude)
+        longitude = Place._validate_longitude(longitude)
+        try:
+            k = int(k)
+        except (TypeError, ValueError):
+            raise ValueError("k must be an integer")
+        if k < 1:
+            raise ValueError("k must be a positive integer")
+        
+        matches = k_nearest(self.place_columns, latitude, longitude, k)
+        return self._places_with_distance(matches, None)
+
+    # ==================== Place Statistics ====================
+
+    def get_place_stats(self, bbox=None):
+        """
+        Aggregate the prices and ratings of the places, optionally in a box.
+        
+        Runs over place_columns instead of the Place objects, as vectorised
+        operations when NumPy is installed; ratings are summed from the
+        per-place counts instead of walking the reviews.
+        
+        Args:
+            bbox (list, optional): min_lon, min_lat, max_lon, max_lat
+        
+        Returns:
+            dict: Number of places and distinct owners, price min, max and
+                average, number of reviews, average rating and number of
+                reviews per rating from 1 to 5
+        
+        Raises:
+            ValueError: If the box is invalid
+        """
+        if bbox is not None:
+            bbox = self.validate_bbox(*bbox)
+        if bbox is not None and numpy is None:
+            # Without NumPy the column pass runs in Python, while the grid
+            # index only visits the cells overlapping the box
+            places = ordinal_mask(self.place_columns, self.place_geo_index.ids_in_bbox(*bbox))
+        else:
+            places = row_mask(self.place_columns, bbox)
+        price = column_summary(self.place_columns, 'price', places)
+        counts = [column_summary(self.place_columns, name, places)['sum']
+                  for name in RATING_COLUMNS]
+        review_count = sum(counts)
+        return {
+            'places': price['count'],
+            'owners': column_distinct(self.place_columns, 'owner', places),
+            'price': {
+                'min': price['min'],
+                'max': price['max'],
+                'avg': price['sum'] / price['count'] if price['count'] else None
+            },
+            'reviews': review_count,
+            'rating': {
+                'avg': (sum(rating * count for rating, count in enumerate(counts, 1))
+                        / review_count if review_count else None),
+                'histogram': counts
+            }
+        }
+
+    def get_user_review_stats(self, user_id):
+        """
+        Aggregate the ratings a user gave in their reviews.
+        
+        Runs over review_columns instead of the Review objects, as
+        vectorised operations when NumPy is installed.
+        
+        Args:
+            user_id (str): The user's UUID
+        
+        Returns:
+            dict: Number of reviews and of distinct places reviewed, average
+                rating and number of reviews per rating from 1 to 5, or None
+                if the user does not exist
+        """
+        if not self.get_user(user_id):
+            return None
+        user = self.user_columns.ordinal(user_id)
+        reviews = value_mask(self.review_columns, 'user', -1 if user is None else user)
+        counts = column_counts(self.review_columns, 'rating', reviews, 6)[1:]
+        review_count = sum(counts)
+        return {
+            'reviews': review_count,
+            'places': column_distinct(self.review_columns, 'place', reviews),
+            'rating': {
+                'avg': (sum(rating * count for rating, count in enumerate(counts, 1))
+                        / review_count if review_count else None),
+                'histogram': counts
+            }
+        }
+
+    # ==================== Cascading Deletes ====================
+
+    def _places_with_amenity(self, amenity_id):
+        """Return the IDs of the places having an amenity."""
+        bits = self.place_amenity_index.bitmap(amenity_id)
+        return [self.place_columns.id_at(ordinal) for ordinal in iter_bits(bits)]
+
+    def _remove_user(self, user_id, doomed):
+        """Remove a user whose places and reviews are already removed."""
+        self.user_repo.delete(user_id)
+        self.user_places.unlink_parent(user_id)
+        self.user_reviews.unlink_parent(user_id)
+        self.user_columns.remove(user_id)
+
+    def _remove_place(self, place_id, doomed):
+        """Remove a place whose reviews are already removed."""
+        place = self.get_place(place_id)
+        if not place:
+            return
+        self.place_repo.delete(place_id)
+        self._unindex_place(place)
+        self.user_places.unlink(place_id)
+        self.place_reviews.unlink_parent(place_id)
+
+    def _remove_review(self, review_id, doomed):
+        """Remove a review and update the place that survives it."""
+        review = self.get_review(review_id)
+        if not review:
+            return
+        self.review_repo.delete(review_id)
+        self.review_columns.remove(review_id)
+        self.place_reviews.unlink(review_id)
+        self.user_reviews.unlink(review_id)
+        if ('place', review.place_id) in doomed:
+            return
+        place = review.place
+        if place:
+            place.remove_rating(review.rating)
+            self.place_repo.save(place)
+            self._index_place_rating(place)
+            self.place_text_index.remove_source(place.id, review.id)
+
+    def _remove_amenity(self, amenity_id, doomed):
+        """Remove an amenity already detached from its places."""
+        self.amenity_repo.delete(amenity_id)
+        self.place_amenity_index.drop(amenity_id)
+        self.amenity_name_index.remove(amenity_id)
+
+    def _detach_amenity(self, place_id, amenity_id):
+        """Remove an amenity from one place."""
+        place = self.get_place(place_id)
+        amenity = self.get_amenity(amenity_id)
+        if place and amenity:
+            place.remove_amenity(amenity)
+            self.place_repo.save(place)
+            self.place_amenity_index.discard(amenity_id, self.place_columns.ordinal(place_id))
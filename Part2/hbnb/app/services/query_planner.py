@@ -0,0 +1,285 @@
+"""
+Query planner for combined place filters in the HBnB application.
+Estimates how many places each filter keeps from the facade indexes,
+drives the query from the most selective one and only checks the other
+filters against its candidates.
+"""
+from app.persistence.bitmap_index import iter_bits
+from app.persistence.repository import encode_cursor, decode_cursor
+from app.persistence.sorted_index import encode_key_cursor, decode_key_cursor
+
+SORT_ORDERS = ('price', '-price')
+
+
+class FilterStep:
+    """One filter of a place query and the index that answers it."""
+
+    def __init__(self, name, index, estimate, scan, probe, bounds=None):
+        """
+        Initialize a step.
+
+        Args:
+            name (str): Filter name, as shown by explain
+            index (str): Name of the facade index answering the filter
+            estimate (int): Expected number of matching places
+            scan (callable): Returns the IDs of the matching places
+            probe (callable): Tells whether a place ID matches, in O(1)
+            bounds (tuple, optional): (low, high) key range of an ordered
+                index, so the step can also be walked in key order
+        """
+        self.name = name
+        self.index = index
+        self.estimate = estimate
+        self.scan = scan
+        self.probe = probe
+        self.bounds = bounds
+
+
+class PlaceQueryPlanner:
+    """
+    Plans and runs place queries combining bbox, price, amenities and rating.
+
+    The step with the smallest estimate is scanned; the others are probed
+    on its candidates, smallest estimate first, so that each probe sees as
+    few candidates as possible.
+    """
+
+    def __init__(self, facade):
+        """
+        Initialize the planner.
+
+        Args:
+            facade (HBnBFacade): Facade owning the place indexes
+        """
+        self.facade = facade
+
+    def plan(self, bbox=None, min_price=None, max_price=None, amenity_ids=None,
+             min_rating=None):
+        """
+        Build the filter steps of a query, most selective first.
+
+        Args:
+            bbox (list, optional): min_lon, min_lat, max_lon, max_lat
+            min_price (float, optional): Lowest price, inclusive
+            max_price (float, optional): Highest price, inclusive
+            amenity_ids (list, optional): Amenities the places must all have
+            min_rating (float, optional): Lowest average rating, inclusive
+
+        Returns:
+            list: FilterStep instances in execution order
+
+        Raises:
+            ValueError: If a filter is invalid
+        """
+        facade = self.facade
+        steps = []
+
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = facade.validate_bbox(*bbox)
+            geo = facade.place_geo_index
+
+            def in_bbox(place_id):
+                point = geo.point(place_id)
+                if point is None or not min_lat <= point[0] <= max_lat:
+                    return False
+                if min_lon <= max_lon:
+                    return min_lon <= point[1] <= max_lon
+                return point[1] >= min_lon or point[1] <= max_lon
+
+            steps.append(FilterStep(
+                'bbox', 'place_geo_index', geo.estimate_bbox(min_lon, min_lat, max_lon, max_lat),
+                lambda: geo.ids_in_bbox(min_lon, min_lat, max_lon, max_lat),
+                in_bbox))
+
+        if min_price is not None or max_price is not None:
+            min_price = _number(min_price, "Min price")
+            max_price = _number(max_price, "Max price")
+            if min_price is not None and max_price is not None and min_price > max_price:
+                raise ValueError("Min price must not exceed max price")
+            prices = facade.place_price_index
+
+            def in_price_range(place_id):
+                price = prices.key_of(place_id)
+                return price is not None and (min_price is None or price >= min_price) \
+                    and (max_price is None or price <= max_price)
+
+            steps.append(FilterStep(
+                'price', 'place_price_index', prices.count(min_price, max_price),
+                lambda: [place_id for _, place_id in prices.range(min_price, max_price)],
+                in_price_range, bounds=(min_price, max_price)))
+
+        if amenity_ids:
+            for amenity_id in amenity_ids:
+                if not facade.get_amenity(amenity_id):
+                    raise ValueError(f"Amenity not found: {amenity_id}")
+            amenities, columns = facade.place_amenity_index, facade.place_columns
+            bits = amenities.intersect(amenity_ids)
+
+            def has_amenities(place_id):
+                ordinal = columns.ordinal(place_id)
+                return all(amenities.contains(amenity_id, ordinal) for amenity_id in amenity_ids)
+
+            steps.append(FilterStep(
+                'amenities', 'place_amenity_index', bin(bits).count('1'),
+                lambda: [columns.id_at(ordinal) for ordinal in iter_bits(bits)],
+                has_amenities))
+
+        if min_rating is not None:
+            min_rating = _number(min_rating, "Min rating")
+            if not 1 <= min_rating <= 5:
+                raise ValueError("Min rating must be between 1 and 5")
+            ratings = facade.place_rating_index
+            # Leaderboard keys are (-average, -count): every count is <= 0
+            highest = (-min_rating, 0)
+
+            def rated(place_id):
+                key = ratings.key_of(place_id)
+                return key is not None and -key[0] >= min_rating
+
+            steps.append(FilterStep(
+                'min_rating', 'place_rating_index', ratings.count(None, highest),
+                lambda: [place_id for _, place_id in ratings.range(None, highest)],
+                rated))
+
+        steps.sort(key=lambda step: step.estimate)
+        return steps
+
+    def execute(self, sort=None, limit=None, cursor=None, **filters):
+        """
+        Run a place query.
+
+        Args:
+            sort (str, optional): 'price' or '-price'; creation order if None
+            limit (int, optional): Maximum number of places to return
+            cursor (str, optional): next_cursor of the previous page
+            **filters: Filters accepted by plan
+
+        Returns:
+            tuple: (list of place instances, next_cursor or None, explain
+                dict describing the plan and the candidates of each step)
+
+        Raises:
+            ValueError: If a filter, the sort, limit or cursor is invalid
+        """
+        if sort is not None and sort not in SORT_ORDERS:
+            raise ValueError("Sort must be 'price' or '-price'")
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        steps = self.plan(**filters)
+        explain = {'order': sort or 'created', 'steps': []}
+
+        if not steps and not sort:
+            places, next_cursor = self._scan(limit, cursor, explain)
+        else:
+            if sort and (not steps or steps[0].name == 'price'):
+                page, next_cursor = self._stream_by_price(steps, sort, limit, cursor, explain)
+            else:
+                page, next_cursor = self._materialize(steps, sort, limit, cursor, explain)
+            places = []
+            for place_id in page:
+                place = self.facade.get_place(place_id)
+                if place:
+                    places.append(place)
+        explain['returned'] = len(places)
+        return places, next_cursor, explain
+
+    def _scan(self, limit, cursor, explain):
+        """Read the places in creation order from the repository, without filters."""
+        facade = self.facade
+        if limit is None:
+            places, next_cursor = facade.get_all_places(), None
+        else:
+            places, next_cursor = facade.get_places_page(limit, cursor)
+        explain['steps'].append({'filter': None, 'index': 'place_repo',
+                                 'access': 'full scan' if limit is None else 'ordered scan',
+                                 'estimated': len(facade.place_columns),
+                                 'candidates': len(places)})
+        explain['stopped_early'] = next_cursor is not None
+        return places, next_cursor
+
+    def _stream_by_price(self, steps, sort, limit, cursor, explain):
+        """
+        Walk the price index in the requested order and probe the other
+        steps, stopping as soon as the page is full.
+        """
+        driver, probes = (steps[0], steps[1:]) if steps else (None, [])
+        low, high = driver.bounds if driver else (None, None)
+        after = decode_key_cursor(cursor) if cursor else None
+        scanned = 0
+        survivors = [0] * len(probes)
+        page, last, next_cursor = [], None, None
+        for price, place_id in self.facade.place_price_index.range(
+                low, high, after, reverse=sort == '-price'):
+            if limit is not None and len(page) == limit:
+                next_cursor = encode_key_cursor(*last)
+                break
+            scanned += 1
+            for position, step in enumerate(probes):
+                if not step.probe(place_id):
+                    break
+                survivors[position] += 1
+            else:
+                page.append(place_id)
+                last = (price, place_id)
+
+        explain['steps'].append({
+            'filter': driver.name if driver else 'sort',
+            'index': 'place_price_index',
+            'access': 'ordered scan',
+            'estimated': driver.estimate if driver else len(self.facade.place_price_index),
+            'candidates': scanned,
+        })
+        for step, count in zip(probes, survivors):
+            explain['steps'].append({'filter': step.name, 'index': step.index,
+                                     'access': 'probe', 'estimated': step.estimate,
+                                     'candidates': count})
+        explain['stopped_early'] = next_cursor is not None
+        return page, next_cursor
+
+    def _materialize(self, steps, sort, limit, cursor, explain):
+        """Scan the most selective step, probe the others, then order."""
+        facade = self.facade
+        candidates = steps[0].scan()
+        explain['steps'].append({'filter': steps[0].name, 'index': steps[0].index,
+                                 'access': 'scan', 'estimated': steps[0].estimate,
+                                 'candidates': len(candidates)})
+        for step in steps[1:]:
+            candidates = [place_id for place_id in candidates if step.probe(place_id)]
+            explain['steps'].append({'filter': step.name, 'index': step.index,
+                                     'access': 'probe', 'estimated': step.estimate,
+                                     'candidates': len(candidates)})
+
+        if sort:
+            prices = facade.place_price_index
+            keys = [(prices.key_of(place_id), place_id) for place_id in candidates]
+            keys = [key for key in keys if key[0] is not None]
+            keys.sort(reverse=sort == '-price')
+            if cursor:
+                after = decode_key_cursor(cursor)
+                keys = [key for key in keys if (key < after if sort == '-price' else key > after)]
+        else:
+            # Insertion sequence numbers, unlike column ordinals, are never
+            # reused, so the order and its cursors match the unfiltered list
+            positions = facade.place_repo.get_positions(candidates)
+            keys = sorted((position, place_id) for position, place_id in zip(positions, candidates)
+                          if position is not None)
+            if cursor:
+                after = decode_cursor(cursor)
+                keys = [key for key in keys if key[0] > after]
+
+        next_cursor = None
+        if limit is not None and len(keys) > limit:
+            keys = keys[:limit]
+            last = keys[-1]
+            next_cursor = encode_key_cursor(*last) if sort else encode_cursor(last[0])
+        return [place_id for _, place_id in keys], next_cursor
+
+
+def _number(value, label):
+    """Convert an optional filter value to a float."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{label} must be a number") from None
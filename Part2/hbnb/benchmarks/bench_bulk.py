@@ -0,0 +1,105 @@
+"""
+Benchmark of the bulk import.
+Loads the same rows (users, places, then reviews) three ways: one POST
+per row through the API, one facade call per row, and the BulkLoader,
+for the in-memory, SQLite and durable (fsync on every write) backends.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_bulk [count ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from app import create_app
+from app.services.bulk import BulkLoader
+from app.services.facade import HBnBFacade
+
+ENDPOINTS = {'user': '/api/v1/users/', 'place': '/api/v1/places/', 'review': '/api/v1/reviews/'}
+
+
+def make_rows(count):
+    """Return count rows: a user and a place every 20 rows, reviews otherwise."""
+    rows = []
+    users, places = [], []
+    for i in range(count):
+        if i % 20 == 0:
+            users.append(str(uuid.uuid4()))
+            rows.append({'type': 'user', 'id': users[-1], 'first_name': "Bulk",
+                         'last_name': f"User{i}", 'email': f"bulk{i}@example.com"})
+        elif i % 20 == 1:
+            places.append(str(uuid.uuid4()))
+            rows.append({'type': 'place', 'id': places[-1], 'title': f"Place {i}",
+                         'description': "Imported", 'price': 50 + i % 100,
+                         'latitude': i % 90, 'longitude': i % 180, 'owner_id': users[-1]})
+        else:
+            rows.append({'type': 'review', 'text': f"Review {i}", 'rating': 1 + i % 5,
+                         'place_id': places[i * 7 % len(places)],
+                         'user_id': users[i * 3 % len(users)]})
+    return rows
+
+
+def one_by_one(facade, rows):
+    """Create each row with its facade method, mapping the generated IDs."""
+    ids = {}
+    for row in rows:
+        data = {name: ids.get(value, value) if name.endswith('_id') else value
+                for name, value in row.items() if name not in ('type', 'id')}
+        obj = getattr(facade, f"create_{row['type']}")(data)
+        ids[row['id'] if 'id' in row else None] = obj.id
+
+
+def over_http(client, rows):
+    """POST each row to its endpoint, mapping the generated IDs."""
+    ids = {}
+    for row in rows:
+        data = {name: ids.get(value, value) if name.endswith('_id') else value
+                for name, value in row.items() if name not in ('type', 'id')}
+        response = client.post(ENDPOINTS[row['type']], json=data)
+        assert response.status_code == 201, response.data
+        ids[row.get('id')] = response.get_json()['id']
+
+
+def timed(label, count, func):
+    """Print the rows per second of func."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {elapsed:8.2f} s {count / elapsed:12.0f} rows/s")
+
+
+def main(counts):
+    """Run the benchmark for each number of rows."""
+    for count in counts:
+        rows = make_rows(count)
+        lines = [json.dumps(row) for row in rows]
+        print(f"\n{count} rows")
+        with tempfile.TemporaryDirectory() as tmp:
+            backends = {
+                'memory': lambda: type('Settings', (), {'REPOSITORY_BACKEND': 'memory'}),
+                'sqlite': lambda: type('Settings', (), {
+                    'REPOSITORY_BACKEND': 'sqlite',
+                    'SQLITE_PATH': os.path.join(tmp, f"{uuid.uuid4()}.db")}),
+                'durable': lambda: type('Settings', (), {
+                    'REPOSITORY_BACKEND': 'durable',
+                    'JOURNAL_DIR': os.path.join(tmp, str(uuid.uuid4())),
+                    'JOURNAL_FSYNC': 'always', 'JOURNAL_FSYNC_INTERVAL_MS': 50,
+                    'JOURNAL_SNAPSHOT_EVERY': 0}),
+            }
+            for backend, settings in backends.items():
+                timed(f"{backend}, facade per row", count,
+                      lambda: one_by_one(HBnBFacade(settings()), rows))
+                report = {}
+                timed(f"{backend}, BulkLoader", count,
+                      lambda: report.update(BulkLoader(HBnBFacade(settings())).load(lines)))
+                assert report['failed'] == 0, report['errors'][:5]
+        # The API runs on the facade of the configured backend
+        client = create_app().test_client()
+        timed("memory, POST per row", count, lambda: over_http(client, rows))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,72 @@
+"""
+Benchmark of the response encoding.
+Compares the json.dumps of a list of dicts, as flask-restx wrote the
+place list, with the encoders of app.api.v1.encoding writing the same
+page from Rows, and reports the peak memory (tracemalloc) of each.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_encoding [count ...]
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from app.api.v1 import serializers
+from app.api.v1.encoding import OrjsonEncoder, Rows, StdlibEncoder, orjson
+from app.models.place import Place
+from app.models.user import User
+
+REPEAT = 5
+
+
+def restx_page(places):
+    """Baseline: the page as flask-restx encoded it, from a list of dicts."""
+    page = {'items': serializers.place_list.many(places), 'next_cursor': None}
+    return json.dumps(page).encode()
+
+
+def timed(label, count, func):
+    """Print the best duration per row of func and its peak memory."""
+    elapsed = float('inf')
+    gc.disable()
+    try:
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            func()
+            elapsed = min(elapsed, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<28} {elapsed * 1e6 / count:8.3f} us/row {peak / 2 ** 20:8.1f} MiB peak")
+
+
+def main(counts):
+    """Run the benchmark for each number of places."""
+    owner = User(first_name="Bench", last_name="Owner", email="owner@example.com")
+    encoders = [StdlibEncoder()] + ([OrjsonEncoder()] if orjson is not None else [])
+    for count in counts:
+        places = []
+        for i in range(count):
+            places.append(Place(title=f"Place {i}", description="", price=100 + i % 50,
+                                latitude=i % 90, longitude=i % 180, owner=owner))
+        print(f"\n{count} places")
+
+        # Fills the cached ID strings, as earlier responses would have
+        expected = json.loads(restx_page(places))
+        timed("json, list of dicts", count, lambda: restx_page(places))
+        for encoder in encoders:
+            page = {'items': Rows(serializers.place_list, places), 'next_cursor': None}
+            assert json.loads(encoder.encode(page)) == expected
+            timed(f"{encoder.name}, Rows", count, lambda: encoder.encode(page))
+        if orjson is None:
+            print("  (orjson is not installed)")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
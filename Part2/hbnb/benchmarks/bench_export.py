@@ -0,0 +1,69 @@
+"""
+Benchmark of the collection export.
+Compares GET /api/v1/places/ returning the whole JSON array with the
+NDJSON stream of GET /api/v1/places/export: time to the first byte, total
+time and peak memory (tracemalloc) while the client reads the body.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_export [count ...]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from app import create_app
+from app.models.place import Place
+from app.models.user import User
+from app.services import facade
+
+
+def read(client, url):
+    """Read a response chunk by chunk; return the first byte and total times and size."""
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    chunks = iter(response.response)
+    size = len(next(chunks))
+    first = time.perf_counter() - start
+    for chunk in chunks:
+        size += len(chunk)
+    total = time.perf_counter() - start
+    response.close()
+    return first, total, size
+
+
+def peak_memory(client, url):
+    """Return the peak bytes allocated while reading a response."""
+    gc.collect()
+    tracemalloc.start()
+    read(client, url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(counts):
+    """Run the benchmark for each number of places."""
+    client = create_app().test_client()
+    owner = User(first_name="Bench", last_name="Owner", email="export@example.com")
+    stored = 0
+    for count in counts:
+        # Both endpoints only read the repository, so places are added to it directly
+        for i in range(stored, count):
+            facade.place_repo.add(Place(title=f"Place {i}", description="", price=100,
+                                        latitude=i % 90, longitude=i % 180, owner=owner))
+        stored = count
+        print(f"\n{count} places")
+        # Fills the cached ID strings, as earlier responses would have
+        read(client, '/api/v1/places/export')
+        for label, url in (("JSON array", '/api/v1/places/'),
+                           ("NDJSON export", '/api/v1/places/export')):
+            # Timed apart from the tracemalloc run, which slows allocations down
+            first, total, size = read(client, url)
+            peak = peak_memory(client, url)
+            print(f"  {label:<14} first byte {first * 1e3:9.1f} ms   total {total * 1e3:9.1f} ms"
+                  f"   peak {peak / 2 ** 20:7.1f} MiB   body {size / 2 ** 20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
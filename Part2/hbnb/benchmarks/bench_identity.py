@@ -0,0 +1,55 @@
+"""
+Benchmark of the ID and timestamp storage of the models.
+Compares string IDs with datetime timestamps against the compact form kept
+by BaseModel (integer UUID, epoch microseconds), in memory and in the
+time spent turning them into the strings of an API response.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_identity [count]
+"""
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from app.models.amenity import Amenity
+from benchmarks.bench_memory import allocated
+
+
+def timed(label, count, func):
+    """Run func once and print its duration per entity."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed * 1e6 / count:10.3f} us/entity")
+
+
+def main(count):
+    """Run the benchmark on count entities."""
+    print(f"{count} entities")
+    _, strings = allocated(lambda: [(str(uuid.uuid4()), datetime.now(), datetime.now())
+                                    for _ in range(count)])
+    entities, compact = allocated(lambda: [Amenity(name="Wifi") for _ in range(count)])
+    _, names = allocated(lambda: [Amenity.__new__(Amenity) for _ in range(count)])
+    # The model total minus empty instances leaves the ID and timestamp values
+    compact -= names
+    # The string layout is measured as a tuple; drop the tuple itself
+    strings -= count * sys.getsizeof((None, None, None))
+    print(f"  {'id + timestamps, str/datetime':<32} {strings / count:10.0f} B/entity")
+    print(f"  {'id + timestamps, compact':<32} {compact / count:10.0f} B/entity")
+
+    rows = [(entity.id, entity.created_at, entity.updated_at) for entity in entities]
+    for entity in entities:
+        # Warm the caches, as the first response about an entity does
+        entity.id, entity.created_at_iso, entity.updated_at_iso
+    timed("serialize, isoformat() each time", count, lambda: [
+        {'id': obj_id, 'created_at': created.isoformat(), 'updated_at': updated.isoformat()}
+        for obj_id, created, updated in rows])
+    timed("serialize, cached ISO forms", count, lambda: [
+        {'id': entity.id, 'created_at': entity.created_at_iso,
+         'updated_at': entity.updated_at_iso}
+        for entity in entities])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
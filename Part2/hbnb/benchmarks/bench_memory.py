@@ -0,0 +1,81 @@
+"""
+Memory benchmark of the model layout.
+Reports the bytes allocated per entity (tracemalloc) with the __slots__
+layout, and what the same entities cost with a per-instance __dict__.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_memory [count]
+"""
+import gc
+import sys
+import tracemalloc
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.codec import state_names
+
+
+class _DictLayout:
+    """Plain object holding the same attributes in a __dict__."""
+
+
+def allocated(build):
+    """Return what build() returns and the bytes it left allocated."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def dict_layout(objects):
+    """Copy entities into __dict__-based objects sharing the same values."""
+    copies = []
+    for obj in objects:
+        copy = _DictLayout()
+        for name in state_names(type(obj)):
+            setattr(copy, name, getattr(obj, name))
+        copies.append(copy)
+    return copies
+
+
+def report(label, objects, total):
+    """Print bytes per entity for both layouts."""
+    count = len(objects)
+    slots = sum(sys.getsizeof(obj) for obj in objects) / count
+    _, dicts = allocated(lambda: dict_layout(objects))
+    # Both layouts hold the same values; only the containers differ
+    per_entity = total / count
+    before = per_entity - slots + dicts / count
+    print(f"  {label:<8} {before:10.0f} B {per_entity:10.0f} B "
+          f"{100 * (before - per_entity) / before:8.1f} %")
+
+
+def main(count):
+    """Run the benchmark for count reviews and proportionate other entities."""
+    hosts = max(1, count // 100)
+    print(f"{count} reviews, {hosts} users, places and amenities")
+    print(f"  {'':<8} {'__dict__':>12} {'__slots__':>12} {'saved':>10}")
+
+    users, total = allocated(lambda: [
+        User(first_name="Jane", last_name=f"Doe{i}", email=f"jane{i}@example.com")
+        for i in range(hosts)])
+    report("User", users, total)
+    amenities, total = allocated(lambda: [Amenity(name=f"Amenity {i}") for i in range(hosts)])
+    report("Amenity", amenities, total)
+    places, total = allocated(lambda: [
+        Place(title=f"Place {i}", description="A quiet place", price=100.0,
+              latitude=48.85, longitude=2.35, owner=users[i]) for i in range(hosts)])
+    report("Place", places, total)
+    reviews, total = allocated(lambda: [
+        Review(text="Great stay", rating=5, place=places[i % hosts], user=users[i * 7 % hosts])
+        for i in range(count)])
+    report("Review", reviews, total)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,66 @@
+"""
+Benchmark of the k-nearest-neighbour place lookup.
+Compares k_nearest over the coordinate column store (vectorised when
+NumPy is installed) with a pure-Python loop over Place objects.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_nearest [count ...]
+"""
+import heapq
+import random
+import sys
+import time
+
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import geo_index
+from app.persistence.columnar import ColumnStore, numpy
+from app.persistence.geo_index import haversine_km, k_nearest
+
+K = 20
+QUERIES = 20
+
+
+def python_loop(places, lat, lon, k):
+    """Baseline: distance to every Place object, then a heap selection."""
+    return heapq.nsmallest(k, ((haversine_km(lat, lon, place.latitude, place.longitude), place.id)
+                               for place in places))
+
+
+def timed(label, func, queries):
+    """Run func for every query point and print the mean latency."""
+    start = time.perf_counter()
+    for lat, lon in queries:
+        func(lat, lon)
+    elapsed = (time.perf_counter() - start) / len(queries)
+    print(f"  {label:<28} {elapsed * 1000:10.2f} ms/query")
+
+
+def main(counts):
+    """Run the benchmark for each dataset size."""
+    random.seed(42)
+    owner = User(first_name="Bench", last_name="Owner", email="owner@example.com")
+    queries = [(random.uniform(-60, 60), random.uniform(-180, 180)) for _ in range(QUERIES)]
+    print(f"NumPy: {'available' if numpy is not None else 'not installed'}")
+
+    for count in counts:
+        places = []
+        store = ColumnStore({'latitude': 'd', 'longitude': 'd'})
+        for i in range(count):
+            place = Place(title=f"Place {i}", description="", price=100,
+                          latitude=random.uniform(-90, 90), longitude=random.uniform(-180, 180),
+                          owner=owner)
+            places.append(place)
+            store.put(place.id, latitude=place.latitude, longitude=place.longitude)
+        print(f"\n{count} places, k={K}")
+
+        timed("pure-Python loop", lambda lat, lon: python_loop(places, lat, lon, K), queries)
+        timed("k_nearest (column store)", lambda lat, lon: k_nearest(store, lat, lon, K), queries)
+        if numpy is not None:
+            saved, geo_index.numpy = geo_index.numpy, None
+            timed("k_nearest (no NumPy)", lambda lat, lon: k_nearest(store, lat, lon, K), queries)
+            geo_index.numpy = saved
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
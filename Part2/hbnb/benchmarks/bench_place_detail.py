@@ -0,0 +1,61 @@
+"""
+Benchmark of the place detail as its number of reviews grows.
+Compares the place detail embedding every review, as it used to, with
+the default detail (first page of reviews) and with sparse ?fields= /
+?expand= requests, each serialized and encoded in-process.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_place_detail [reviews ...]
+"""
+import sys
+import time
+
+from app import create_app
+from app.api.v1.places import PlaceResource
+from app.api.v1.serializers import place_detail, review_embedded
+from app.services import facade
+
+REPEAT = 20
+
+
+def timed(label, func):
+    """Print the best duration of func and the size of its response."""
+    elapsed = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        size = func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"  {label:<44} {elapsed * 1e3:9.3f} ms {size / 1024:10.1f} KiB")
+
+
+def main(counts):
+    """Run the benchmark for places with each number of reviews."""
+    app = create_app()
+    encoder = app.extensions['json_encoder']
+    owner = facade.create_user({'first_name': "Bench", 'last_name': "Owner",
+                                'email': "detail.owner@example.com"})
+    amenity = facade.create_amenity({'name': "Bench amenity"})
+    for count in counts:
+        place = facade.create_place({'title': f"Popular {count}", 'price': 100, 'latitude': 1,
+                                     'longitude': 1, 'owner_id': owner.id})
+        facade.add_amenity_to_place(place.id, amenity.id)
+        for i in range(count):
+            facade.create_review({'text': f"Review number {i} of a popular place", 'rating': 5,
+                                  'place_id': place.id, 'user_id': owner.id})
+        print(f"\n{count} reviews")
+        with app.test_request_context():
+            timed("all reviews embedded (before)", lambda: len(encoder.response(place_detail(
+                place, reviews=review_embedded.many(facade.get_reviews_by_place(place.id)),
+                reviews_next_cursor=None), 200).get_data()))
+        for label, query in (("default: first page of reviews", ''),
+                             ("expand=owner,amenities,reviews[limit=10]",
+                              'expand=owner,amenities,reviews[limit=10]'),
+                             ("fields=id,title,price,rating_avg",
+                              'fields=id,title,price,rating_avg')):
+            with app.test_request_context(query_string=query):
+                timed(label, lambda: len(encoder.response(
+                    *PlaceResource().get(place.id)).get_data()))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 1000, 10000])
@@ -0,0 +1,70 @@
+"""
+Benchmark of the repository backends.
+Compares InMemoryRepository and SQLiteRepository on the operations the
+facade performs on every request.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_repository [count ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlite_repository import SQLiteRepository
+
+
+def timed(label, count, func):
+    """Run func once and print its duration per operation."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {elapsed * 1e6 / count:10.2f} us/op")
+
+
+def run(repo, users):
+    """Benchmark one repository against a list of users."""
+    count = len(users)
+    lookups = users[::max(1, count // 1000)]
+    timed("add", count, lambda: [repo.add(user) for user in users])
+    timed("get", len(lookups), lambda: [repo.get(user.id) for user in lookups])
+    timed("get_many", len(lookups), lambda: repo.get_many([user.id for user in lookups]))
+    timed("get_by_attribute(email)", len(lookups),
+          lambda: [repo.get_by_attribute('email', user.email) for user in lookups])
+    timed("update", len(lookups),
+          lambda: [repo.update(user.id, {'first_name': "Bench"}) for user in lookups])
+    timed("get_all", count, repo.get_all)
+
+
+def main(counts):
+    """Run the benchmark for each dataset size."""
+    for count in counts:
+        users = [User(first_name="Bench", last_name="User", email=f"user{i}@example.com")
+                 for i in range(count)]
+        print(f"\n{count} users")
+
+        print(" InMemoryRepository")
+        repo = InMemoryRepository()
+        repo.add_index('email', unique=True)
+        run(repo, users)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            print(" SQLiteRepository")
+            repo = SQLiteRepository(os.path.join(tmp, 'bench.db'), 'users', User)
+            repo.add_index('email', unique=True)
+            run(repo, users)
+
+            # A fresh repository has an empty identity map, so every get
+            # has to read and decode its row
+            cold = SQLiteRepository(os.path.join(tmp, 'bench.db'), 'users', User)
+            lookups = users[::max(1, count // 1000)]
+            timed("get (cold)", len(lookups), lambda: [cold.get(user.id) for user in lookups])
+            cold = SQLiteRepository(os.path.join(tmp, 'bench.db'), 'users', User)
+            timed("get_many (cold)", len(lookups),
+                  lambda: cold.get_many([user.id for user in lookups]))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
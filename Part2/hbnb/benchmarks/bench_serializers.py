@@ -0,0 +1,131 @@
+"""
+Benchmark of the response serializers.
+Compares the generated serializers of app.api.v1.serializers with the
+dicts the handlers used to build inline, and with a generic serializer
+reading a field list through getattr on every row.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_serializers [count ...]
+"""
+import gc
+import sys
+import time
+
+from app.api.v1 import serializers
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+REPEAT = 5
+PLACE_LIST_FIELDS = ('id', 'title', 'latitude', 'longitude', 'price', 'rating_avg', 'rating_count')
+
+
+def inline_list(places):
+    """Baseline: the place list dicts as the handler built them."""
+    return [
+        {
+            'id': place.id,
+            'title': place.title,
+            'latitude': place.latitude,
+            'longitude': place.longitude,
+            'price': place.price,
+            'rating_avg': place.rating_avg,
+            'rating_count': place.rating_count
+        }
+        for place in places
+    ]
+
+
+def inline_detail(place, reviews):
+    """Baseline: the place detail dict as the handler built it."""
+    return {
+        'id': place.id,
+        'title': place.title,
+        'description': place.description,
+        'price': place.price,
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'owner': {
+            'id': place.owner.id,
+            'first_name': place.owner.first_name,
+            'last_name': place.owner.last_name,
+            'email': place.owner.email
+        },
+        'amenities': [{'id': amenity.id, 'name': amenity.name}
+                      for amenity in (place.amenities or [])],
+        'reviews': [{'id': review.id, 'text': review.text, 'rating': review.rating,
+                     'user_id': review.user.id} for review in reviews],
+        'reviews_next_cursor': None,
+        'rating_avg': place.rating_avg,
+        'rating_count': place.rating_count,
+        'rating_histogram': place.rating_histogram,
+        'created_at': place.created_at_iso,
+        'updated_at': place.updated_at_iso
+    }
+
+
+def generated_detail(places, reviews):
+    """The place details from the generated serializer, reviews included."""
+    return [serializers.place_detail(
+        place, reviews=serializers.review_embedded.many(reviews[place.id]),
+        reviews_next_cursor=None)
+        for place in places]
+
+
+def reflective_list(places):
+    """A generic serializer: getattr over the field names for every row."""
+    return [{name: getattr(place, name) for name in PLACE_LIST_FIELDS} for place in places]
+
+
+def timed(label, count, func):
+    """Run func a few times and print its best duration per row."""
+    elapsed = float('inf')
+    # Like timeit: collections triggered by the new dicts would dominate
+    gc.disable()
+    try:
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            func()
+            elapsed = min(elapsed, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    print(f"  {label:<32} {elapsed * 1e6 / count:10.3f} us/row")
+
+
+def main(counts):
+    """Run the benchmark for each number of places."""
+    owner = User(first_name="Bench", last_name="Owner", email="owner@example.com")
+    amenities = [Amenity(name=f"Amenity {i}") for i in range(5)]
+    for count in counts:
+        places = []
+        for i in range(count):
+            place = Place(title=f"Place {i}", description="", price=100, latitude=0,
+                          longitude=0, owner=owner)
+            places.append(place)
+        detailed = places[:max(1, count // 10)]
+        # The first page of reviews of each place, as the handler loads it
+        reviews = {}
+        for place in detailed:
+            place.amenities = list(amenities)
+            reviews[place.id] = [Review(text="Bench", rating=4, place=place, user=owner)
+                                 for _ in range(3)]
+        print(f"\n{count} places")
+
+        # Fills the cached ID strings, as earlier responses would have
+        assert inline_list(places) == list(map(serializers.place_list, places))
+        assert ([inline_detail(place, reviews[place.id]) for place in detailed]
+                == generated_detail(detailed, reviews))
+        timed("list, inline dicts", count, lambda: inline_list(places))
+        timed("list, getattr per field", count, lambda: reflective_list(places))
+        timed("list, generated serializer", count,
+              lambda: list(map(serializers.place_list, places)))
+        timed("list, generated many()", count, lambda: serializers.place_list.many(places))
+        timed("detail, inline dicts", len(detailed),
+              lambda: [inline_detail(place, reviews[place.id]) for place in detailed])
+        timed("detail, generated serializer", len(detailed),
+              lambda: generated_detail(detailed, reviews))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000])
@@ -0,0 +1,111 @@
+"""
+Benchmark of the place statistics aggregates.
+Compares the column store aggregates behind GET /places/stats (vectorised
+when NumPy is installed) with a pure-Python walk over the Place objects.
+Ratings are summed from the per-place rating counts on both sides, so no
+review is visited.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_stats [count ...]
+"""
+import random
+import sys
+import time
+
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.columnar import (ColumnStore, numpy, row_mask, ordinal_mask,
+                                      column_summary, column_distinct)
+from app.persistence.geo_index import GeoGridIndex
+from app.services.facade import RATING_COLUMNS
+
+REVIEWS_PER_PLACE = 5
+QUERIES = 10
+# Box sides in degrees (longitude, latitude): a city and a large region
+BOX_SIZES = ((1, 1), (50, 20))
+
+
+def places_in(places, bbox):
+    """Return the Place objects inside a box."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return [place for place in places
+            if min_lat <= place.latitude <= max_lat and min_lon <= place.longitude <= max_lon]
+
+
+def object_stats(places, bbox):
+    """Baseline: the /places/stats aggregates read from every Place object."""
+    inside = places_in(places, bbox)
+    prices = [place.price for place in inside]
+    counts = [sum(place.rating_histogram[rating] for place in inside) for rating in range(5)]
+    return (len(prices), len({place.owner for place in inside}),
+            min(prices, default=None), max(prices, default=None), counts)
+
+
+def select(place_store, geo, bbox):
+    """Select the places of a box the way get_place_stats does."""
+    if numpy is None:
+        return ordinal_mask(place_store, geo.ids_in_bbox(*bbox))
+    return row_mask(place_store, bbox)
+
+
+def column_stats(place_store, geo, bbox):
+    """Same aggregates over the place columns, as get_place_stats runs them."""
+    places = select(place_store, geo, bbox)
+    price = column_summary(place_store, 'price', places)
+    counts = [column_summary(place_store, name, places)['sum'] for name in RATING_COLUMNS]
+    return (price['count'], column_distinct(place_store, 'owner', places),
+            price['min'], price['max'], counts)
+
+
+def timed(label, func, queries):
+    """Run func for every box and print the mean latency."""
+    start = time.perf_counter()
+    for bbox in queries:
+        func(bbox)
+    elapsed = (time.perf_counter() - start) / len(queries)
+    print(f"  {label:<28} {elapsed * 1000:10.2f} ms/query")
+
+
+def main(counts):
+    """Run the benchmark for each number of places."""
+    random.seed(42)
+    owners = [User(first_name="Bench", last_name="Owner", email=f"owner{i}@example.com")
+              for i in range(100)]
+    boxes = {}
+    for width, height in BOX_SIZES:
+        boxes[width, height] = []
+        for _ in range(QUERIES):
+            lat, lon = random.uniform(-60, 60 - height), random.uniform(-180, 180 - width)
+            boxes[width, height].append((lon, lat, lon + width, lat + height))
+    print(f"NumPy: {'available' if numpy is not None else 'not installed'}")
+
+    for count in counts:
+        places = []
+        place_store = ColumnStore({'latitude': 'd', 'longitude': 'd', 'price': 'd', 'owner': 'q',
+                                   **{name: 'q' for name in RATING_COLUMNS}})
+        geo = GeoGridIndex()
+        for i in range(count):
+            owner = i % len(owners)
+            place = Place(title=f"Place {i}", description="", price=random.randint(20, 500),
+                          latitude=random.uniform(-90, 90), longitude=random.uniform(-180, 180),
+                          owner=owners[owner])
+            places.append(place)
+            geo.insert(place.id, place.latitude, place.longitude)
+            for _ in range(REVIEWS_PER_PLACE):
+                place.add_rating(random.randint(1, 5))
+            place_store.put(place.id, latitude=place.latitude, longitude=place.longitude,
+                            price=place.price, owner=owner,
+                            **dict(zip(RATING_COLUMNS, place.rating_histogram)))
+        print(f"\n{count} places, {count * REVIEWS_PER_PLACE} ratings")
+
+        for (width, height), queries in boxes.items():
+            print(f" {width}x{height} degree boxes")
+            assert all(object_stats(places, bbox) == column_stats(place_store, geo, bbox)
+                       for bbox in queries[:2])
+            timed("stats, Place objects", lambda bbox: object_stats(places, bbox), queries)
+            timed("stats, place columns",
+                  lambda bbox: column_stats(place_store, geo, bbox), queries)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,55 @@
+"""
+Benchmark of the full-text place search.
+Builds a BM25 text index over synthetic place documents and measures
+indexing throughput and query latency for rare and common terms.
+
+Usage (from the hbnb directory):
+    python -m benchmarks.bench_text_search [count ...]
+"""
+import itertools
+import random
+import sys
+import time
+
+from app.persistence.text_index import TextIndex
+
+WORDS = [f"word{i}" for i in range(50000)]
+# Zipf distribution: the n-th most frequent word appears about 1/n as often
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+QUERIES = 50
+
+
+def document(rng):
+    """Return a random title and description drawn from the vocabulary."""
+    words = rng.choices(WORDS, cum_weights=CUM_WEIGHTS, k=30)
+    return ' '.join(words[:4]), ' '.join(words[4:])
+
+
+def main(counts):
+    """Run the benchmark for each dataset size."""
+    rng = random.Random(42)
+    for count in counts:
+        index = TextIndex()
+        start = time.perf_counter()
+        for i in range(count):
+            title, description = document(rng)
+            index.set_source(f"p{i}", 'title', title, weight=2)
+            index.set_source(f"p{i}", 'description', description)
+        elapsed = time.perf_counter() - start
+        print(f"\n{count} documents: indexed in {elapsed:.1f} s "
+              f"({count / elapsed:,.0f} docs/s)")
+
+        for label, pools in (("rare terms", (WORDS[1000:], WORDS[1000:])),
+                             ("mid terms", (WORDS[50:1000], WORDS[50:1000])),
+                             ("rare + stop word", (WORDS[1000:], WORDS[:10])),
+                             ("stop words only", (WORDS[:10], WORDS[:10]))):
+            queries = [' '.join(rng.choice(pool) for pool in pools) for _ in range(QUERIES)]
+            start = time.perf_counter()
+            for query in queries:
+                index.search(query, limit=20)
+            elapsed = (time.perf_counter() - start) / QUERIES
+            print(f"  {label:<18} {elapsed * 1000:10.2f} ms/query")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
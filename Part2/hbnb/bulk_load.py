@@ -0,0 +1,37 @@
+"""
+Bulk import of NDJSON files into the configured HBnB storage.
+
+Each line is a JSON object with a "type" (user, amenity, place or review),
+an optional "id" and the fields of the matching POST endpoint. Use the
+durable or sqlite backend (HBNB_REPOSITORY) for the data to outlive the
+command.
+
+Usage:
+    python3 bulk_load.py data.ndjson [more.ndjson ...]
+    python3 bulk_load.py - < data.ndjson
+"""
+import json
+import sys
+
+from app.services import facade
+from app.services.bulk import BulkLoader
+
+
+def main(paths):
+    """Import the files in order; return the exit status."""
+    failed = 0
+    for path in paths:
+        if path == '-':
+            report = BulkLoader(facade).load(sys.stdin.buffer)
+        else:
+            with open(path, 'rb') as lines:
+                report = BulkLoader(facade).load(lines)
+        print(f"{path}: {json.dumps(report)}")
+        failed += report['failed']
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    sys.exit(main(sys.argv[1:]))
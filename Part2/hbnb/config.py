@@ -3,6 +3,16 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Storage backend used by the facade: 'memory', 'durable' or 'sqlite'
+    REPOSITORY_BACKEND = os.getenv('HBNB_REPOSITORY', 'memory')
+    SQLITE_PATH = os.getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+    # Write-ahead log of the 'durable' backend
+    JOURNAL_DIR = os.getenv('HBNB_JOURNAL_DIR', 'data')
+    JOURNAL_FSYNC = os.getenv('HBNB_JOURNAL_FSYNC', 'always')  # always, interval or os
+    JOURNAL_FSYNC_INTERVAL_MS = int(os.getenv('HBNB_JOURNAL_FSYNC_INTERVAL_MS', '50'))
+    JOURNAL_SNAPSHOT_EVERY = int(os.getenv('HBNB_JOURNAL_SNAPSHOT_EVERY', '10000'))
+    # Encoder of the JSON responses: 'auto' (orjson when installed), 'orjson' or 'json'
+    JSON_ENCODER = os.getenv('HBNB_JSON_ENCODER', 'auto')
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -5,7 +5,14 @@ Tests validation, CRUD operations, and error handling.
 import unittest
 import json
 import uuid
+from datetime import datetime
+from types import SimpleNamespace
 from app import create_app
+from app.api.v1 import encoding, serializers
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+from app.services import facade
 
 
 class TestUserEndpoints(unittest.TestCase):
@@ -127,6 +134,36 @@ class TestUserEndpoints(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIsInstance(data, list)
     
+    def test_get_users_paginated(self):
+        """Test walking the user list page by page with cursors"""
+        for i in range(3):
+            self.client.post(self.base_url, json={
+                "first_name": "Page",
+                "last_name": "User",
+                "email": f"page{i}.{self.unique_id}@example.com"
+            })
+        all_ids = [user['id'] for user in json.loads(self.client.get(self.base_url).data)]
+        
+        paged_ids = []
+        cursor = None
+        while True:
+            url = f"{self.base_url}?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertLessEqual(len(data['items']), 2)
+            paged_ids.extend(user['id'] for user in data['items'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(paged_ids, all_ids)
+    
+    def test_get_users_invalid_pagination(self):
+        """Test rejecting invalid limit and cursor values"""
+        self.assertEqual(self.client.get(f"{self.base_url}?limit=0").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.base_url}?limit=abc").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.base_url}?cursor=!!").status_code, 400)
+    
     def test_update_user_success(self):
         """Test successful user update"""
         # Create user
@@ -209,6 +246,29 @@ class TestAmenityEndpoints(unittest.TestCase):
         self.assertIn('error', data)
         self.assertIn('already exists', data['error'].lower())
     
+    def test_create_amenity_duplicate_name_case_insensitive(self):
+        """Test that amenity names are unique regardless of case and spacing"""
+        name = f"Sauna {self.unique_id}"
+        response1 = self.client.post(self.base_url, json={"name": name})
+        self.assertIn(response1.status_code, [200, 201])
+        
+        response2 = self.client.post(self.base_url, json={"name": f"  {name.upper()} "})
+        self.assertEqual(response2.status_code, 409)
+    
+    def test_suggest_amenities(self):
+        """Test amenity type-ahead ignores case and accents"""
+        names = [f"Zz{self.unique_id} Sauna", f"ZZ{self.unique_id} Sèche-linge",
+                 f"Zz{self.unique_id}"]
+        for name in names:
+            self.client.post(self.base_url, json={"name": name})
+        
+        response = self.client.get(f"{self.base_url}suggest?prefix=zz{self.unique_id} s")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([amenity['name'] for amenity in json.loads(response.data)], names[:2])
+        response = self.client.get(f"{self.base_url}suggest?prefix=zz{self.unique_id}&k=1")
+        self.assertEqual([amenity['name'] for amenity in json.loads(response.data)], [names[2]])
+        self.assertEqual(self.client.get(f"{self.base_url}suggest").status_code, 400)
+    
     def test_get_amenity_success(self):
         """Test successful amenity retrieval"""
         # Create amenity
@@ -436,6 +496,374 @@ class TestPlaceEndpoints(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIsInstance(data, list)
     
+    def test_search_places_by_radius(self):
+        """Test radius search returns nearby places sorted by distance"""
+        ids = []
+        for title, lat, lon in [("Opera House", -33.8568, 151.2153),
+                                ("Harbour Bridge", -33.8523, 151.2108),
+                                ("Bondi Beach", -33.8915, 151.2767)]:
+            response = self.client.post(self.base_url, json={
+                "title": f"{title} {self.unique_id}",
+                "price": 100.0,
+                "latitude": lat,
+                "longitude": lon,
+                "owner_id": self.owner_id
+            })
+            ids.append(json.loads(response.data)['id'])
+        
+        response = self.client.get(f"{self.base_url}search?lat=-33.8568&lon=151.2153&radius_km=2")
+        self.assertEqual(response.status_code, 200)
+        found = [place['id'] for place in json.loads(response.data)]
+        self.assertLess(found.index(ids[0]), found.index(ids[1]))
+        self.assertNotIn(ids[2], found)
+        
+        response = self.client.get(f"{self.base_url}search?bbox=151.2,-33.9,151.3,-33.88")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(ids[2], [place['id'] for place in json.loads(response.data)])
+    
+    def test_nearest_places(self):
+        """Test the k nearest places are returned nearest first"""
+        ids = []
+        for offset in (0.03, 0.01, 0.02):
+            response = self.client.post(self.base_url, json={
+                "title": f"Nearest {offset} {self.unique_id}",
+                "price": 80.0,
+                "latitude": -54.8 + offset,
+                "longitude": -68.3,
+                "owner_id": self.owner_id
+            })
+            ids.append(json.loads(response.data)['id'])
+        
+        response = self.client.get(f"{self.base_url}nearest?lat=-54.8&lon=-68.3&k=2")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([place['id'] for place in data], [ids[1], ids[2]])
+        self.assertLessEqual(data[0]['distance_km'], data[1]['distance_km'])
+        
+        self.assertEqual(self.client.get(f"{self.base_url}nearest?lat=0").status_code, 400)
+        self.assertEqual(
+            self.client.get(f"{self.base_url}nearest?lat=0&lon=0&k=0").status_code, 400)
+    
+    def test_filter_places_by_price(self):
+        """Test price range filtering sorted by price, with pagination"""
+        ids = []
+        for price in (7301.0, 7305.5, 7303.0, 7400.0):
+            response = self.client.post(self.base_url, json={
+                "title": f"Priced {price} {self.unique_id}",
+                "price": price,
+                "latitude": 10.0,
+                "longitude": 10.0,
+                "owner_id": self.owner_id
+            })
+            ids.append(json.loads(response.data)['id'])
+        
+        response = self.client.get(f"{self.base_url}?min_price=7300&max_price=7350&sort=price")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([place['id'] for place in data], [ids[0], ids[2], ids[1]])
+        
+        query = f"{self.base_url}?min_price=7300&max_price=7350&sort=-price&limit=2"
+        response = self.client.get(query)
+        data = json.loads(response.data)
+        self.assertEqual([place['id'] for place in data['items']], [ids[1], ids[2]])
+        response = self.client.get(f"{query}&cursor={data['next_cursor']}")
+        data = json.loads(response.data)
+        self.assertEqual([place['id'] for place in data['items']], [ids[0]])
+        self.assertIsNone(data['next_cursor'])
+        
+        self.assertEqual(self.client.get(f"{self.base_url}?sort=title").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.base_url}?min_price=abc").status_code, 400)
+        self.assertEqual(
+            self.client.get(f"{self.base_url}?min_price=5&max_price=1").status_code, 400)
+    
+    def test_filter_places_by_amenities(self):
+        """Test filtering places having all of the given amenities"""
+        amenity_ids = []
+        for name in ("WiFi", "Pool"):
+            response = self.client.post('/api/v1/amenities/', json={
+                "name": f"{name} {self.unique_id}"
+            })
+            amenity_ids.append(json.loads(response.data)['id'])
+        place_ids = []
+        for title, amenities, price in [("Both", amenity_ids, 50.0),
+                                        ("WiFi only", amenity_ids[:1], 60.0),
+                                        ("Both again", amenity_ids, 70.0)]:
+            response = self.client.post(self.base_url, json={
+                "title": f"{title} {self.unique_id}",
+                "price": price,
+                "latitude": 20.0,
+                "longitude": 20.0,
+                "owner_id": self.owner_id,
+                "amenities": amenities
+            })
+            place_ids.append(json.loads(response.data)['id'])
+        
+        both = ','.join(amenity_ids)
+        response = self.client.get(f"{self.base_url}?amenities={both}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([place['id'] for place in json.loads(response.data)],
+                         [place_ids[0], place_ids[2]])
+        
+        response = self.client.get(f"{self.base_url}?amenities={both}&limit=1")
+        data = json.loads(response.data)
+        self.assertEqual([place['id'] for place in data['items']], [place_ids[0]])
+        response = self.client.get(
+            f"{self.base_url}?amenities={both}&limit=1&cursor={data['next_cursor']}")
+        self.assertEqual([place['id'] for place in json.loads(response.data)['items']],
+                         [place_ids[2]])
+        
+        # Replacing the amenities through PUT refreshes the index
+        self.client.put(f"{self.base_url}{place_ids[0]}", json={
+            "title": f"Both {self.unique_id}",
+            "price": 50.0,
+            "latitude": 20.0,
+            "longitude": 20.0,
+            "owner_id": self.owner_id,
+            "amenities": amenity_ids[:1]
+        })
+        response = self.client.get(f"{self.base_url}?amenities={both}&sort=-price")
+        self.assertEqual([place['id'] for place in json.loads(response.data)], [place_ids[2]])
+        
+        self.assertEqual(self.client.get(f"{self.base_url}?amenities=unknown").status_code, 400)
+    
+    def test_suggest_places(self):
+        """Test place title type-ahead follows title updates"""
+        place_ids = []
+        for title in (f"Qq{self.unique_id} Loft", f"Qq{self.unique_id} Chalet"):
+            response = self.client.post(self.base_url, json={
+                "title": title,
+                "price": 40.0,
+                "latitude": 0,
+                "longitude": 0,
+                "owner_id": self.owner_id
+            })
+            place_ids.append(json.loads(response.data)['id'])
+        
+        response = self.client.get(f"{self.base_url}suggest?prefix=qq{self.unique_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([place['id'] for place in json.loads(response.data)],
+                         [place_ids[1], place_ids[0]])
+        
+        self.client.put(f"{self.base_url}{place_ids[1]}", json={
+            "title": "Renamed chalet",
+            "price": 40.0,
+            "latitude": 0,
+            "longitude": 0,
+            "owner_id": self.owner_id
+        })
+        response = self.client.get(f"{self.base_url}suggest?prefix=qq{self.unique_id}")
+        self.assertEqual([place['id'] for place in json.loads(response.data)], [place_ids[0]])
+    
+    def test_filter_places_with_explain(self):
+        """Test combined filters return the query plan when asked"""
+        response = self.client.post(self.base_url, json={
+            "title": f"Planned {self.unique_id}",
+            "price": 8123.0,
+            "latitude": 45.0,
+            "longitude": 5.0,
+            "owner_id": self.owner_id
+        })
+        place_id = json.loads(response.data)['id']
+        
+        response = self.client.get(
+            f"{self.base_url}?bbox=4,44,6,46&min_price=8100&max_price=8200&explain=true")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([place['id'] for place in data['items']], [place_id])
+        self.assertEqual({step['filter'] for step in data['explain']['steps']}, {'bbox', 'price'})
+        self.assertEqual(data['explain']['returned'], 1)
+        
+        self.assertEqual(self.client.get(f"{self.base_url}?min_rating=9").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.base_url}?bbox=1,2").status_code, 400)
+        
+        # Without filters the plan is a scan of the repository
+        data = json.loads(self.client.get(f"{self.base_url}?explain=true").data)
+        self.assertEqual(data['explain']['steps'][0]['access'], 'full scan')
+        self.assertEqual(data['explain']['returned'], len(data['items']))
+        data = json.loads(self.client.get(f"{self.base_url}?explain=true&limit=1").data)
+        self.assertEqual(data['explain']['steps'][0]['access'], 'ordered scan')
+        self.assertEqual(len(data['items']), 1)
+        self.assertEqual(
+            self.client.get(f"{self.base_url}?ids={place_id}&explain=true").status_code, 400)
+    
+    def test_filter_places_cursor_after_writes(self):
+        """Test filtered pages keep creation order while places are deleted and created"""
+        def create(title):
+            response = self.client.post(self.base_url, json={
+                "title": f"{title} {self.unique_id}",
+                "price": 90.0,
+                "latitude": -61.5,
+                "longitude": 151.5,
+                "owner_id": self.owner_id
+            })
+            return json.loads(response.data)['id']
+        
+        def ours(places):
+            return [place['id'] for place in places if place['id'] in created]
+        
+        created = [create(f"P{i}") for i in range(5)]
+        bbox = f"{self.base_url}?bbox=151,-62,152,-61"
+        # Places have no DELETE endpoint: they are deleted through the facade
+        facade.delete_place(created[1])
+        created.append(create("New"))
+        unfiltered = ours(json.loads(self.client.get(self.base_url).data))
+        self.assertEqual(unfiltered, [created[0], *created[2:]])
+        self.assertEqual(ours(json.loads(self.client.get(bbox).data)), unfiltered)
+        
+        data = json.loads(self.client.get(f"{bbox}&limit=2").data)
+        walked = ours(data['items'])
+        self.assertEqual(walked, [created[0], created[2]])
+        # The slots freed by deleted places must not put new ones mid-list
+        facade.delete_place(created[2])
+        created.append(create("Newer"))
+        while data['next_cursor']:
+            data = json.loads(self.client.get(f"{bbox}&limit=2&cursor={data['next_cursor']}").data)
+            walked.extend(ours(data['items']))
+        self.assertEqual(walked, [created[0], created[2], created[3], created[4], created[5],
+                                  created[6]])
+    
+    def test_place_stats(self):
+        """Test price and rating aggregates of the places in a bounding box"""
+        place_ids = []
+        for price in (40.0, 80.0):
+            response = self.client.post(self.base_url, json={
+                "title": f"Stats {price} {self.unique_id}",
+                "price": price,
+                "latitude": -69.5,
+                "longitude": -99.5,
+                "owner_id": self.owner_id
+            })
+            place_ids.append(json.loads(response.data)['id'])
+        for rating in (2, 4, 4):
+            self.client.post('/api/v1/reviews/', json={
+                "text": "Counted",
+                "rating": rating,
+                "user_id": self.owner_id,
+                "place_id": place_ids[0]
+            })
+        
+        response = self.client.get(f"{self.base_url}stats?bbox=-100,-70,-99,-69")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['places'], 2)
+        self.assertEqual(data['owners'], 1)
+        self.assertEqual(data['price'], {'min': 40.0, 'max': 80.0, 'avg': 60.0})
+        self.assertEqual(data['reviews'], 3)
+        self.assertEqual(data['rating']['histogram'], [0, 1, 0, 2, 0])
+        
+        self.assertEqual(self.client.get(f"{self.base_url}stats?bbox=1,2").status_code, 400)
+    
+    def test_place_fields_and_expand(self):
+        """Test sparse fieldsets, relationship expansion and the review cap of place details"""
+        amenity_id = json.loads(self.client.post('/api/v1/amenities/', json={
+            "name": f"Expand {self.unique_id}"}).data)['id']
+        place_id = json.loads(self.client.post(self.base_url, json={
+            "title": f"Expand {self.unique_id}",
+            "price": 90.0,
+            "latitude": 8,
+            "longitude": 9,
+            "owner_id": self.owner_id,
+            "amenities": [amenity_id]
+        }).data)['id']
+        review_ids = [json.loads(self.client.post('/api/v1/reviews/', json={
+            "text": f"Review {i}",
+            "rating": 3,
+            "user_id": self.owner_id,
+            "place_id": place_id
+        }).data)['id'] for i in range(3)]
+        url = f"{self.base_url}{place_id}"
+        
+        data = json.loads(self.client.get(url).data)
+        self.assertEqual(data['owner']['id'], self.owner_id)
+        self.assertEqual(data['amenities'][0]['id'], amenity_id)
+        self.assertEqual([review['id'] for review in data['reviews']], review_ids)
+        self.assertIsNone(data['reviews_next_cursor'])
+        
+        data = json.loads(
+            self.client.get(f"{url}?fields=title,owner,amenities,reviews&expand=").data)
+        self.assertEqual(data, {'title': f"Expand {self.unique_id}", 'owner_id': self.owner_id,
+                                'amenity_ids': [amenity_id]})
+        
+        data = json.loads(
+            self.client.get(f"{url}?fields=id,reviews&expand=owner,reviews[limit=2]").data)
+        self.assertEqual(list(data), ['id', 'reviews', 'reviews_next_cursor'])
+        self.assertEqual([review['id'] for review in data['reviews']], review_ids[:2])
+        # The cursor continues on the reviews of the place
+        response = self.client.get(f"{url}/reviews?cursor={data['reviews_next_cursor']}")
+        self.assertEqual([review['id'] for review in json.loads(response.data)['items']],
+                         review_ids[2:])
+        
+        for query in ("fields=", "fields=id,secret", "expand=host", "expand=owner[limit=2]",
+                      "expand=reviews[limit=0]", "expand=reviews[limit=x]"):
+            self.assertEqual(self.client.get(f"{url}?{query}").status_code, 400, query)
+    
+    def test_places_by_ids(self):
+        """Test fetching several places in one request, in the requested order"""
+        place_ids = []
+        for i in range(3):
+            response = self.client.post(self.base_url, json={
+                "title": f"Batch {i} {self.unique_id}",
+                "price": 50.0,
+                "latitude": 5,
+                "longitude": 5,
+                "owner_id": self.owner_id
+            })
+            place_ids.append(json.loads(response.data)['id'])
+        unknown = str(uuid.uuid4())
+        
+        ids = [place_ids[2], unknown, place_ids[0], place_ids[2]]
+        response = self.client.get(f"{self.base_url}?ids={','.join(ids)}")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([place['id'] for place in data['items']], [place_ids[2], place_ids[0]])
+        self.assertEqual(data['items'][1]['title'], f"Batch 0 {self.unique_id}")
+        self.assertEqual(data['missing'], [unknown])
+        
+        for query in ("ids=", f"ids={place_ids[0]}&limit=2", f"ids={place_ids[0]}&min_price=1"):
+            self.assertEqual(self.client.get(f"{self.base_url}?{query}").status_code, 400)
+    
+    def test_places_ndjson(self):
+        """Test the place list streamed as NDJSON on request and by the export route"""
+        response = self.client.post(self.base_url, json={
+            "title": f"Streamed {self.unique_id}",
+            "price": 123.0,
+            "latitude": 10,
+            "longitude": 20,
+            "owner_id": self.owner_id
+        })
+        place_id = json.loads(response.data)['id']
+        
+        ndjson = {'Accept': 'application/x-ndjson'}
+        for response in (self.client.get(self.base_url, headers=ndjson),
+                         self.client.get(f"{self.base_url}export")):
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, 'application/x-ndjson')
+            lines = response.data.decode().splitlines()
+            places = {place['id']: place for place in map(json.loads, lines)}
+            self.assertEqual(len(places), len(lines))
+            self.assertEqual(places[place_id]['title'], f"Streamed {self.unique_id}")
+        
+        # Filters apply to the stream; a page stays a JSON page
+        response = self.client.get(f"{self.base_url}?min_price=123&max_price=123",
+                                   headers={'Accept': 'application/x-ndjson'})
+        self.assertIn(place_id, [json.loads(line)['id'] for line in response.data.splitlines()])
+        response = self.client.get(f"{self.base_url}?limit=1",
+                                   headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertIn('next_cursor', json.loads(response.data))
+    
+    def test_search_places_invalid_parameters(self):
+        """Test search rejects missing or invalid parameters"""
+        self.assertEqual(self.client.get(f"{self.base_url}search").status_code, 400)
+        self.assertEqual(
+            self.client.get(f"{self.base_url}search?lat=100&lon=0&radius_km=5").status_code, 400)
+        self.assertEqual(self.client.get(f"{self.base_url}search?bbox=1,2,3").status_code, 400)
+        response = self.client.get(f"{self.base_url}search?q=beach&limit=abc")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data)['error'], "Limit must be an integer")
+        response = self.client.get(f"{self.base_url}search?q=beach&limit=100000")
+        self.assertEqual(response.status_code, 400)
+    
     def test_update_place_success(self):
         """Test successful place update"""
         # Create place
@@ -626,11 +1054,237 @@ class TestReviewEndpoints(unittest.TestCase):
         get_response = self.client.get(f"{self.base_url}{review_id}")
         self.assertEqual(get_response.status_code, 404)
     
+    def test_place_rating_aggregates(self):
+        """Test place rating aggregates follow review create, update and delete"""
+        review_ids = []
+        for rating in (5, 4, 4):
+            response = self.client.post(self.base_url, json={
+                "text": f"Rated {rating}",
+                "rating": rating,
+                "user_id": self.reviewer_id,
+                "place_id": self.place_id
+            })
+            review_ids.append(json.loads(response.data)['id'])
+        
+        self.client.put(f"{self.base_url}{review_ids[1]}", json={
+            "text": "Rated 2 after all",
+            "rating": 2,
+            "user_id": self.reviewer_id,
+            "place_id": self.place_id
+        })
+        self.client.delete(f"{self.base_url}{review_ids[0]}")
+        
+        response = self.client.get(f"/api/v1/places/{self.place_id}")
+        data = json.loads(response.data)
+        self.assertEqual(data['rating_count'], 2)
+        self.assertEqual(data['rating_avg'], 3.0)
+        self.assertEqual(data['rating_histogram'], [0, 1, 0, 1, 0])
+    
+    def test_top_places(self):
+        """Test the leaderboard ranks by average, then count, above min_reviews"""
+        place_ids = [self.place_id]
+        for title in ("Second", "Third"):
+            response = self.client.post('/api/v1/places/', json={
+                "title": f"{title} {self.unique_id}",
+                "price": 90.0,
+                "latitude": 0,
+                "longitude": 0,
+                "owner_id": self.reviewer_id
+            })
+            place_ids.append(json.loads(response.data)['id'])
+        for place_id, ratings in zip(place_ids, ([4] * 7, [4] * 8, [5] * 6)):
+            for rating in ratings:
+                self.client.post(self.base_url, json={
+                    "text": "Ranked",
+                    "rating": rating,
+                    "user_id": self.reviewer_id,
+                    "place_id": place_id
+                })
+        
+        response = self.client.get('/api/v1/places/top?n=1000&min_reviews=7')
+        self.assertEqual(response.status_code, 200)
+        ranked = [place['id'] for place in json.loads(response.data)]
+        self.assertLess(ranked.index(place_ids[1]), ranked.index(place_ids[0]))
+        self.assertNotIn(place_ids[2], ranked)
+        
+        response = self.client.get('/api/v1/places/top?n=1000&min_reviews=6')
+        ranked = [place['id'] for place in json.loads(response.data)]
+        self.assertLess(ranked.index(place_ids[2]), ranked.index(place_ids[1]))
+        
+        self.assertEqual(self.client.get('/api/v1/places/top?n=0').status_code, 400)
+    
+    def test_search_places_by_text(self):
+        """Test full-text search over place text and review text"""
+        response = self.client.post('/api/v1/places/', json={
+            "title": f"Château Lumière {self.unique_id}",
+            "description": "Old stone house",
+            "price": 120.0,
+            "latitude": 0,
+            "longitude": 0,
+            "owner_id": self.reviewer_id
+        })
+        chateau_id = json.loads(response.data)['id']
+        review_response = self.client.post(self.base_url, json={
+            "text": f"Breakfast was zqx{self.unique_id} good",
+            "rating": 4,
+            "user_id": self.reviewer_id,
+            "place_id": self.place_id
+        })
+        review_id = json.loads(review_response.data)['id']
+        
+        response = self.client.get(f"/api/v1/places/search?q=chateau lumiere {self.unique_id}")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data[0]['id'], chateau_id)
+        self.assertIn('score', data[0])
+        
+        response = self.client.get(f"/api/v1/places/search?q=zqx{self.unique_id}")
+        self.assertEqual([place['id'] for place in json.loads(response.data)], [self.place_id])
+        
+        self.client.delete(f"{self.base_url}{review_id}")
+        response = self.client.get(f"/api/v1/places/search?q=zqx{self.unique_id}")
+        self.assertEqual(json.loads(response.data), [])
+        
+        response = self.client.get(
+            f"/api/v1/places/search?q=chateau {self.unique_id}&bbox=-1,-1,1,1")
+        self.assertEqual([place['id'] for place in json.loads(response.data)], [chateau_id])
+        self.assertEqual(self.client.get("/api/v1/places/search?q=%20").status_code, 400)
+    
+    def test_place_reviews_after_delete_and_paginated(self):
+        """Test deleted reviews leave the place and place reviews paginate"""
+        review_ids = []
+        for i in range(5):
+            response = self.client.post(self.base_url, json={
+                "text": f"Review {i}",
+                "rating": 3,
+                "user_id": self.reviewer_id,
+                "place_id": self.place_id
+            })
+            review_ids.append(json.loads(response.data)['id'])
+        self.client.delete(f"{self.base_url}{review_ids[1]}")
+        
+        response = self.client.get(f"/api/v1/places/{self.place_id}")
+        embedded = [review['id'] for review in json.loads(response.data)['reviews']]
+        self.assertNotIn(review_ids[1], embedded)
+        
+        walked, cursor = [], None
+        while True:
+            url = f"/api/v1/places/{self.place_id}/reviews?limit=2"
+            response = self.client.get(url + (f"&cursor={cursor}" if cursor else ""))
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            walked.extend(review['id'] for review in data['items'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(walked, review_ids[:1] + review_ids[2:])
+        self.assertEqual(
+            self.client.get(f"/api/v1/places/{self.place_id}/reviews?limit=0").status_code, 400)
+    
+    def test_user_review_stats(self):
+        """Test the rating aggregates of the reviews a user wrote"""
+        review_ids = []
+        for rating in (3, 5, 5):
+            response = self.client.post(self.base_url, json={
+                "text": "Counted",
+                "rating": rating,
+                "user_id": self.reviewer_id,
+                "place_id": self.place_id
+            })
+            review_ids.append(json.loads(response.data)['id'])
+        self.client.delete(f"{self.base_url}{review_ids[1]}")
+        
+        response = self.client.get(f"/api/v1/users/{self.reviewer_id}/stats")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['reviews'], 2)
+        self.assertEqual(data['places'], 1)
+        self.assertEqual(data['rating'], {'avg': 4.0, 'histogram': [0, 0, 1, 0, 1]})
+        
+        response = self.client.get(f"/api/v1/users/{uuid.uuid4()}/stats")
+        self.assertEqual(response.status_code, 404)
+    
     def test_delete_review_not_found(self):
         """Test deleting non-existent review"""
         response = self.client.delete(f"{self.base_url}fake-id-12345")
         self.assertEqual(response.status_code, 404)
 
+    
+    def test_reviews_by_ids(self):
+        """Test fetching several reviews in one request"""
+        response = self.client.post(self.base_url, json={
+            "text": "Batched",
+            "rating": 2,
+            "user_id": self.reviewer_id,
+            "place_id": self.place_id
+        })
+        review_id = json.loads(response.data)['id']
+        
+        response = self.client.get(f"{self.base_url}?ids={review_id},{self.place_id}")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([review['text'] for review in data['items']], ["Batched"])
+        self.assertEqual(data['missing'], [self.place_id])
+    
+    def test_export_reviews(self):
+        """Test the review export streams one review per line"""
+        response = self.client.post(self.base_url, json={
+            "text": f"Exported {self.unique_id}",
+            "rating": 3,
+            "user_id": self.reviewer_id,
+            "place_id": self.place_id
+        })
+        review_id = json.loads(response.data)['id']
+        
+        response = self.client.get(f"{self.base_url}export")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        reviews = [json.loads(line) for line in response.data.splitlines()]
+        exported = next(review for review in reviews if review['id'] == review_id)
+        self.assertEqual(exported['place_id'], self.place_id)
+        self.assertEqual(exported['rating'], 3)
+
+
+class TestBulkEndpoint(unittest.TestCase):
+    """Test cases for the bulk import endpoint"""
+    
+    def setUp(self):
+        """Set up test client"""
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.unique_id = str(uuid.uuid4())[:8]
+    
+    def test_bulk_import(self):
+        """Test an NDJSON import creates linked entities and reports bad rows"""
+        user_id, place_id = str(uuid.uuid4()), str(uuid.uuid4())
+        rows = [
+            {"type": "user", "id": user_id, "first_name": "Bulk", "last_name": "Loader",
+             "email": f"bulk.{self.unique_id}@example.com"},
+            {"type": "place", "id": place_id, "title": f"Bulk {self.unique_id}", "price": 75,
+             "latitude": 12, "longitude": 34, "owner_id": user_id},
+            {"type": "review", "text": "Imported", "rating": 4, "place_id": place_id,
+             "user_id": user_id},
+            {"type": "review", "text": "Orphan", "rating": 4, "place_id": str(uuid.uuid4()),
+             "user_id": user_id}
+        ]
+        body = "\n".join(json.dumps(row) for row in rows) + "\n"
+        response = self.client.post('/api/v1/bulk', data=body,
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        report = json.loads(response.data)
+        self.assertEqual(report['created'],
+                         {'users': 1, 'amenities': 0, 'places': 1, 'reviews': 1})
+        self.assertEqual(report['errors'], [{'line': 4, 'error': 'Place not found'}])
+        
+        place = json.loads(self.client.get(f'/api/v1/places/{place_id}').data)
+        self.assertEqual(place['owner']['id'], user_id)
+        self.assertEqual(place['rating_avg'], 4)
+        self.assertEqual(len(place['reviews']), 1)
+    
+    def test_bulk_import_requires_ndjson(self):
+        """Test a body that is not NDJSON is rejected"""
+        response = self.client.post('/api/v1/bulk', json={"type": "user"})
+        self.assertEqual(response.status_code, 415)
 
 class TestBoundaryValues(unittest.TestCase):
     """Test cases for boundary value validation"""
@@ -761,5 +1415,105 @@ class TestBoundaryValues(unittest.TestCase):
             self.assertEqual(response.status_code, 400,
                              f"Rating {rating} should be invalid")
 
+
+class TestSerializers(unittest.TestCase):
+    """Test cases for the generated response serializers"""
+    
+    def test_compiled_serializer_shapes(self):
+        """Test plain, dotted and nested fields keep their order and values"""
+        owner = User(first_name="Ser", last_name="Ializer", email="serializer@example.com")
+        place = Place(title="Loft", description="Bright", price=80.0, latitude=1.0,
+                      longitude=2.0, owner=owner)
+        place.add_amenity(Amenity(name="Wifi"))
+        
+        data = serializers.place_detail(place, reviews=[], reviews_next_cursor=None)
+        self.assertEqual(list(data), ['id', 'title', 'description', 'price', 'latitude',
+                                      'longitude', 'owner', 'amenities', 'reviews',
+                                      'reviews_next_cursor', 'rating_avg', 'rating_count',
+                                      'rating_histogram', 'created_at', 'updated_at'])
+        self.assertIs(serializers.place_detail, serializers.place_view(
+            serializers.PLACE_DETAIL_FIELDS, serializers.PLACE_EXPANSIONS))
+        self.assertEqual(data['owner']['email'], "serializer@example.com")
+        self.assertEqual([amenity['name'] for amenity in data['amenities']], ["Wifi"])
+        self.assertEqual(data['created_at'], place.created_at.isoformat())
+        self.assertEqual(serializers.place_written(place)['owner_id'], owner.id)
+    
+    def test_param_fields(self):
+        """Test parameter fields are passed to the call, to single rows and to many()"""
+        counted = serializers.compile_serializer('counted', (
+            'id', ('total', serializers.Param('total'))))
+        amenity = Amenity(name="Counted")
+        self.assertEqual(counted(amenity, total=3), {'id': amenity.id, 'total': 3})
+        self.assertEqual(counted.many([amenity], total=1), [{'id': amenity.id, 'total': 1}])
+    
+    def test_place_view_reads_selected_fields(self):
+        """Test a restricted place view only reads the attributes it returns"""
+        view = serializers.place_view(('id', 'owner', 'amenities'), ())
+        self.assertIs(view, serializers.place_view(('id', 'owner', 'amenities'), ()))
+        # Referenced by ID only: the owner and amenities are never loaded
+        place = SimpleNamespace(id="p1", owner_id="u1", amenity_ids=["a1"])
+        self.assertEqual(view(place), {'id': "p1", 'owner_id': "u1", 'amenity_ids': ["a1"]})
+    
+    def test_invalid_field_rejected(self):
+        """Test field paths are checked when the serializer is generated"""
+        with self.assertRaises(ValueError):
+            serializers.compile_serializer('broken', [('id', 'id; import os')])
+
+
+class TestEncoding(unittest.TestCase):
+    """Test cases for the JSON response encoders"""
+    
+    def setUp(self):
+        """Build a page of entities spanning several encoding batches"""
+        self.amenities = [Amenity(name=f"Encoded {i}") for i in range(encoding.BATCH_SIZE * 2 + 1)]
+        self.body = {
+            'items': encoding.Rows(serializers.amenity_embedded, self.amenities),
+            'next_cursor': None,
+            'at': datetime(2024, 5, 1, 12, 30),
+            'key': uuid.UUID(int=1)
+        }
+        self.expected = {
+            'items': [{'id': amenity.id, 'name': amenity.name} for amenity in self.amenities],
+            'next_cursor': None,
+            'at': "2024-05-01T12:30:00",
+            'key': "00000000-0000-0000-0000-000000000001"
+        }
+    
+    def test_stdlib_encoder(self):
+        """Test the json module encoder writes Rows, datetimes and UUIDs"""
+        encoder = encoding.create_encoder('json')
+        self.assertEqual(json.loads(encoder.encode(self.body)), self.expected)
+        empty = encoding.Rows(serializers.amenity_embedded, [])
+        self.assertEqual(json.loads(encoder.encode(empty)), [])
+    
+    @unittest.skipIf(encoding.orjson is None, "orjson is not installed")
+    def test_orjson_encoder(self):
+        """Test the orjson encoder writes the same body"""
+        encoder = encoding.create_encoder('auto')
+        self.assertEqual(encoder.name, 'orjson')
+        self.assertEqual(json.loads(encoder.encode(self.body)), self.expected)
+    
+    def test_serialization_error(self):
+        """Test a serializer failing while the body is encoded answers a JSON 500"""
+        app = create_app()
+        encoder = app.extensions['json_encoder']
+        # amenity_embedded reads a name these rows do not have
+        broken = [SimpleNamespace(id="a1")]
+        with app.test_request_context():
+            response = encoder.response(
+                {'items': encoding.Rows(serializers.amenity_embedded, broken)}, 200)
+            self.assertEqual(response.status_code, 500)
+            self.assertIn('name', json.loads(response.get_data())['error'])
+            response = encoder.stream(serializers.amenity_embedded, broken)
+            self.assertEqual(response.status_code, 500)
+            self.assertEqual(response.mimetype, 'application/json')
+            response = encoder.stream(serializers.amenity_embedded, self.amenities)
+            self.assertEqual(len(response.get_data().splitlines()), len(self.amenities))
+    
+    def test_unknown_encoder(self):
+        """Test an unknown encoder name is rejected"""
+        with self.assertRaises(ValueError):
+            encoding.create_encoder('yaml')
+
 if __name__ == '__main__':
     unittest.main()
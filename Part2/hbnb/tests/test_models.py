@@ -247,6 +247,30 @@ def test_update_method():
     print("✓ Update method test passed!")
 
 
+def test_compact_identity():
+    """Test the compact ID and timestamp storage of BaseModel."""
+    print("\nTesting compact identity...")
+    import uuid
+    from datetime import datetime
+    user = User(first_name="John", last_name="Doe", email="compact@example.com")
+
+    assert isinstance(user.key, int)
+    assert str(uuid.UUID(int=user.key)) == user.id
+    assert user.created_at == user.updated_at
+
+    # ISO forms are cached until the timestamp changes
+    iso = user.updated_at_iso
+    assert iso == user.updated_at.isoformat()
+    assert user.updated_at_iso is iso
+    user.updated_at = datetime(2024, 5, 1, 12, 30, 0, 123456)
+    assert user.updated_at_iso == "2024-05-01T12:30:00.123456"
+
+    # IDs that are not UUIDs are kept as they are
+    user.id = "legacy-id"
+    assert user.key == "legacy-id" and user.id == "legacy-id"
+    print("✓ Compact identity test passed!")
+
+
 def run_all_tests():
     """Run all test functions."""
     print("=" * 50)
@@ -263,6 +287,7 @@ def run_all_tests():
     test_amenity_validation()
     test_place_amenity_relationship()
     test_update_method()
+    test_compact_identity()
     
     print("\n" + "=" * 50)
     print("All tests passed! ✓")
@@ -0,0 +1,843 @@
+"""
+Test file for validating the persistence layer.
+Run this file to test the repository implementations and their indexes.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import uuid
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.persistence.repository import InMemoryRepository, DuplicateKeyError
+from app.persistence.sqlite_repository import SQLiteRepository
+from app.persistence.codec import dump_state
+from app.persistence.geo_index import GeoGridIndex, haversine_km, k_nearest
+from app.persistence.columnar import ColumnStore
+from app.persistence.sorted_index import SortedIndex
+from app.persistence.bitmap_index import BitmapIndex, iter_bits
+from app.persistence.text_index import TextIndex, tokenize
+from app.persistence.relation_index import RelationIndex
+from app.services.facade import HBnBFacade
+from app.services.bulk import BulkLoader
+
+
+def test_indexed_get_by_attribute():
+    """Test that indexed lookups follow add, update and delete."""
+    print("Testing indexed get_by_attribute...")
+    repo = InMemoryRepository(indexes=['email'])
+    user = User(first_name="John", last_name="Doe", email="john.index@example.com")
+    repo.add(user)
+    assert repo.get_by_attribute('email', "john.index@example.com") is user
+
+    repo.update(user.id, {'email': "jane.index@example.com"})
+    assert repo.get_by_attribute('email', "john.index@example.com") is None
+    assert repo.get_by_attribute('email', "jane.index@example.com") is user
+
+    repo.delete(user.id)
+    assert repo.get_by_attribute('email', "jane.index@example.com") is None
+    print("✓ Indexed get_by_attribute test passed!")
+
+
+def test_add_index_on_existing_data():
+    """Test declaring an index after objects were stored."""
+    print("\nTesting late index declaration...")
+    repo = InMemoryRepository()
+    wifi = Amenity(name="Wi-Fi")
+    repo.add(wifi)
+    assert repo.get_by_attribute('name', "Wi-Fi") is wifi
+
+    repo.add_index('name')
+    assert repo.get_by_attribute('name', "Wi-Fi") is wifi
+    assert repo.get_by_attribute('name', "Pool") is None
+    print("✓ Late index declaration test passed!")
+
+
+def test_unique_index():
+    """Test that a unique index rejects duplicate keys on add and update."""
+    print("\nTesting unique index...")
+    repo = InMemoryRepository()
+    repo.add_index('name', unique=True, key=str.lower)
+    wifi = Amenity(name="Wi-Fi")
+    pool = Amenity(name="Pool")
+    repo.add(wifi)
+    repo.add(pool)
+
+    try:
+        repo.add(Amenity(name="WI-FI"))
+        assert False, "Should raise DuplicateKeyError for duplicate name"
+    except DuplicateKeyError as e:
+        assert e.attr_name == 'name'
+        print("✓ Duplicate add rejected")
+
+    try:
+        repo.update(pool.id, {'name': "wi-fi"})
+        assert False, "Should raise DuplicateKeyError for duplicate update"
+    except DuplicateKeyError:
+        assert pool.name == "Pool"
+        print("✓ Duplicate update rejected")
+
+    # Re-writing its own key is not a conflict
+    repo.update(wifi.id, {'name': "wi-fi"})
+    assert len(repo.get_all()) == 2
+    print("✓ Unique index test passed!")
+
+
+def test_unique_index_concurrent_adds():
+    """Test that concurrent inserts of the same key let exactly one win."""
+    print("\nTesting concurrent unique inserts...")
+    repo = InMemoryRepository()
+    repo.add_index('email', unique=True)
+    users = [User(first_name="Race", last_name="Condition", email="race@example.com")
+             for _ in range(20)]
+    winners = []
+
+    def signup(user):
+        try:
+            repo.add(user)
+            winners.append(user)
+        except DuplicateKeyError:
+            pass
+
+    threads = [threading.Thread(target=signup, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(winners) == 1
+    assert len(repo.get_all()) == 1
+    print("✓ Concurrent unique inserts test passed!")
+
+
+def test_sqlite_repository():
+    """Test the SQLite repository contract and its SQL indexes."""
+    print("\nTesting SQLite repository...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hbnb.db')
+        repo = SQLiteRepository(path, 'users', User)
+        repo.add_index('email', unique=True)
+        user = User(first_name="John", last_name="Doe", email="john.sql@example.com")
+        repo.add(user)
+        assert repo.get(user.id) is user
+        assert repo.get_by_attribute('email', "john.sql@example.com") is user
+        assert repo.get_by_attribute('last_name', "Doe") is user
+
+        try:
+            repo.add(User(first_name="Jane", last_name="Doe", email="john.sql@example.com"))
+            assert False, "Should raise DuplicateKeyError for duplicate email"
+        except DuplicateKeyError:
+            print("✓ Duplicate email rejected by the SQL index")
+
+        repo.update(user.id, {'first_name': "Johnny"})
+        reopened = SQLiteRepository(path, 'users', User)
+        loaded = reopened.get(user.id)
+        assert loaded is not user
+        assert loaded.first_name == "Johnny"
+        assert loaded.created_at == user.created_at
+
+        reopened.delete(user.id)
+        assert reopened.get(user.id) is None
+        assert reopened.get_all() == []
+    print("✓ SQLite repository test passed!")
+
+
+def test_sqlite_facade_restart():
+    """Test that relationships are restored by a facade reopening the database."""
+    print("\nTesting SQLite facade restart...")
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = type('Settings', (), {
+            'REPOSITORY_BACKEND': 'sqlite',
+            'SQLITE_PATH': os.path.join(tmp, 'hbnb.db'),
+        })
+        facade = HBnBFacade(settings)
+        owner = facade.create_user({'first_name': "Alice", 'last_name': "Smith",
+                                    'email': "alice.sql@example.com"})
+        place = facade.create_place({'title': "Loft", 'price': 80, 'latitude': 1,
+                                     'longitude': 2, 'owner_id': owner.id})
+        wifi = facade.create_amenity({'name': "Wi-Fi"})
+        facade.add_amenity_to_place(place.id, wifi.id)
+        facade.create_review({'text': "Nice", 'rating': 4,
+                              'place_id': place.id, 'user_id': owner.id})
+
+        restarted = HBnBFacade(settings)
+        loaded = restarted.get_place(place.id)
+        # References are read as IDs and only loaded when followed
+        assert loaded.owner_id == owner.id and loaded.amenity_ids == [wifi.id]
+        assert not loaded.is_loaded('owner') and not loaded.is_loaded('amenities')
+        assert loaded.owner is restarted.get_user(owner.id)
+        assert restarted.user_places.children(owner.id) == [loaded.id]
+        assert [amenity.name for amenity in loaded.amenities] == ["Wi-Fi"]
+        assert restarted.get_reviews_by_place(loaded.id)[0].user is loaded.owner
+
+        # Stored as keys next to the row body, not inside it
+        conn = sqlite3.connect(settings.SQLITE_PATH)
+        body, owner_id = conn.execute('SELECT body, ref_owner FROM places').fetchone()
+        links = conn.execute('SELECT child_id FROM places_amenities').fetchall()
+        conn.close()
+        assert owner_id == owner.id and links == [(wifi.id,)]
+        assert 'owner' not in json.loads(body) and 'amenities' not in json.loads(body)
+    print("✓ SQLite facade restart test passed!")
+
+
+def test_sqlite_reference_migration():
+    """Test that references embedded in row bodies by earlier versions are moved out."""
+    print("\nTesting SQLite reference migration...")
+    owner = User(first_name="Old", last_name="Rows", email="old.rows@example.com")
+    wifi = Amenity(name="Wi-Fi")
+    place = Place(title="Loft", description="", price=80, latitude=1, longitude=2, owner=owner)
+    place.add_amenity(wifi)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hbnb.db')
+        conn = sqlite3.connect(path)
+        for table, obj in [('users', owner), ('amenities', wifi), ('places', place)]:
+            conn.execute(f'CREATE TABLE "{table}" (seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+                         'id TEXT NOT NULL UNIQUE, cls TEXT NOT NULL, body TEXT NOT NULL)')
+            # The whole state, references included, as rows used to be written
+            conn.execute(f'INSERT INTO "{table}" (id, cls, body) VALUES (?, ?, ?)',
+                         (obj.id, type(obj).__name__, json.dumps(dump_state(obj))))
+        conn.commit()
+        conn.close()
+
+        facade = HBnBFacade(type('Settings', (), {'REPOSITORY_BACKEND': 'sqlite',
+                                                  'SQLITE_PATH': path}))
+        loaded = facade.get_place(place.id)
+        assert loaded.owner_id == owner.id and loaded.amenity_ids == [wifi.id]
+        assert loaded.owner.email == "old.rows@example.com"
+        assert [amenity.name for amenity in loaded.amenities] == ["Wi-Fi"]
+        assert facade.user_places.children(owner.id) == [place.id]
+        assert facade.find_places(amenity_ids=[wifi.id])[0] == [loaded]
+        body, = sqlite3.connect(path).execute('SELECT body FROM places').fetchone()
+        assert 'owner' not in json.loads(body)
+    print("✓ SQLite reference migration test passed!")
+
+
+def test_durable_facade_restart():
+    """Test that the durable backend recovers from its snapshot and log."""
+    print("\nTesting durable facade restart...")
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = type('Settings', (), {
+            'REPOSITORY_BACKEND': 'durable',
+            'JOURNAL_DIR': tmp,
+            'JOURNAL_FSYNC': 'always',
+            'JOURNAL_FSYNC_INTERVAL_MS': 50,
+            'JOURNAL_SNAPSHOT_EVERY': 0,
+        })
+        facade = HBnBFacade(settings)
+        owner = facade.create_user({'first_name': "Bob", 'last_name': "Durable",
+                                    'email': "bob.durable@example.com"})
+        place = facade.create_place({'title': "Cabin", 'price': 50, 'latitude': 3,
+                                     'longitude': 4, 'owner_id': owner.id})
+        facade._journal.snapshot()
+        # Written after the snapshot: only in the log tail
+        facade.update_place(place.id, {'title': "Big Cabin"})
+        gone = facade.create_amenity({'name': "Sauna"})
+        facade.delete_amenity(gone.id)
+        facade._journal.close()
+
+        # Simulate a crash in the middle of a write
+        with open(facade._journal.log_path, 'ab') as log:
+            log.write(b'{"op": "put", "cls": "Us')
+
+        restarted = HBnBFacade(settings)
+        loaded = restarted.get_place(place.id)
+        assert loaded.title == "Big Cabin"
+        assert loaded.owner is restarted.get_user_by_email("bob.durable@example.com")
+        assert restarted.user_places.children(owner.id) == [loaded.id]
+        assert restarted.get_amenity(gone.id) is None
+        restarted._journal.close()
+    print("✓ Durable facade restart test passed!")
+
+
+def test_get_page_skips_deleted():
+    """Test cursor paging over a repository with deletions in between."""
+    print("\nTesting get_page...")
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_repo = SQLiteRepository(os.path.join(tmp, 'hbnb.db'), 'amenities', Amenity)
+        for repo in (InMemoryRepository(), sqlite_repo):
+            amenities = [Amenity(name=f"Amenity {i}") for i in range(10)]
+            for amenity in amenities:
+                repo.add(amenity)
+            page, cursor = repo.get_page(4)
+            assert page == amenities[:4]
+            # Deleting returned and upcoming objects keeps the cursor valid
+            repo.delete(amenities[3].id)
+            repo.delete(amenities[4].id)
+            page, cursor = repo.get_page(4, cursor)
+            assert page == amenities[5:9]
+            page, cursor = repo.get_page(4, cursor)
+            assert page == amenities[9:]
+            assert cursor is None
+    print("✓ get_page test passed!")
+
+
+def test_iter_all():
+    """Test iterating a whole repository across page boundaries."""
+    print("\nTesting iter_all...")
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_repo = SQLiteRepository(os.path.join(tmp, 'hbnb.db'), 'amenities', Amenity)
+        for repo in (InMemoryRepository(), sqlite_repo):
+            amenities = [Amenity(name=f"Amenity {i}") for i in range(7)]
+            for amenity in amenities:
+                repo.add(amenity)
+            assert list(repo.iter_all(3)) == amenities
+            assert list(repo.iter_all(7)) == amenities
+            # Objects deleted ahead of the iteration are skipped
+            iterator = repo.iter_all(2)
+            assert next(iterator) is amenities[0]
+            repo.delete(amenities[5].id)
+            assert list(iterator) == amenities[1:5] + amenities[6:]
+            assert list(InMemoryRepository().iter_all()) == []
+    print("✓ iter_all test passed!")
+
+
+def test_add_many():
+    """Test batch inserts store all objects or none."""
+    print("\nTesting add_many...")
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_repo = SQLiteRepository(os.path.join(tmp, 'hbnb.db'), 'amenities', Amenity)
+        for repo in (InMemoryRepository(), sqlite_repo):
+            repo.add_index('name', unique=True)
+            repo.add(Amenity(name="Pool"))
+            batch = [Amenity(name="Wi-Fi"), Amenity(name="Sauna")]
+            repo.add_many(batch)
+            assert repo.get(batch[1].id) is batch[1]
+            rejected = [Amenity(name="Garden"), Amenity(name="Pool")]
+            try:
+                repo.add_many(rejected)
+                assert False, "Expected DuplicateKeyError"
+            except DuplicateKeyError:
+                pass
+            assert repo.get(rejected[0].id) is None
+            assert repo.get_by_attribute('name', "Garden") is None
+            assert [amenity.name for amenity in repo.get_all()] == ["Pool", "Wi-Fi", "Sauna"]
+    print("✓ add_many test passed!")
+
+
+def test_get_many():
+    """Test batch lookups keep the requested order and report missing IDs."""
+    print("\nTesting get_many...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hbnb.db')
+        for repo in (InMemoryRepository(), SQLiteRepository(path, 'amenities', Amenity)):
+            amenities = [Amenity(name=f"Amenity {i}") for i in range(5)]
+            repo.add_many(amenities)
+            unknown = str(uuid.uuid4())
+            ids = [amenities[3].id, unknown, amenities[0].id, amenities[3].id]
+            assert repo.get_many(ids) == [amenities[3], None, amenities[0], amenities[3]]
+            assert repo.get_many([]) == []
+            # Insertion sequence numbers grow and are not reused after a delete
+            positions = repo.get_positions(ids)
+            assert positions[1] is None and positions[0] == positions[3] > positions[2]
+            repo.delete(amenities[4].id)
+            repo.add(Amenity(name="Amenity 5"))
+            assert repo.get_positions([amenities[4].id]) == [None]
+            assert repo.get_positions([repo.get_all()[-1].id])[0] > positions[0]
+        # Rows not loaded yet are read in one query, then shared with get()
+        cold = SQLiteRepository(path, 'amenities', Amenity)
+        loaded = cold.get_many([amenity.id for amenity in amenities[:4]] + [unknown])
+        assert [amenity.name for amenity in loaded[:4]] == [a.name for a in amenities[:4]]
+        assert loaded[4] is None and cold.get(amenities[2].id) is loaded[2]
+    print("✓ get_many test passed!")
+
+
+def test_geo_index_radius():
+    """Test radius search against a brute-force distance filter."""
+    print("\nTesting geo index radius search...")
+    index = GeoGridIndex(cell_degrees=0.5)
+    points = {f"p{i}": (48.0 + (i % 20) * 0.1, 2.0 + (i // 20) * 0.1) for i in range(400)}
+    for obj_id, (lat, lon) in points.items():
+        index.insert(obj_id, lat, lon)
+
+    results = index.within_radius(48.8566, 2.3522, 25)
+    expected = {obj_id for obj_id, (lat, lon) in points.items()
+                if haversine_km(48.8566, 2.3522, lat, lon) <= 25}
+    assert {obj_id for obj_id, _ in results} == expected
+    distances = [distance for _, distance in results]
+    assert distances == sorted(distances)
+
+    index.remove("p0")
+    index.insert("p1", -33.86, 151.2)
+    assert "p0" not in index
+    assert "p1" not in {obj_id for obj_id, _ in index.within_radius(48.1, 2.0, 15)}
+    print("✓ Geo index radius search test passed!")
+
+
+def test_geo_index_antimeridian():
+    """Test queries crossing the antimeridian."""
+    print("\nTesting geo index across the antimeridian...")
+    index = GeoGridIndex()
+    index.insert("fiji", -17.7, 179.9)
+    index.insert("samoa", -17.7, -179.9)
+    index.insert("paris", 48.85, 2.35)
+
+    assert {obj_id for obj_id, _ in index.within_radius(-17.7, 180.0, 50)} == {"fiji", "samoa"}
+    inside = {obj_id for obj_id, _ in index.within_bbox(179.0, -18.0, -179.0, -17.0)}
+    assert inside == {"fiji", "samoa"}
+    assert index.within_bbox(-179.0, -18.0, 179.0, -17.0) == []
+    print("✓ Geo index antimeridian test passed!")
+
+
+def test_k_nearest():
+    """Test k-nearest lookup over a column store with recycled slots."""
+    print("\nTesting k-nearest lookup...")
+    store = ColumnStore({'latitude': 'd', 'longitude': 'd'})
+    points = {f"p{i}": ((i * 37) % 170 - 85.0, (i * 91) % 350 - 175.0) for i in range(300)}
+    for obj_id, (lat, lon) in points.items():
+        store.put(obj_id, latitude=lat, longitude=lon)
+    for i in range(0, 300, 4):
+        store.remove(f"p{i}")
+        del points[f"p{i}"]
+    # Reuses a freed slot
+    store.put("extra", latitude=10.0, longitude=10.0)
+    points["extra"] = (10.0, 10.0)
+    assert store.capacity == 300
+
+    results = k_nearest(store, 12.0, 8.0, 5)
+    expected = sorted(points, key=lambda obj_id: haversine_km(12.0, 8.0, *points[obj_id]))[:5]
+    assert [obj_id for obj_id, _ in results] == expected
+    assert results[0][0] == "extra"
+    assert len(k_nearest(store, 0, 0, 1000)) == len(points)
+    print("✓ k-nearest lookup test passed!")
+
+
+def test_sorted_index_range():
+    """Test range lookups, key moves and resumed iteration on a sorted index."""
+    print("\nTesting sorted index range lookups...")
+    index = SortedIndex()
+    prices = {f"p{i}": float((i * 7) % 50 + 1) for i in range(200)}
+    for obj_id, price in prices.items():
+        index.insert(obj_id, price)
+    index.insert("p0", 25.0)
+    prices["p0"] = 25.0
+    index.remove("p1")
+    del prices["p1"]
+    assert len(index) == 199
+
+    expected = sorted((price, obj_id) for obj_id, price in prices.items() if 10 <= price <= 20)
+    assert list(index.range(10, 20)) == expected
+    assert index.count(10, 20) == len(expected)
+    assert list(index.range(10, 20, reverse=True)) == expected[::-1]
+    assert list(index.range(10, 20, after=expected[4])) == expected[5:]
+    assert list(index.range(10, 20, after=expected[4], reverse=True)) == expected[3::-1]
+    assert list(index.range(30, 20)) == []
+    assert next(index.range()) == min((price, obj_id) for obj_id, price in prices.items())
+
+    titles = SortedIndex()
+    for obj_id, title in [("a", "sea view"), ("b", "seaside loft"), ("c", "sunny flat"),
+                          ("d", "se")]:
+        titles.insert(obj_id, title)
+    assert [obj_id for _, obj_id in titles.starting_with("sea")] == ["a", "b"]
+    assert [obj_id for _, obj_id in titles.starting_with("s")] == ["d", "a", "b", "c"]
+    assert list(titles.starting_with("x")) == []
+    print("✓ Sorted index range test passed!")
+
+
+def test_bitmap_index():
+    """Test amenity bitmaps: intersections, replaced keys and dropped keys."""
+    print("\nTesting bitmap index...")
+    index = BitmapIndex()
+    for ordinal in range(500):
+        if ordinal % 2 == 0:
+            index.add("wifi", ordinal)
+        if ordinal % 3 == 0:
+            index.add("pool", ordinal)
+    index.set(9, ["wifi", "parking"])
+
+    expected = [ordinal for ordinal in range(0, 500, 6)]
+    assert list(iter_bits(index.intersect(["wifi", "pool"]))) == expected
+    assert list(iter_bits(index.intersect(["wifi", "pool"]), after=6)) == expected[2:]
+    assert list(iter_bits(index.intersect(["wifi", "parking"]))) == [9]
+    assert index.intersect(["wifi", "missing"]) == 0
+
+    index.clear(6)
+    assert not index.contains("wifi", 6) and not index.contains("pool", 6)
+    index.drop("wifi")
+    assert "wifi" not in index
+    assert index.keys_of(9) == {"parking"}
+    print("✓ Bitmap index test passed!")
+
+
+def test_text_index():
+    """Test tokenization, BM25 ranking and incremental source updates."""
+    print("\nTesting text index...")
+    assert tokenize("Château near the SEA, café-bar!") == [
+        "chateau", "near", "the", "sea", "cafe", "bar"]
+
+    index = TextIndex()
+    index.set_source("p1", "title", "Sea view chateau", weight=2)
+    index.set_source("p2", "title", "Mountain cabin")
+    index.set_source("p2", "r1", "We could almost see the sea from the cabin")
+    index.set_source("p3", "title", "City loft")
+    assert [doc_id for doc_id, _ in index.search("château sea")] == ["p1", "p2"]
+    assert index.search("sea", limit=1)[0][0] == "p1"
+    assert index.search("nothing matches") == []
+
+    index.set_source("p2", "r1", "Quiet and cosy")
+    assert [doc_id for doc_id, _ in index.search("sea")] == ["p1"]
+    index.remove_source("p2", "r1")
+    assert index.search("cosy") == []
+    index.remove_document("p1")
+    assert "p1" not in index and index.search("chateau") == []
+    assert len(index) == 2
+    print("✓ Text index test passed!")
+
+
+def test_relation_index():
+    """Test linking, moving, paging and unlinking children of a parent."""
+    print("\nTesting relation index...")
+    relation = RelationIndex()
+    for i in range(300):
+        relation.link("place", f"r{i}")
+    relation.link("other", "r5")
+    for i in range(0, 300, 2):
+        relation.unlink(f"r{i}")
+
+    remaining = [f"r{i}" for i in range(1, 300, 2) if i != 5]
+    assert relation.children("place") == remaining
+    assert relation.parent_of("r5") == "other" and relation.parent_of("r4") is None
+    walked, after = [], None
+    while True:
+        page, after = relation.page("place", 40, after)
+        walked.extend(page)
+        if after is None:
+            break
+    assert walked == remaining
+    # Tombstones are compacted instead of accumulating
+    assert len(relation._children["place"]._keys) < 300
+
+    assert relation.unlink_parent("other") == ["r5"]
+    assert "r5" not in relation and relation.count("other") == 0
+
+    # A cursor taken before the parent emptied still sees the children added since
+    _, after = relation.page("place", 1)
+    for child_id in relation.children("place"):
+        relation.unlink(child_id)
+    relation.link("place", "new")
+    assert relation.page("place", 40, after) == (["new"], None)
+    print("✓ Relation index test passed!")
+
+
+def test_indexes_concurrent_reads():
+    """Test that index queries stay consistent while another thread writes."""
+    print("\nTesting index reads during concurrent writes...")
+    geo, prices, text, relation, bitmap = (GeoGridIndex(), SortedIndex(), TextIndex(),
+                                           RelationIndex(), BitmapIndex())
+    for i in range(1000):
+        geo.insert(f"s{i}", 48.0 + i / 1000, 2.0)
+        prices.insert(f"s{i}", float(i))
+        text.set_source(f"s{i}", "title", "quiet loft")
+        relation.link("place", f"s{i}")
+        bitmap.add("wifi", i)
+    stable = sorted((float(i), f"s{i}") for i in range(1000))
+    done = threading.Event()
+    errors = []
+
+    def write():
+        i = 0
+        while not done.is_set():
+            churn = f"c{i % 500}"
+            geo.insert(churn, 48.5, 2.0)
+            prices.insert(churn, i % 1000 + 0.5)
+            text.set_source(churn, "title", "quiet loft")
+            relation.link("place", churn)
+            bitmap.add("wifi", 1000 + i % 500)
+            geo.remove(f"c{(i + 250) % 500}")
+            prices.remove(f"c{(i + 250) % 500}")
+            text.remove_document(f"c{(i + 250) % 500}")
+            relation.unlink(f"c{(i + 250) % 500}")
+            bitmap.discard("wifi", 1000 + (i + 250) % 500)
+            i += 1
+
+    def read():
+        try:
+            for _ in range(20):
+                found = {obj_id for obj_id, _ in geo.within_radius(48.5, 2.0, 100)}
+                assert all(f"s{i}" in found for i in range(1000))
+                entries = list(prices.range())
+                assert entries == sorted(entries)
+                assert [entry for entry in entries if entry[1][0] == "s"] == stable
+                assert len(text.search("loft")) >= 1000
+                children = relation.children("place")
+                assert len(children) == len(set(children)) >= 1000
+                assert bin(bitmap.intersect(["wifi"])).count("1") >= 1000
+        except Exception as error:
+            errors.append(error)
+
+    writer = threading.Thread(target=write)
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    writer.start()
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    done.set()
+    writer.join()
+
+    assert errors == [], errors
+    print("✓ Concurrent index reads test passed!")
+
+
+def test_query_planner():
+    """Test combined place filters against a brute-force evaluation."""
+    print("\nTesting place query planner...")
+    facade = HBnBFacade(type('Settings', (), {'REPOSITORY_BACKEND': 'memory'}))
+    owner = facade.create_user({'first_name': "Plan", 'last_name': "Ner",
+                                'email': "planner@example.com"})
+    wifi = facade.create_amenity({'name': "Wi-Fi"})
+    places = []
+    for i in range(200):
+        place = facade.create_place({'title': f"Place {i}", 'price': 10 + i % 50,
+                                     'latitude': (i * 7) % 40 - 20,
+                                     'longitude': (i * 11) % 40 - 20, 'owner_id': owner.id})
+        if i % 3 == 0:
+            facade.add_amenity_to_place(place.id, wifi.id)
+        if i % 4 == 0:
+            facade.create_review({'text': "Ok", 'rating': 1 + i % 5,
+                                  'place_id': place.id, 'user_id': owner.id})
+        places.append(place)
+
+    def expected(place):
+        return (-5 <= place.latitude <= 5 and -5 <= place.longitude <= 5
+                and 20 <= place.price <= 40 and wifi in place.amenities
+                and (place.rating_avg or 0) >= 2)
+
+    filters = {'bbox': [-5, -5, 5, 5], 'min_price': 20, 'max_price': 40,
+               'amenity_ids': [wifi.id], 'min_rating': 2}
+    found, next_cursor, explain = facade.find_places(**filters)
+    assert found == [place for place in places if expected(place)] and next_cursor is None
+    estimates = [step['estimated'] for step in explain['steps']]
+    assert estimates == sorted(estimates) and explain['steps'][0]['access'] == 'scan'
+    assert explain['steps'][-1]['candidates'] == len(found)
+
+    # Paginated by price, following the cursors
+    walked, cursor = [], None
+    while True:
+        page, cursor, _ = facade.find_places(sort='-price', limit=2, cursor=cursor, **filters)
+        walked.extend(page)
+        if cursor is None:
+            break
+    assert [place.price for place in walked] == sorted((place.price for place in found),
+                                                       reverse=True)
+    assert sorted(place.id for place in walked) == sorted(place.id for place in found)
+
+    # A price-driven sorted query stops as soon as the page is full
+    page, _, explain = facade.find_places(min_price=10, max_price=11, sort='price', limit=3)
+    assert [place.price for place in page] == [10, 10, 10]
+    assert explain['steps'][0]['access'] == 'ordered scan' and explain['stopped_early']
+
+    # Boxes are validated like the bbox search validates them
+    for bbox in ([0, 5, 1, -5], [0, 0, 181, 1]):
+        errors = []
+        for search in (lambda: facade.find_places(bbox=bbox),
+                       lambda: facade.search_places_in_bbox(*bbox)):
+            try:
+                search()
+            except ValueError as e:
+                errors.append(str(e))
+        assert len(errors) == 2 and errors[0] == errors[1]
+    print("✓ Place query planner test passed!")
+
+
+def test_cascading_delete():
+    """Test deletes propagate to dependents and every place index."""
+    print("\nTesting cascading deletes...")
+    facade = HBnBFacade(type('Settings', (), {'REPOSITORY_BACKEND': 'memory'}))
+    host = facade.create_user({'first_name': "Host", 'last_name': "One",
+                               'email': "host@example.com"})
+    guest = facade.create_user({'first_name': "Guest", 'last_name': "Two",
+                                'email': "guest@example.com"})
+    other = facade.create_user({'first_name': "Other", 'last_name': "Host",
+                                'email': "other@example.com"})
+    pool = facade.create_amenity({'name': "Pool"})
+    places = [facade.create_place({'title': f"Villa {i}", 'price': 100 + i, 'latitude': i,
+                                   'longitude': i, 'owner_id': host.id}) for i in range(2)]
+    kept = facade.create_place({'title': "Cabin", 'price': 50, 'latitude': 3, 'longitude': 3,
+                                'owner_id': other.id})
+    for place in places + [kept]:
+        facade.add_amenity_to_place(place.id, pool.id)
+        facade.create_review({'text': "Lovely villa", 'rating': 5,
+                              'place_id': place.id, 'user_id': guest.id})
+    host_review = facade.create_review({'text': "Cosy", 'rating': 2,
+                                        'place_id': kept.id, 'user_id': host.id})
+
+    assert facade.delete_user(host.id)
+    assert facade.get_user(host.id) is None
+    assert all(facade.get_place(place.id) is None for place in places)
+    assert len(facade.get_all_reviews()) == 1
+    guest_reviews = facade.user_reviews.children(guest.id)
+    assert len(guest_reviews) == 1 and facade.get_review(guest_reviews[0]).place is kept
+    assert facade.get_reviews_by_place(kept.id) == [facade.get_review(guest_reviews[0])]
+    assert kept.reviews == guest.reviews == facade.get_reviews_by_place(kept.id)
+    assert other.places == [kept] and host.places == []
+    assert host_review.id not in facade.place_reviews and kept.rating_count == 1
+    assert kept.rating_avg == 5
+    assert len(facade.place_price_index) == 1 and len(facade.place_geo_index) == 1
+    assert [place_id for place_id, _ in facade.place_text_index.search("villa cosy")] == [kept.id]
+    assert facade.get_top_places(min_reviews=1) == [kept]
+    assert facade.user_reviews.count(host.id) == 0
+
+    assert facade.delete_amenity(pool.id)
+    assert kept.amenities == [] and "Pool" not in [a.name for a in facade.get_all_amenities()]
+    assert facade.delete_place(kept.id)
+    assert facade.get_all_reviews() == [] and facade.user_reviews.count(guest.id) == 0
+    assert facade.user_places.count(other.id) == 0
+    print("✓ Cascading delete test passed!")
+
+
+def test_place_stats():
+    """Test columnar place aggregates against the objects they summarize."""
+    print("\nTesting place statistics...")
+    facade = HBnBFacade(type('Settings', (), {'REPOSITORY_BACKEND': 'memory'}))
+    owners = [facade.create_user({'first_name': "Stat", 'last_name': f"Owner{i}",
+                                  'email': f"stats{i}@example.com"}) for i in range(3)]
+    places = [facade.create_place({'title': f"Stat {i}", 'price': 20 + i * 5,
+                                   'latitude': i % 10 - 5, 'longitude': (i * 37) % 360 - 180,
+                                   'owner_id': owners[i % 3].id}) for i in range(60)]
+    reviews = [facade.create_review({'text': "Fine", 'rating': 1 + i % 5,
+                                     'place_id': places[i * 7 % 60].id,
+                                     'user_id': owners[i % 3].id}) for i in range(150)]
+    facade.update_review(reviews[0].id, {'rating': 5})
+    facade.delete_place(places[0].id)
+
+    def expected(bbox):
+        min_lon, min_lat, max_lon, max_lat = bbox
+        inside = [place for place in facade.get_all_places()
+                  if min_lat <= place.latitude <= max_lat and (
+                      min_lon <= place.longitude <= max_lon if min_lon <= max_lon
+                      else place.longitude >= min_lon or place.longitude <= max_lon)]
+        ratings = [review.rating for review in facade.get_all_reviews() if review.place in inside]
+        return (len(inside), len({place.owner for place in inside}),
+                min(place.price for place in inside), max(place.price for place in inside),
+                [ratings.count(rating) for rating in range(1, 6)])
+
+    # The last box crosses the antimeridian
+    for bbox in ([-180, -90, 180, 90], [-50, -3, 120, 2], [150, -5, -150, 5]):
+        stats = facade.get_place_stats(bbox)
+        assert (stats['places'], stats['owners'], stats['price']['min'], stats['price']['max'],
+                stats['rating']['histogram']) == expected(bbox)
+        assert stats['reviews'] == sum(stats['rating']['histogram'])
+    assert facade.get_place_stats()['places'] == 59
+    empty = facade.get_place_stats([10, 80, 11, 81])
+    assert empty['places'] == 0
+    assert empty['price']['avg'] is None and empty['rating']['avg'] is None
+
+    # Ratings per reviewer, from the review columns
+    for owner in owners:
+        given = [review for review in facade.get_all_reviews() if review.user is owner]
+        stats = facade.get_user_review_stats(owner.id)
+        assert stats['reviews'] == len(given)
+        assert stats['places'] == len({review.place for review in given})
+        assert stats['rating']['histogram'] == [
+            sum(review.rating == rating for review in given) for rating in range(1, 6)]
+    assert facade.get_user_review_stats(str(uuid.uuid4())) is None
+    print("✓ Place statistics test passed!")
+
+
+def test_bulk_import():
+    """Test the bulk loader resolves references across batches and reports bad rows."""
+    print("\nTesting bulk import...")
+    facade = HBnBFacade(type('Settings', (), {'REPOSITORY_BACKEND': 'memory'}))
+    existing = facade.create_user({'first_name': "Old", 'last_name': "Host",
+                                   'email': "old.host@example.com"})
+    host_id, place_id = str(uuid.uuid4()), str(uuid.uuid4())
+    rows = [
+        {'type': 'user', 'id': host_id, 'first_name': "Bulk", 'last_name': "Host",
+         'email': "bulk.host@example.com"},
+        {'type': 'amenity', 'id': str(uuid.UUID(int=7)), 'name': "Hot tub"},
+        {'type': 'place', 'id': place_id, 'title': "Bulk chalet", 'price': 120, 'latitude': 45,
+         'longitude': 6, 'owner_id': host_id, 'amenities': [str(uuid.UUID(int=7))]},
+        {'type': 'review', 'text': "Snowy and warm", 'rating': 5, 'place_id': place_id,
+         'user_id': existing.id},
+        {'type': 'review', 'text': "Fine", 'rating': 3, 'place_id': place_id, 'user_id': host_id},
+        {'type': 'user', 'first_name': "Copy", 'last_name': "Cat",
+         'email': "BULK.host@example.com"},
+        {'type': 'place', 'title': "Nowhere", 'price': 1, 'latitude': 0, 'longitude': 0,
+         'owner_id': str(uuid.uuid4())},
+        {'type': 'review', 'text': "Too much", 'rating': 6, 'place_id': place_id,
+         'user_id': host_id},
+        {'type': 'user', 'id': host_id, 'first_name': "Same", 'last_name': "Id",
+         'email': "same.id@example.com"},
+        {'type': 'booking'},
+    ]
+    lines = [json.dumps(row) for row in rows] + ["", "not json"]
+    # Two rows per batch: references cross batch boundaries
+    report = BulkLoader(facade, batch_size=2).load(lines)
+    assert report['created'] == {'users': 1, 'amenities': 1, 'places': 1, 'reviews': 2}
+    assert report['failed'] == 6
+    assert [error['line'] for error in report['errors']] == [6, 7, 8, 9, 10, 12]
+    assert report['errors'][0]['error'] == "Email already registered"
+    assert report['errors'][1]['error'] == "Owner not found"
+
+    place = facade.get_place(place_id)
+    assert place.owner is facade.get_user(host_id)
+    assert facade.user_places.children(host_id) == [place_id]
+    assert place.rating_count == 2 and place.rating_avg == 4
+    assert [amenity.name for amenity in place.amenities] == ["Hot tub"]
+    assert facade.user_reviews.count(existing.id) == 1
+    # Indexed once, at the end of the import
+    assert facade.get_top_places(min_reviews=1) == [place]
+    assert [p.id for p, _ in facade.search_places_by_text("snowy chalet")] == [place_id]
+    assert facade.find_places(amenity_ids=[str(uuid.UUID(int=7))])[0] == [place]
+    assert facade.place_reviews.count(place_id) == 2
+    assert facade.get_place_stats()['rating']['histogram'] == [0, 0, 1, 0, 1]
+    assert facade.suggest_amenities("hot") == [facade.get_amenity(str(uuid.UUID(int=7)))]
+
+    # Written to SQLite in batches, relationships included
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = type('Settings', (), {'REPOSITORY_BACKEND': 'sqlite',
+                                         'SQLITE_PATH': os.path.join(tmp, 'hbnb.db')})
+        report = BulkLoader(HBnBFacade(settings), batch_size=2).load(lines[:5])
+        # The user of line 4 only exists in the in-memory facade
+        assert report['created'] == {'users': 1, 'amenities': 1, 'places': 1, 'reviews': 1}
+        restarted = HBnBFacade(settings)
+        loaded = restarted.get_place(place_id)
+        assert restarted.user_places.children(loaded.owner_id) == [loaded.id]
+        assert (restarted.user_reviews.children(loaded.owner.id)
+                == restarted.place_reviews.children(loaded.id))
+        assert ([review.id for review in loaded.reviews]
+                == restarted.place_reviews.children(loaded.id))
+        assert loaded.rating_avg == 3 and restarted.get_top_places(min_reviews=1) == [loaded]
+    print("✓ Bulk import test passed!")
+
+
+def run_all_tests():
+    """Run all test functions."""
+    print("=" * 50)
+    print("Running Persistence Layer Tests")
+    print("=" * 50)
+
+    test_indexed_get_by_attribute()
+    test_add_index_on_existing_data()
+    test_unique_index()
+    test_unique_index_concurrent_adds()
+    test_get_page_skips_deleted()
+    test_iter_all()
+    test_add_many()
+    test_get_many()
+    test_geo_index_radius()
+    test_geo_index_antimeridian()
+    test_k_nearest()
+    test_sorted_index_range()
+    test_bitmap_index()
+    test_text_index()
+    test_relation_index()
+    test_indexes_concurrent_reads()
+    test_query_planner()
+    test_cascading_delete()
+    test_place_stats()
+    test_bulk_import()
+    test_sqlite_repository()
+    test_sqlite_facade_restart()
+    test_sqlite_reference_migration()
+    test_durable_facade_restart()
+
+    print("\n" + "=" * 50)
+    print("All tests passed! ✓")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    run_all_tests()